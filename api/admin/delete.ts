@@ -1,6 +1,7 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { del } from '@vercel/blob';
 import Redis from 'ioredis';
+import { indexPrefix } from '../utils/index-generation';
 
 // Tentar importar KV de forma lazy
 let kv: any = null;
@@ -100,7 +101,8 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
 
     // 1. Buscar documento no Redis
     console.log('📋 Buscando documento no Redis...');
-    const doc = await redis.hgetall(`doc:${id}`);
+    const prefix = await indexPrefix(redis);
+    const doc = await redis.hgetall(`${prefix}doc:${id}`);
     
     if (!doc || !doc.id) {
       console.error('❌ Documento não encontrado:', id);
@@ -152,14 +154,14 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     if (doc.keywords) {
       const keywords = doc.keywords.split(' ').filter((w: string) => w.length > 3);
       for (const keyword of keywords) {
-        await redis.srem(`search:${keyword.toLowerCase()}`, id);
+        await redis.srem(`${prefix}search:${keyword.toLowerCase()}`, id);
       }
       console.log('✅ Índices de busca removidos');
     }
 
     // 4. Remover documento do Redis
-    await redis.del(`doc:${id}`);
-    await redis.srem('docs:all', id);
+    await redis.del(`${prefix}doc:${id}`);
+    await redis.srem(`${prefix}docs:all`, id);
 
     await redis.quit();
 
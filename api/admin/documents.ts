@@ -3,6 +3,7 @@ import fs from 'fs';
 import path from 'path';
 import { list, del } from '@vercel/blob';
 import Redis from 'ioredis';
+import { indexPrefix } from '../utils/index-generation';
 
 // Tentar importar KV de forma lazy
 let kv: any = null;
@@ -95,12 +96,13 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
           await redis.connect();
           
           // Buscar todos os IDs de documentos
-          const docIds = await redis.smembers('docs:all');
+          const prefix = await indexPrefix(redis);
+          const docIds = await redis.smembers(`${prefix}docs:all`);
           console.log(`Encontrados ${docIds.length} documentos no Redis`);
           
           // Buscar dados de cada documento
           for (const id of docIds) {
-            const doc = await redis.hgetall(`doc:${id}`);
+            const doc = await redis.hgetall(`${prefix}doc:${id}`);
             if (doc && doc.id) {
               redisDocs.push({
                 id: doc.id,
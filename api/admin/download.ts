@@ -2,6 +2,7 @@ import type { VercelRequest, VercelResponse } from '@vercel/node';
 import fs from 'fs';
 import path from 'path';
 import { head } from '@vercel/blob';
+import { indexPrefix } from '../utils/index-generation';
 
 // Lazy load KV only if configured
 let kv: any = null;
@@ -106,7 +107,8 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
           .replace(/^-+|-+$/g, '');
         
         console.log('🗑️ Buscando documento no Redis:', docId);
-        const doc = await redis.hgetall(`doc:${docId}`);
+        const prefix = await indexPrefix(redis);
+        const doc = await redis.hgetall(`${prefix}doc:${docId}`);
         
         if (doc && doc.blobUrl) {
           console.log('✅ Documento encontrado no Redis, baixando do Blob:', doc.blobUrl);
@@ -9,6 +9,7 @@ import Redis from 'ioredis';
 
 // Importar processador - deixar o Vercel resolver o caminho
 import { processDocx, sectionsToJson } from '../utils/docx-processor';
+import { indexPrefix } from '../utils/index-generation';
 
 // Tentar importar KV de forma lazy
 let kv: any = null;
@@ -248,8 +249,10 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
         metadata: JSON.stringify(metadata)
       };
 
-      await redis.hset(`doc:${id}`, ...Object.entries(documentData).flat());
-      await redis.sadd('docs:all', id);
+      // Gravar na geração do índice no ar
+      const prefix = await indexPrefix(redis);
+      await redis.hset(`${prefix}doc:${id}`, ...Object.entries(documentData).flat());
+      await redis.sadd(`${prefix}docs:all`, id);
 
       // Indexar TODAS as palavras únicas do conteúdo
       const indexWords = uniqueWords.filter(w => w.length > 3);
@@ -257,7 +260,7 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
       console.log(`Primeiras 20 palavras indexadas:`, indexWords.slice(0, 20).join(', '));
       
       for (const word of indexWords) {
-        await redis.sadd(`search:${word.toLowerCase()}`, id);
+        await redis.sadd(`${prefix}search:${word.toLowerCase()}`, id);
       }
 
       await redis.quit();
@@ -1,6 +1,7 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { list, del } from '@vercel/blob';
 import Redis from 'ioredis';
+import { indexPrefix } from './utils/index-generation';
 
 /**
  * Health Check - Verifica consistência entre Redis e Blob Storage
@@ -35,7 +36,8 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
       }
     });
 
-    const docIds = await redis.smembers('docs:all');
+    const prefix = await indexPrefix(redis);
+    const docIds = await redis.smembers(`${prefix}docs:all`);
     const redisIds = new Set(docIds);
     
     console.log(`📊 Documentos no Redis: ${docIds.length}`);
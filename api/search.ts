@@ -1,5 +1,6 @@
 import { VercelRequest, VercelResponse } from '@vercel/node';
 import Redis from 'ioredis';
+import { indexPrefix } from './utils/index-generation';
 
 // Criar cliente Redis
 function createRedisClient() {
@@ -48,10 +49,13 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
       return res.status(200).json([]);
     }
 
+    // Geração do índice no ar (lida uma vez: a busca inteira usa a mesma)
+    const prefix = await indexPrefix(redis);
+
     // 2. Buscar IDs dos documentos que contêm cada palavra
     const docIdSets = await Promise.all(
       searchWords.map(async word => {
-        const ids = await redis.smembers(`search:${word}`);
+        const ids = await redis.smembers(`${prefix}search:${word}`);
         console.log(`  - "${word}": ${ids.length} docs`);
         return ids;
       })
@@ -68,11 +72,11 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     // Se encontrou poucos resultados, tentar buscar no título/keywords diretamente
     if (matchingIds.length < 5) {
       console.log('🔍 Buscando também por correspondência parcial em títulos...');
-      const allDocIds = await redis.smembers('docs:all');
+      const allDocIds = await redis.smembers(`${prefix}docs:all`);
       
       for (const docId of allDocIds) {
         if (!matchingIds.includes(docId)) {
-          const doc = await redis.hgetall(`doc:${docId}`);
+          const doc = await redis.hgetall(`${prefix}doc:${docId}`);
           const titleNormalized = (doc.title || '').toLowerCase()
             .normalize('NFD')
             .replace(/[\u0300-\u036f]/g, '');
@@ -91,7 +95,7 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
     // 4. Buscar dados completos dos documentos
     const documents = await Promise.all(
       matchingIds.map(async (id) => {
-        const doc = await redis.hgetall(`doc:${id}`);
+        const doc = await redis.hgetall(`${prefix}doc:${id}`);
         // Parse sections back to object
         if (doc.sections && typeof doc.sections === 'string') {
           try {
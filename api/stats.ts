@@ -1,5 +1,6 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import Redis from 'ioredis';
+import { indexPrefix } from './utils/index-generation';
 
 /**
  * API consolidada para estatísticas
@@ -44,8 +45,9 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
         }
       });
 
-      await redis.hincrby(`doc:${documentId}`, 'views', 1);
-      const views = await redis.hget(`doc:${documentId}`, 'views');
+      const prefix = await indexPrefix(redis);
+      await redis.hincrby(`${prefix}doc:${documentId}`, 'views', 1);
+      const views = await redis.hget(`${prefix}doc:${documentId}`, 'views');
       await redis.quit();
 
       return res.status(200).json({
@@ -97,12 +99,13 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
         }
       });
 
-      const views = await redis.hget(`doc:${id}`, 'views');
+      const prefix = await indexPrefix(redis);
+      const views = await redis.hget(`${prefix}doc:${id}`, 'views');
       let averageRating = 0;
       let ratingCount = 0;
 
       try {
-        const ratingsData = await redis.hget(`doc:${id}`, 'ratings');
+        const ratingsData = await redis.hget(`${prefix}doc:${id}`, 'ratings');
         if (ratingsData) {
           const ratings = JSON.parse(ratingsData);
           if (Array.isArray(ratings) && ratings.length > 0) {
@@ -0,0 +1,18 @@
+/**
+ * Geração do Índice no Redis
+ * O carregador Python (carga_redis.py) monta cada versão do índice sob o
+ * prefixo idx:<geração>: e troca apenas o ponteiro index:current no final.
+ */
+
+import type Redis from 'ioredis';
+
+export const CURRENT_GENERATION_KEY = 'index:current';
+
+/**
+ * Prefixo das chaves do índice no ar (doc:*, docs:all, search:*).
+ * Retorna '' enquanto o índice ainda estiver no layout antigo, sem gerações.
+ */
+export async function indexPrefix(redis: Redis): Promise<string> {
+  const generation = await redis.get(CURRENT_GENERATION_KEY);
+  return generation ? `idx:${generation}:` : '';
+}
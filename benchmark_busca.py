@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Busca - Concierge RH Digital INPI
+Compara a pontuação atual de api/search.ts (união dos conjuntos search:<palavra>,
+varredura de títulos quando há poucos resultados e contagem de RegExp por
+palavra e documento) com o ranking BM25 pré-computado.
+
+Com --aproximada, mede a correção de palavras com erro (busca_aproximada)
+contra a varredura linear do vocabulário, aumentando o vocabulário com
+termos sintéticos: a latência do dicionário de deleções deve ficar estável.
+"""
+
+from indice_busca import tokenize, normalize, load_records, DATABASE_PATH
+from ranking_bm25 import build_bm25, top_k
+from busca_aproximada import (build_fuzzy, lookup, brute_force, misspell, allowed_distance,
+                              vocabulary_from_content)
+import argparse
+import random
+import re
+import statistics
+import time
+
+# Buscas típicas do Concierge (com e sem acento)
+DEFAULT_QUERIES = [
+    'férias', 'ferias marcação', 'licença saúde', 'aposentadoria abono',
+    'pagamento contracheque', 'frequência sisref', 'capacitação curso',
+    'remoção', 'estágio probatório avaliação', 'retribuição titulação',
+    'dados cadastrais sougov', 'programa de gestão desempenho',
+    'seleção interna', 'auxílio saúde', 'banco de horas', 'perícia atestado'
+]
+
+def scale_records(records, factor):
+    """Replica o corpus `factor` vezes (ids distintos) para medir escala"""
+    if factor <= 1:
+        return list(records)
+    scaled = []
+    for copy in range(factor):
+        for record in records:
+            clone = dict(record)
+            clone['id'] = f"{record['id']}-{copy}"
+            scaled.append(clone)
+    return scaled
+
+# ---------------------------------------------------------------------------
+# Pontuação atual (porta de api/search.ts sobre os conjuntos do Redis)
+# ---------------------------------------------------------------------------
+
+def build_legacy(records):
+    """Equivalente aos conjuntos search:<palavra> e hashes doc:<id>"""
+    sets = {}
+    for record in records:
+        content = ' '.join(s['text'] for s in record['sections'])
+        for word in set(tokenize(f"{record['title']} {record['keywords']} {content}")):
+            sets.setdefault(word, set()).add(record['id'])
+    return {'sets': sets, 'docs': {record['id']: record for record in records},
+            'all': [record['id'] for record in records]}
+
+def legacy_search(state, query):
+    """Mesmo algoritmo de api/search.ts, sem as idas e voltas ao Redis"""
+    words = [w for w in normalize(query.lower().strip()).split() if len(w) > 2]
+    if not words:
+        return []
+
+    matching = []
+    seen = set()
+    for word in words:
+        for doc_id in state['sets'].get(word, ()):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                matching.append(doc_id)
+
+    if len(matching) < 5:
+        for doc_id in state['all']:
+            if doc_id not in seen:
+                title = normalize(state['docs'][doc_id]['title'])
+                if any(word in title for word in words):
+                    matching.append(doc_id)
+
+    scored = []
+    for doc_id in matching:
+        doc = state['docs'][doc_id]
+        text = f"{doc['title']} {doc['keywords']} {doc['description']}".lower()
+        score = 0
+        for word in words:
+            # api/search.ts cria uma RegExp nova por palavra e documento
+            score += len(re.compile(word, re.IGNORECASE).findall(text))
+        scored.append((doc_id, score))
+
+    scored.sort(key=lambda item: -item[1])
+    return scored
+
+# ---------------------------------------------------------------------------
+# Busca aproximada
+# ---------------------------------------------------------------------------
+
+# Erros de digitação reais vistos nas buscas
+DEFAULT_TYPOS = ['licensa', 'aposentadorea', 'ferias', 'capacitasao', 'pagamentu',
+                 'frequencia', 'remocao', 'retribuisao', 'perisia', 'avaliasao']
+
+# A varredura linear só é medida até este tamanho de vocabulário (fica lenta)
+LINEAR_LIMIT = 20000
+
+# Frequência aproximada das letras no português (por mil), para palavras sintéticas
+_LETTER_WEIGHTS = {
+    'a': 146, 'e': 126, 'o': 107, 's': 78, 'r': 65, 'i': 62, 'n': 50, 'd': 50,
+    'm': 47, 'u': 46, 't': 43, 'c': 39, 'l': 28, 'p': 25, 'v': 17, 'g': 13,
+    'h': 13, 'q': 12, 'b': 10, 'f': 10, 'z': 5, 'j': 4, 'x': 3, 'k': 1, 'w': 1, 'y': 1
+}
+
+def records_vocabulary(records):
+    """Vocabulário do corpus a partir dos registros (título, descrição e seções)"""
+    content = []
+    for record in records:
+        content.append({'text': f"{record['title']} {record['keywords']} {record['description']}"})
+        content.extend({'text': f"{s['heading']} {s['text']}"} for s in record['sections'])
+    return vocabulary_from_content(content)
+
+def grow_vocabulary(vocabulary, size, seed=11):
+    """Completa o vocabulário até `size` termos com palavras sintéticas (frequência 1)"""
+    rng = random.Random(seed)
+    letters = list(_LETTER_WEIGHTS)
+    weights = list(_LETTER_WEIGHTS.values())
+    grown = dict(vocabulary)
+    while len(grown) < size:
+        word = ''.join(rng.choices(letters, weights, k=rng.randint(5, 12)))
+        grown.setdefault(word, 1)
+    return grown
+
+def typo_queries(vocabulary, count=40, seed=5):
+    """Erros de digitação conhecidos mais erros aleatórios sobre termos reais"""
+    rng = random.Random(seed)
+    words = sorted(word for word in vocabulary if len(word) >= 5)
+    typos = [word for word in DEFAULT_TYPOS]
+    while len(typos) < count and words:
+        typos.append(misspell(rng.choice(words), rng.randint(1, 2), rng))
+    return typos
+
+def fuzzy_benchmark(base_vocabulary, sizes, repeat):
+    """Latência da correção por tamanho de vocabulário: dicionário de deleções x linear"""
+    queries = typo_queries(base_vocabulary)
+    rows = []
+    for size in sizes:
+        vocabulary = grow_vocabulary(base_vocabulary, size)
+
+        start = time.perf_counter()
+        fuzzy = build_fuzzy(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        row = {
+            'terms': len(vocabulary),
+            'deletes': len(fuzzy['deletes']),
+            'build_ms': build_ms,
+            'fuzzy': summarize('deleções', measure(lambda q: lookup(fuzzy, q), queries, repeat)),
+            'linear': None
+        }
+        if len(vocabulary) <= LINEAR_LIMIT:
+            row['linear'] = summarize('linear', measure(
+                lambda q: brute_force(vocabulary, q, allowed_distance(fuzzy, q)), queries, 1))
+        rows.append(row)
+    return rows
+
+def print_fuzzy(rows):
+    print(f"{'TERMOS':>9} {'DELEÇÕES':>10} {'CONSTRUÇÃO ms':>14} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'LINEAR p50 ms':>14}")
+    print("-" * 74)
+    for row in rows:
+        linear = f"{row['linear']['p50']:>14.3f}" if row['linear'] else f"{'—':>14}"
+        print(f"{row['terms']:>9} {row['deletes']:>10} {row['build_ms']:>14.0f} "
+              f"{row['fuzzy']['p50']:>9.4f} {row['fuzzy']['p99']:>9.4f} {linear}")
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def measure(search_fn, queries, repeat):
+    """Latências (ms) de cada execução de cada busca"""
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            search_fn(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[position]
+
+def summarize(name, latencies):
+    return {
+        'name': name,
+        'mean': statistics.mean(latencies),
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'qps': 1000 / statistics.mean(latencies) if latencies else 0
+    }
+
+def print_summary(rows):
+    print(f"{'MOTOR':<28} {'MÉDIA ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'BUSCAS/s':>12}")
+    print("-" * 74)
+    for row in rows:
+        print(f"{row['name']:<28} {row['mean']:>10.4f} {row['p50']:>10.4f} {row['p99']:>10.4f} {row['qps']:>12.0f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara a busca atual com o ranking BM25')
+    parser.add_argument('--database', default=DATABASE_PATH,
+                        help='database.json de origem (padrão: src/database.json)')
+    parser.add_argument('--escala', type=int, nargs='*', default=[1, 10, 100],
+                        help='Fatores de replicação do corpus')
+    parser.add_argument('--repeticoes', type=int, default=20,
+                        help='Quantas vezes cada busca é repetida')
+    parser.add_argument('-k', type=int, default=10, help='Top-k do BM25')
+    parser.add_argument('--aproximada', action='store_true',
+                        help='Mede a correção de palavras com erro em vez do ranking')
+    parser.add_argument('--vocabulario', type=int, nargs='*', default=[2000, 20000, 100000, 200000],
+                        help='Tamanhos de vocabulário medidos com --aproximada')
+    args = parser.parse_args()
+
+    base_records = load_records(args.database)
+
+    if args.aproximada:
+        print("=" * 74)
+        print("BENCHMARK DE BUSCA APROXIMADA - DELEÇÕES vs VARREDURA LINEAR")
+        print("=" * 74)
+        base_vocabulary = records_vocabulary(base_records)
+        print(f"📚 Vocabulário do corpus: {len(base_vocabulary)} termos "
+              f"| {len(typo_queries(base_vocabulary))} palavras com erro")
+        print_fuzzy(fuzzy_benchmark(base_vocabulary, args.vocabulario, args.repeticoes))
+        print("=" * 74)
+        raise SystemExit(0)
+
+    print("=" * 74)
+    print("BENCHMARK DE BUSCA - ATUAL vs BM25")
+    print("=" * 74)
+
+    for factor in args.escala:
+        records = scale_records(base_records, factor)
+
+        start = time.perf_counter()
+        bm25 = build_bm25(records)
+        build_ms = (time.perf_counter() - start) * 1000
+        legacy = build_legacy(records)
+
+        rows = [
+            summarize('atual (search.ts)', measure(lambda q: legacy_search(legacy, q),
+                                                    DEFAULT_QUERIES, args.repeticoes)),
+            summarize(f'bm25 top-{args.k}', measure(lambda q: top_k(bm25, q, args.k),
+                                                    DEFAULT_QUERIES, args.repeticoes)),
+        ]
+
+        print()
+        print(f"📚 Corpus: {len(records)} documentos | construção BM25: {build_ms:.1f} ms")
+        print_summary(rows)
+
+    print("=" * 74)
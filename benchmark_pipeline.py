@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark do Pipeline - Concierge RH Digital INPI
+Gera corpora sintéticos de .docx (python-docx + add_hyperlink) com densidade
+configurável de parágrafos, tabelas e links e mede cada etapa: extração,
+organização em seções, reformatação, restauração de links e validação.
+Informa vazão (docs/s, MB/s), pico de memória e regressões contra um
+baseline gravado.
+"""
+
+from docx import Document
+from reformatar_docs import (add_hyperlink, extract_content_with_links,
+                             organize_content_by_sections, create_formatted_document)
+from restaurar_links import restore_links_to_document
+from validar_docs import validate_document
+from copias_seguranca import snapshot
+from corpus_docs import iter_documents
+import modelo_docx
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ('extracao', 'secoes', 'reformatacao', 'restauracao', 'validacao')
+
+# Vocabulário para o texto sintético
+_WORDS = (
+    'servidor requerimento prazo férias licença saúde pagamento frequência '
+    'capacitação aposentadoria abono permanência remoção lotação avaliação '
+    'desempenho estágio probatório titulação retribuição sougov sisref '
+    'documentação portaria decreto instrução normativa perícia atestado '
+    'cadastro dados pessoais gratificação auxílio homologação marcação'
+).split()
+
+_HEADINGS = (
+    'O que é?', 'Quem tem direito?', 'Como solicitar?', 'Prazos',
+    'Documentação necessária', 'Legislação', 'Dúvidas frequentes', 'Contato'
+)
+
+def _sentence(rng, min_words=8, max_words=40):
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return ' '.join(words).capitalize() + '.'
+
+def generate_document(path, rng, paragraphs=40, tables=2, link_density=0.2):
+    """Cria um .docx sintético com seções, parágrafos, tabelas e links"""
+    doc = Document()
+    doc.add_heading(_sentence(rng, 2, 4).rstrip('.'), level=1)
+
+    per_section = max(1, paragraphs // len(_HEADINGS))
+    for heading in _HEADINGS:
+        doc.add_paragraph(heading)
+        for _ in range(per_section):
+            para = doc.add_paragraph(_sentence(rng))
+            if rng.random() < link_density:
+                add_hyperlink(para, rng.choice(_WORDS),
+                              f'https://inpidrive.inpi.gov.br/index.php/s/{rng.getrandbits(40):x}')
+
+    for _ in range(tables):
+        table = doc.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = _sentence(rng, 2, 6)
+
+    doc.save(path)
+
+def generate_corpus(output_dir, docs=20, paragraphs=40, tables=2, link_density=0.2, seed=42):
+    """Gera `docs` documentos sintéticos e devolve a lista de caminhos"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(docs):
+        path = os.path.join(output_dir, f'documento_{i:05d}.docx')
+        generate_document(path, rng, paragraphs, tables, link_density)
+        paths.append(path)
+    return paths
+
+def _reset_peak_rss():
+    """Zera o pico de memória residente (VmHWM) do processo; False se não der
+
+    O ru_maxrss vale para a vida toda do processo: sem zerar, cada etapa
+    mostraria o maior pico das etapas anteriores. No Linux, escrever 5 em
+    /proc/self/clear_refs faz o VmHWM voltar ao RSS atual.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def _peak_rss_mb():
+    """Pico de memória residente do processo (MB), quando disponível"""
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmHWM')) / 1024
+    except (OSError, StopIteration):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _time_stage(name, paths, fn, trace_alloc=False):
+    """Executa fn(path) para todos os arquivos e mede tempo e memória
+
+    tracemalloc deixa o Python bem mais lento, então o pico de alocação só é
+    medido quando pedido (e a vazão deixa de ser comparável com o baseline).
+    O pico de RSS só é da etapa onde dá para zerá-lo (Linux); nos outros
+    sistemas fica só o pico do processo inteiro, em run_benchmark.
+    """
+    modelo_docx.clear_cache()
+    per_stage_rss = _reset_peak_rss()
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    if trace_alloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for path in paths:
+        fn(path)
+    elapsed = time.perf_counter() - start
+    peak_alloc = None
+    if trace_alloc:
+        peak_alloc = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    return {
+        'stage': name,
+        'seconds': elapsed,
+        'docs_per_s': len(paths) / elapsed if elapsed else 0.0,
+        'mb_per_s': total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+        'peak_alloc_mb': peak_alloc,
+        'peak_rss_mb': _peak_rss_mb() if per_stage_rss else None
+    }
+
+def run_benchmark(paths, work_dir, trace_alloc=False):
+    """Mede cada etapa do pipeline sobre os arquivos do corpus
+
+    Devolve (resultados por etapa, pico de RSS de todas as etapas em MB).
+    """
+    extracted = {}
+    organized = {}
+    outputs = {}
+
+    def extract(path):
+        extracted[path] = extract_content_with_links(path)
+
+    def organize(path):
+        organized[path] = organize_content_by_sections(extracted[path], os.path.basename(path))
+
+    def reformat(path):
+        name = os.path.basename(path)
+        output = os.path.join(work_dir, name)
+        # Mesmo fluxo de process_single_doc: cópia de segurança e reformatação
+        shutil.copyfile(path, output)
+        snapshot(output)
+        create_formatted_document(output, organized[path], extracted[path])
+        outputs[path] = output
+
+    def restore(path):
+        restore_links_to_document(outputs[path])
+
+    def validate(path):
+        validate_document(outputs[path])
+
+    stages = dict(zip(STAGES, (extract, organize, reformat, restore, validate)))
+    results = [_time_stage(name, paths, stages[name], trace_alloc) for name in STAGES]
+    # Depois das etapas: com o VmHWM zerado por etapa, o pico geral é o maior deles
+    stage_peaks = [row['peak_rss_mb'] for row in results if row['peak_rss_mb'] is not None]
+    return results, max(stage_peaks) if stage_peaks else _peak_rss_mb()
+
+def compare_baseline(results, baseline, tolerance):
+    """Etapas cuja vazão caiu mais que `tolerance` (fração) em relação ao baseline"""
+    previous = {row['stage']: row for row in baseline.get('stages', [])}
+    regressions = []
+    for row in results:
+        before = previous.get(row['stage'])
+        if not before or not before['docs_per_s']:
+            continue
+        change = row['docs_per_s'] / before['docs_per_s'] - 1
+        row['change'] = change
+        if change < -tolerance:
+            regressions.append(row['stage'])
+    return regressions
+
+def print_results(results):
+    print(f"{'ETAPA':<14} {'TEMPO s':>9} {'DOCS/s':>9} {'MB/s':>8} {'ALOC MB':>9} {'RSS MB':>8} {'VARIAÇÃO':>10}")
+    print("-" * 74)
+    for row in results:
+        rss = f"{row['peak_rss_mb']:.1f}" if row['peak_rss_mb'] is not None else 'n/d'
+        alloc = f"{row['peak_alloc_mb']:.1f}" if row['peak_alloc_mb'] is not None else '-'
+        change = f"{row['change'] * 100:+.1f}%" if 'change' in row else ''
+        print(f"{row['stage']:<14} {row['seconds']:>9.3f} {row['docs_per_s']:>9.1f} "
+              f"{row['mb_per_s']:>8.2f} {alloc:>9} {rss:>8} {change:>10}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark das etapas do pipeline de documentos')
+    parser.add_argument('--docs', type=int, default=20, help='Quantidade de documentos sintéticos')
+    parser.add_argument('--paragrafos', type=int, default=40, help='Parágrafos por documento')
+    parser.add_argument('--tabelas', type=int, default=2, help='Tabelas por documento')
+    parser.add_argument('--links', type=float, default=0.2,
+                        help='Fração de parágrafos com hyperlink')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador')
+    parser.add_argument('--corpus', help='Usa os .docx deste diretório em vez de gerar')
+    parser.add_argument('--alocacao', action='store_true',
+                        help='Mede o pico de alocação por etapa com tracemalloc (mais lento)')
+    parser.add_argument('--baseline', help='Arquivo JSON de baseline para comparação')
+    parser.add_argument('--salvar-baseline', help='Grava os resultados como baseline neste arquivo')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='Queda de vazão tolerada antes de acusar regressão (fração)')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='benchmark_pipeline_')
+    try:
+        if args.corpus:
+            paths = [doc['path'] for doc in iter_documents([args.corpus])]
+        else:
+            paths = generate_corpus(os.path.join(work_dir, 'corpus'), args.docs, args.paragrafos,
+                                    args.tabelas, args.links, args.seed)
+        output_dir = os.path.join(work_dir, 'saida')
+        os.makedirs(output_dir)
+
+        results, peak_rss = run_benchmark(paths, output_dir, args.alocacao)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_baseline(results, json.load(f), args.tolerancia)
+
+    print("=" * 74)
+    print(f"BENCHMARK DO PIPELINE - {len(paths)} documentos")
+    print("=" * 74)
+    print_results(results)
+    print("=" * 74)
+    if peak_rss is not None:
+        print(f"🧠 Pico de memória residente das etapas: {peak_rss:.1f} MB")
+
+    if args.salvar_baseline:
+        with open(args.salvar_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'docs': len(paths),
+                'paragraphs': args.paragrafos,
+                'tables': args.tabelas,
+                'link_density': args.links,
+                'peak_rss_mb': peak_rss,
+                'stages': results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"💾 Baseline gravado em {args.salvar_baseline}")
+
+    if regressions:
+        print(f"❌ Regressão de vazão em: {', '.join(regressions)}")
+        sys.exit(1)
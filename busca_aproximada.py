@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Busca Aproximada - Concierge RH Digital INPI
+Corrige palavras digitadas com erro ("licensa", "aposentadorea") a partir do
+vocabulário do corpus, extraído pelo pipeline (extract_content_with_links /
+leitura_rapida.iter_content). Usa um dicionário de deleções no estilo
+SymSpell: cada termo é indexado pelas variantes do seu prefixo com até
+MAX_EDIT_DISTANCE letras apagadas, e a consulta gera as deleções da palavra
+digitada e só compara com os termos que compartilham alguma. O custo da
+consulta depende do tamanho da palavra, não do tamanho do vocabulário.
+
+O arquivo gravado (src/fuzzy-vocabulary.json) guarda só termos e
+frequências; o dicionário de deleções é refeito na carga.
+"""
+
+from indice_busca import tokenize, BASE_DIR
+from corpus_docs import add_arguments, from_args
+from manifesto import atomic_write
+import argparse
+import json
+import os
+import time
+
+FUZZY_VERSION = 1
+
+# Distância de edição (Damerau restrita: inserção, remoção, troca e
+# transposição de letras vizinhas) aceita na correção
+MAX_EDIT_DISTANCE = 2
+# Palavras curtas aceitam só uma edição ("sus" não vira "sua", "seu", "sou"...)
+SHORT_WORD_LENGTH = 4
+# Só o início de cada termo entra no dicionário de deleções (limita o tamanho)
+PREFIX_LENGTH = 9
+MAX_SUGGESTIONS = 5
+
+VOCABULARY_PATH = os.path.join(BASE_DIR, 'src', 'fuzzy-vocabulary.json')
+
+# ---------------------------------------------------------------------------
+# Vocabulário
+# ---------------------------------------------------------------------------
+
+def vocabulary_from_content(content, vocabulary=None):
+    """Soma a frequência das palavras de um fluxo de parágrafos extraídos"""
+    vocabulary = {} if vocabulary is None else vocabulary
+    for item in content:
+        for token in tokenize(item['text']):
+            vocabulary[token] = vocabulary.get(token, 0) + 1
+    return vocabulary
+
+def corpus_vocabulary(documents):
+    """Vocabulário de todos os documentos do corpus (uma leitura em fluxo por arquivo)"""
+    from leitura_rapida import iter_content
+
+    vocabulary = {}
+    for doc in documents:
+        vocabulary_from_content(iter_content(doc['path'], tables=True), vocabulary)
+    return vocabulary
+
+# ---------------------------------------------------------------------------
+# Dicionário de deleções
+# ---------------------------------------------------------------------------
+
+def _deletes(word, max_distance):
+    """A palavra e todas as variantes com até max_distance letras apagadas"""
+    found = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        following = []
+        for candidate in frontier:
+            if len(candidate) <= 1:
+                continue
+            for i in range(len(candidate)):
+                variant = candidate[:i] + candidate[i + 1:]
+                if variant not in found:
+                    found.add(variant)
+                    following.append(variant)
+        frontier = following
+    return found
+
+def build_fuzzy(vocabulary, max_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Monta o dicionário de deleções: variante -> termos do vocabulário
+
+    Variantes com um único termo (a grande maioria) guardam a string direto,
+    sem lista, para economizar memória.
+    """
+    deletes = {}
+    for term in vocabulary:
+        for variant in _deletes(term[:prefix_length], max_distance):
+            current = deletes.get(variant)
+            if current is None:
+                deletes[variant] = term
+            elif isinstance(current, str):
+                deletes[variant] = [current, term]
+            else:
+                current.append(term)
+
+    return {
+        'max_distance': max_distance,
+        'prefix_length': prefix_length,
+        'max_length': max((len(term) for term in vocabulary), default=0),
+        'terms': dict(vocabulary),
+        'deletes': deletes
+    }
+
+def edit_distance(a, b, max_distance):
+    """Distância de Damerau restrita (OSA) entre a e b, ou max_distance + 1 se passar do limite"""
+    if a == b:
+        return 0
+    # Prefixo e sufixo comuns não mudam a distância
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return min(max(len(a), len(b)), max_distance + 1)
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def allowed_distance(fuzzy, word):
+    """Edições aceitas para a palavra (menos para palavras curtas)"""
+    return 1 if len(word) <= SHORT_WORD_LENGTH else fuzzy['max_distance']
+
+def lookup(fuzzy, word, max_distance=None, limit=MAX_SUGGESTIONS, known=None):
+    """Termos do vocabulário próximos de word: [(termo, distância, frequência)]
+
+    Ordenados por distância, depois pelo termo mais frequente. Uma palavra
+    que existe no vocabulário é devolvida sozinha. Com `known` (ex.: os termos
+    de um índice), só entram os termos contidos nele.
+    """
+    terms = fuzzy['terms']
+    if word in terms and (known is None or word in known):
+        return [(word, 0, terms[word])]
+    if max_distance is None:
+        max_distance = allowed_distance(fuzzy, word)
+    max_distance = min(max_distance, fuzzy['max_distance'])
+    if len(word) - fuzzy['max_length'] > max_distance:
+        return []
+
+    deletes = fuzzy['deletes']
+    prefix = word[:fuzzy['prefix_length']]
+    suggestions = {}
+    checked = set()
+    frontier = [prefix]
+    seen = {prefix}
+    for removed in range(max_distance + 1):
+        following = []
+        for candidate in frontier:
+            matches = deletes.get(candidate)
+            if matches is not None:
+                for term in ((matches,) if isinstance(matches, str) else matches):
+                    if term in checked:
+                        continue
+                    checked.add(term)
+                    if len(term) - len(word) > max_distance or len(word) - len(term) > max_distance:
+                        continue
+                    if known is not None and term not in known:
+                        continue
+                    distance = edit_distance(word, term, max_distance)
+                    if distance <= max_distance:
+                        suggestions[term] = distance
+            if removed < max_distance and len(candidate) > 1:
+                for i in range(len(candidate)):
+                    variant = candidate[:i] + candidate[i + 1:]
+                    if variant not in seen:
+                        seen.add(variant)
+                        following.append(variant)
+        frontier = following
+
+    ranked = sorted(suggestions.items(), key=lambda item: (item[1], -terms[item[0]], item[0]))
+    return [(term, distance, terms[term]) for term, distance in ranked[:limit]]
+
+def correct(fuzzy, word, known=None):
+    """Melhor correção para a palavra, ou None se nada estiver perto"""
+    suggestions = lookup(fuzzy, word, limit=1, known=known)
+    return suggestions[0][0] if suggestions else None
+
+def correct_query(fuzzy, query, known=None):
+    """Palavras da busca com a correção de cada uma: [(palavra, correção ou None)]"""
+    return [(word, correct(fuzzy, word, known)) for word in tokenize(query)]
+
+def brute_force(vocabulary, word, max_distance):
+    """Varredura linear do vocabulário (referência para os testes e o benchmark)"""
+    found = []
+    for term, frequency in vocabulary.items():
+        distance = edit_distance(word, term, max_distance)
+        if distance <= max_distance:
+            found.append((term, distance, frequency))
+    found.sort(key=lambda item: (item[1], -item[2], item[0]))
+    return found
+
+# ---------------------------------------------------------------------------
+# Arquivo
+# ---------------------------------------------------------------------------
+
+def write_vocabulary(fuzzy, path=VOCABULARY_PATH):
+    """Grava termos e frequências (arquivo temporário + rename)"""
+    data = {
+        'version': FUZZY_VERSION,
+        'max_distance': fuzzy['max_distance'],
+        'prefix_length': fuzzy['prefix_length'],
+        'terms': dict(sorted(fuzzy['terms'].items()))
+    }
+    with atomic_write(path) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+def load_fuzzy(path=VOCABULARY_PATH):
+    """Carrega o vocabulário gravado e refaz o dicionário de deleções"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return build_fuzzy(data['terms'], data['max_distance'], data['prefix_length'])
+
+# ---------------------------------------------------------------------------
+# Erros de digitação sintéticos (testes e benchmarks)
+# ---------------------------------------------------------------------------
+
+_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+def misspell(word, edits, rng):
+    """Aplica `edits` erros de digitação aleatórios à palavra"""
+    for _ in range(edits):
+        i = rng.randrange(len(word))
+        kind = rng.choice(('insert', 'delete', 'replace', 'transpose'))
+        if kind == 'insert':
+            word = word[:i] + rng.choice(_LETTERS) + word[i:]
+        elif kind == 'delete' and len(word) > 1:
+            word = word[:i] + word[i + 1:]
+        elif kind == 'transpose' and i < len(word) - 1:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        else:
+            word = word[:i] + rng.choice(_LETTERS) + word[i + 1:]
+    return word
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera o vocabulário da busca aproximada')
+    parser.add_argument('palavras', nargs='*', help='Palavras para corrigir (consulta)')
+    parser.add_argument('--saida', default=VOCABULARY_PATH,
+                        help='Arquivo do vocabulário (padrão: src/fuzzy-vocabulary.json)')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.palavras and os.path.exists(args.saida):
+        fuzzy = load_fuzzy(args.saida)
+    else:
+        start = time.perf_counter()
+        fuzzy = build_fuzzy(corpus_vocabulary(from_args(args)))
+        elapsed = time.perf_counter() - start
+        write_vocabulary(fuzzy, args.saida)
+        print(f"📚 Vocabulário: {len(fuzzy['terms'])} termos | "
+              f"{len(fuzzy['deletes'])} deleções | {elapsed:.2f}s")
+        print(f"💾 Arquivo: {args.saida} ({os.path.getsize(args.saida) / 1024:.1f} KB)")
+
+    for word in args.palavras:
+        for token in tokenize(word):
+            suggestions = lookup(fuzzy, token)
+            shown = ', '.join(f"{term} ({distance})" for term, distance, _ in suggestions) or '—'
+            print(f"🔍 {token}: {shown}")
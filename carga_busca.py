@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste de Carga da Busca - Concierge RH Digital INPI
+Reproduz um log de buscas (gravado ou sintético, com buscas típicas de RH e
+erros de digitação) contra um endpoint /api/search?q= (servidor_busca.py ou
+a API publicada) ou direto contra o índice em memória, com concorrência e
+taxa configuráveis. Informa p50/p95/p99, vazão, taxa de erros e acertos de
+cache, e compara com um baseline gravado.
+
+Com --taxa a carga é de malha aberta: cada busca tem um horário marcado e a
+latência conta a partir dele, então a fila formada quando o servidor atrasa
+entra na medida (sem "coordinated omission"). Sem --taxa, cada worker manda
+a próxima busca assim que recebe a resposta.
+"""
+
+from benchmark_busca import DEFAULT_QUERIES, DEFAULT_TYPOS, percentile
+from busca_aproximada import misspell
+from corpus_docs import add_arguments, from_args
+from indice_busca import strip_accents, DATABASE_PATH
+from collections import Counter
+from urllib.parse import urlsplit, quote, unquote_plus
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUESTS = 2000
+WARMUP_REQUESTS = 50
+TIMEOUT = 5.0
+# Fração das buscas sintéticas com erro de digitação
+TYPO_RATE = 0.15
+# Expoente da distribuição de Zipf das buscas sintéticas (poucas buscas muito repetidas)
+ZIPF_EXPONENT = 1.0
+
+# Buscas de RH além das do benchmark_busca
+HR_QUERIES = [
+    'contracheque', 'auxílio transporte', 'licença capacitação', 'abono permanência',
+    'afastamento', 'pensão', 'progressão funcional', 'teletrabalho', 'horário especial',
+    'licença maternidade', 'licença paternidade', 'ressarcimento saúde', 'plano de saúde',
+    'auxílio creche', 'adicional noturno', 'insalubridade', 'hora extra', 'sougov',
+    'processo sei', 'declaração de bens', 'exoneração', 'vacância', 'averbação tempo',
+    'margem consignável', 'imposto de renda', 'gratificação desempenho'
+]
+
+_LOG_QUERY = re.compile(r'[?&]q=([^&\s"]*)')
+
+# ---------------------------------------------------------------------------
+# Log de buscas
+# ---------------------------------------------------------------------------
+
+def synthetic_log(count, seed=42, typo_rate=TYPO_RATE):
+    """Buscas sintéticas: populares repetidas (Zipf), sem acento, maiúsculas e com erros"""
+    rng = random.Random(seed)
+    queries = list(dict.fromkeys(DEFAULT_QUERIES + HR_QUERIES))
+    rng.shuffle(queries)
+    weights = [1 / (rank ** ZIPF_EXPONENT) for rank in range(1, len(queries) + 1)]
+
+    log = []
+    for query in rng.choices(queries, weights, k=count):
+        roll = rng.random()
+        if roll < typo_rate:
+            words = query.split()
+            i = rng.randrange(len(words))
+            if len(words[i]) > 3:
+                words[i] = misspell(words[i], rng.randint(1, 2), rng)
+            query = ' '.join(words)
+        elif roll < typo_rate + 0.2:
+            query = strip_accents(query)
+        elif roll < typo_rate + 0.25:
+            query = query.upper()
+        log.append(query)
+    # Erros de digitação vistos de verdade também aparecem
+    for typo in DEFAULT_TYPOS:
+        if rng.random() < typo_rate:
+            log[rng.randrange(len(log))] = typo
+    return log
+
+def load_log(path):
+    """Buscas de um arquivo: uma por linha, NDJSON ({"q"} ou {"query"}) ou log de acesso"""
+    log = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                record = json.loads(line)
+                query = record.get('q', record.get('query'))
+                if query is not None:
+                    log.append(str(query))
+                continue
+            match = _LOG_QUERY.search(line)
+            log.append(unquote_plus(match.group(1)) if match else line)
+    return log
+
+def save_log(log, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for query in log:
+            f.write(query + '\n')
+
+# ---------------------------------------------------------------------------
+# Alvos
+# ---------------------------------------------------------------------------
+
+async def _read_response(reader):
+    """Status, cabeçalhos e corpo de uma resposta HTTP/1.1 com Content-Length"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', '0'))
+    body = await reader.readexactly(length) if length else b''
+    return status, headers, body
+
+def http_target(url, timeout=TIMEOUT):
+    """Alvo HTTP: cada worker mantém uma conexão keep-alive própria
+
+    Devolve uma fábrica de funções `send(query) -> (status, acerto de cache)`.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', ''):
+        raise ValueError('Só http:// é suportado (use um proxy local para https)')
+    host = parts.hostname or '127.0.0.1'
+    port = parts.port or 80
+    path = (parts.path.rstrip('/') or '') + '/api/search?q='
+
+    def factory():
+        connection = {'reader': None, 'writer': None}
+
+        async def send(query):
+            for attempt in (1, 2):
+                if connection['writer'] is None:
+                    connection['reader'], connection['writer'] = await asyncio.wait_for(
+                        asyncio.open_connection(host, port), timeout)
+                try:
+                    connection['writer'].write(
+                        (f"GET {path}{quote(query)} HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Connection: keep-alive\r\n\r\n").encode('ascii'))
+                    await connection['writer'].drain()
+                    status, headers, _ = await asyncio.wait_for(
+                        _read_response(connection['reader']), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # Conexão ociosa fechada pelo servidor: reabre uma vez
+                    await close()
+                    if attempt == 2:
+                        raise
+                    continue
+                except BaseException:
+                    await close()
+                    raise
+                if headers.get('connection', '').lower() == 'close':
+                    await close()
+                return status, headers.get('x-cache') == 'HIT'
+
+        async def close():
+            writer = connection['writer']
+            connection['reader'] = connection['writer'] = None
+            if writer is not None:
+                writer.close()
+
+        send.close = close
+        return send
+
+    return factory
+
+def index_target(service):
+    """Alvo em memória: o mesmo caminho do servidor_busca sem HTTP (só o índice e o cache)"""
+    from servidor_busca import query_words, cached_search
+
+    def factory():
+        async def send(query):
+            words = query_words(query)
+            if not words:
+                return 200, False
+            _, hit = cached_search(service, words)
+            return 200, hit
+
+        async def close():
+            pass
+
+        send.close = close
+        return send
+
+    return factory
+
+# ---------------------------------------------------------------------------
+# Carga
+# ---------------------------------------------------------------------------
+
+async def run_load(factory, log, concurrency=DEFAULT_CONCURRENCY, rate=None,
+                   requests=None, duration=None):
+    """Dispara as buscas do log (em ciclo) e mede cada uma
+
+    Para em `requests` buscas ou depois de `duration` segundos, o que vier
+    primeiro (sem nenhum dos dois: uma passada pelo log).
+    """
+    if requests is None and duration is None:
+        requests = len(log)
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+    state = {'next': 0, 'hits': 0}
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    async def worker():
+        send = factory()
+        try:
+            while True:
+                i = state['next']
+                if requests is not None and i >= requests:
+                    return
+                state['next'] += 1
+                scheduled = start + i / rate if rate else None
+                now = time.perf_counter()
+                if deadline is not None and (scheduled or now) >= deadline:
+                    return
+                if scheduled is not None and scheduled > now:
+                    await asyncio.sleep(scheduled - now)
+                began = scheduled if scheduled is not None else time.perf_counter()
+                try:
+                    status, hit = await send(log[i % len(log)])
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+                    continue
+                latencies.append((time.perf_counter() - began) * 1000)
+                statuses[status] += 1
+                if status >= 400:
+                    errors[f'HTTP {status}'] += 1
+                if hit:
+                    state['hits'] += 1
+        finally:
+            await send.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'latencies': latencies,
+        'statuses': statuses,
+        'errors': errors,
+        'hits': state['hits'],
+        'seconds': elapsed
+    }
+
+def summarize(run, concurrency, rate=None):
+    """Resumo de uma rodada (o que vai para o baseline)"""
+    latencies = run['latencies']
+    failed = sum(run['errors'].values())
+    total = len(latencies) + sum(n for name, n in run['errors'].items() if not name.startswith('HTTP'))
+    return {
+        'requests': total,
+        'errors': failed,
+        'error_rate': failed / total if total else 0.0,
+        'error_kinds': dict(run['errors']),
+        'throughput': total / run['seconds'] if run['seconds'] else 0.0,
+        'mean_ms': statistics.mean(latencies) if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies, default=0.0),
+        'cache_hit_rate': run['hits'] / len(latencies) if latencies else 0.0,
+        'concurrency': concurrency,
+        'rate': rate
+    }
+
+# Métricas comparadas com o baseline e se subir é pior
+COMPARED = (('p50_ms', True), ('p95_ms', True), ('p99_ms', True), ('throughput', False))
+# Aumento da taxa de erros (absoluto) tolerado
+ERROR_RATE_TOLERANCE = 0.01
+
+def compare_baseline(summary, baseline, tolerance):
+    """Variação de cada métrica e lista das que pioraram além de `tolerance` (fração)"""
+    changes = {}
+    regressions = []
+    for key, higher_is_worse in COMPARED:
+        before = baseline.get(key)
+        if not before:
+            continue
+        change = summary[key] / before - 1
+        changes[key] = change
+        if (change > tolerance) if higher_is_worse else (change < -tolerance):
+            regressions.append(key)
+    if summary['error_rate'] - baseline.get('error_rate', 0.0) > ERROR_RATE_TOLERANCE:
+        regressions.append('error_rate')
+    return changes, regressions
+
+def print_summary(summary, changes=None):
+    changes = changes or {}
+
+    def change(key):
+        return f"  ({changes[key] * 100:+.1f}%)" if key in changes else ''
+
+    mode = f"taxa {summary['rate']:.0f}/s" if summary['rate'] else 'malha fechada'
+    print(f"⚙️  Concorrência: {summary['concurrency']} | {mode}")
+    print(f"📨 Buscas: {summary['requests']} | erros: {summary['errors']} "
+          f"({summary['error_rate'] * 100:.2f}%)")
+    for kind, count in sorted(summary['error_kinds'].items()):
+        print(f"   ❌ {kind}: {count}")
+    print(f"⚡ Vazão: {summary['throughput']:,.0f} buscas/s{change('throughput')}")
+    print(f"⏱️  p50: {summary['p50_ms']:.3f} ms{change('p50_ms')}")
+    print(f"⏱️  p95: {summary['p95_ms']:.3f} ms{change('p95_ms')}")
+    print(f"⏱️  p99: {summary['p99_ms']:.3f} ms{change('p99_ms')}")
+    print(f"⏱️  máx: {summary['max_ms']:.3f} ms | média: {summary['mean_ms']:.3f} ms")
+    print(f"🗃️  Acertos de cache: {summary['cache_hit_rate'] * 100:.1f}%")
+
+async def _load_with_warmup(factory, log, args):
+    if args.aquecimento:
+        await run_load(factory, log, min(args.concorrencia, args.aquecimento),
+                       requests=args.aquecimento)
+    return await run_load(factory, log, args.concorrencia, args.taxa,
+                          args.requisicoes, args.duracao)
+
+# ---------------------------------------------------------------------------
+# Verificação
+# ---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de carga da busca (/api/search?q=)')
+    parser.add_argument('--url', help='Endpoint a testar (ex.: http://127.0.0.1:8787); '
+                                      'sem --url, usa o índice em memória do servidor_busca')
+    parser.add_argument('--database', nargs='?', const=DATABASE_PATH, metavar='ARQUIVO',
+                        help='Índice em memória a partir do database.json (padrão: .docx do corpus)')
+    parser.add_argument('--log', help='Log de buscas (uma por linha, NDJSON ou log de acesso)')
+    parser.add_argument('--salvar-log', help='Grava o log sintético usado neste arquivo')
+    parser.add_argument('--requisicoes', type=int, default=DEFAULT_REQUESTS,
+                        help='Buscas disparadas (o log é repetido em ciclo)')
+    parser.add_argument('--duracao', type=float, help='Limite de tempo em segundos')
+    parser.add_argument('--concorrencia', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Conexões/workers simultâneos')
+    parser.add_argument('--taxa', type=float, help='Buscas por segundo (malha aberta)')
+    parser.add_argument('--aquecimento', type=int, default=WARMUP_REQUESTS,
+                        help='Buscas descartadas antes da medição')
+    parser.add_argument('--erros-digitacao', type=float, default=TYPO_RATE,
+                        help='Fração de buscas sintéticas com erro de digitação')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do log sintético')
+    parser.add_argument('--baseline', help='Arquivo JSON de baseline para comparação')
+    parser.add_argument('--salvar-baseline', help='Grava o resultado como baseline neste arquivo')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='Piora tolerada de latência/vazão antes de acusar regressão (fração)')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.log:
+        log = load_log(args.log)
+    else:
+        log = synthetic_log(max(args.requisicoes, 1), args.seed, args.erros_digitacao)
+        if args.salvar_log:
+            save_log(log, args.salvar_log)
+    if not log:
+        print("❌ Log de buscas vazio")
+        sys.exit(1)
+
+    if args.url:
+        target = args.url
+        factory = http_target(args.url)
+    else:
+        from servidor_busca import database_source, corpus_source, open_service
+
+        source = database_source(args.database) if args.database else corpus_source(lambda: from_args(args))
+        target = f"índice em memória ({source['name']})"
+        factory = index_target(open_service(source))
+
+    summary = summarize(asyncio.run(_load_with_warmup(factory, log, args)),
+                        args.concorrencia, args.taxa)
+
+    changes, regressions = {}, []
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            changes, regressions = compare_baseline(summary, json.load(f), args.tolerancia)
+
+    print("=" * 70)
+    print(f"TESTE DE CARGA DA BUSCA - {target}")
+    print("=" * 70)
+    print(f"📜 Log: {args.log or 'sintético'} ({len(log)} buscas, {len(set(log))} distintas)")
+    print_summary(summary, changes)
+    print("=" * 70)
+
+    if args.salvar_baseline:
+        with open(args.salvar_baseline, 'w', encoding='utf-8') as f:
+            json.dump(dict(summary, target=target, log=args.log or 'sintético'), f,
+                      ensure_ascii=False, indent=2)
+        print(f"💾 Baseline gravado em {args.salvar_baseline}")
+
+    if regressions:
+        print(f"❌ Regressão em: {', '.join(regressions)}")
+        sys.exit(1)
@@ -0,0 +1,583 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Carga no Redis - Concierge RH Digital INPI
+Carrega no Redis os documentos extraídos pelo pipeline Python (hashes
+doc:<id>, conjunto docs:all e conjuntos search:<palavra>, os mesmos lidos por
+api/search.ts). Cada carga monta uma geração completa do índice sob o
+prefixo idx:<versão>: (documentos, postings e estatísticas) ao lado da
+geração no ar, com escritas em lote via pipeline MULTI/EXEC. Quando a
+montagem termina, só o ponteiro index:current muda, em uma transação pequena,
+e a geração antiga é apagada em segundo plano, em lotes. A busca nunca vê um
+índice pela metade nem espera por uma troca grande.
+
+Requer o pacote `redis`. Os testes (tests/test_carga_redis.py) usam o
+`fakeredis` em memória.
+"""
+
+from leitura_rapida import iter_content
+from indice_busca import tokenize, slugify
+from corpus_docs import add_arguments, from_args
+from datetime import datetime, timezone
+from html import escape
+import argparse
+import json
+import os
+import threading
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Comandos por transação MULTI/EXEC durante a montagem
+BATCH_SIZE = 500
+
+# Tentativas de troca quando outro cliente altera o índice no meio dela
+SWAP_RETRIES = 5
+
+# Chaves apagadas por UNLINK na coleta da geração antiga (e pausa entre lotes)
+GC_BATCH_SIZE = 200
+GC_PAUSE = 0.01
+
+# Espera antes de apagar a geração antiga: buscas que já leram o ponteiro
+# antigo ainda terminam de ler as chaves dela
+GC_GRACE_SECONDS = 30
+
+GENERATION_PREFIX = 'idx:{version}:'
+CURRENT_KEY = 'index:current'
+ALL_DOCS_KEY = 'docs:all'
+STATS_KEY = 'stats'
+
+# Chaves do layout antigo (sem geração), gravado pelos scripts Node
+LEGACY_PATTERNS = ('doc:*', 'search:*', ALL_DOCS_KEY)
+
+# Campos mantidos pela API (api/stats.ts) e a data de criação, que a recarga
+# não pode zerar. Além deles, todo campo que o pipeline não grava (ex.: blobUrl
+# e metadata de api/admin/upload.ts) passa do hash antigo para o novo (ver
+# _kept_fields)
+PRESERVED_FIELDS = ('views', 'ratings', 'createdAt')
+
+def _kept_fields(old, fields):
+    """Campos do hash antigo que sobrevivem à regravação com `fields`
+
+    Os de PRESERVED_FIELDS e os que o pipeline não grava.
+    """
+    return {f: v for f, v in old.items()
+            if v is not None and (f in PRESERVED_FIELDS or f not in fields)}
+
+def connect(url=None):
+    """Cliente Redis pela URL (ou REDIS_URL/KV_REST_API_URL)"""
+    if redis is None:
+        raise RuntimeError("Pacote 'redis' não instalado (pip install redis)")
+    url = url or os.environ.get('KV_REST_API_URL') or os.environ.get('REDIS_URL')
+    if not url:
+        raise RuntimeError('REDIS_URL ou KV_REST_API_URL não configurada')
+    return redis.Redis.from_url(url, decode_responses=True)
+
+# ---------------------------------------------------------------------------
+# Documentos
+# ---------------------------------------------------------------------------
+
+def paragraph_html(item):
+    """HTML do parágrafo com os links extraídos (primeira ocorrência do texto)"""
+    html = escape(item['text'])
+    for link in item['links']:
+        anchor = escape(link['text'])
+        if anchor and anchor in html:
+            html = html.replace(
+                anchor, f'<a href="{escape(link["url"])}" target="_self">{anchor}</a>', 1)
+    if item['bold']:
+        html = f'<strong>{html}</strong>'
+    return f'<p>{html}</p>'
+
+def section_from_item(item, position):
+    """Seção no formato de src/database.json para um parágrafo extraído"""
+    if position == 0:
+        return {'type': 'heading', 'level': 1, 'content': item['text']}
+    if 'Heading' in item['style'] or (item['bold'] and len(item['text']) < 100
+                                      and not item['links']):
+        return {'type': 'heading', 'level': 2, 'content': item['text']}
+    section = {'type': 'paragraph', 'content': item['text'], 'html': paragraph_html(item)}
+    if item['links']:
+        section['links'] = [{'text': l['text'], 'url': l['url']} for l in item['links']]
+    return section
+
+def sections_from_content(content):
+    """Seções no formato de src/database.json a partir de extract_content_with_links"""
+    return [section_from_item(item, position) for position, item in enumerate(content)]
+
+def document_from_content(doc_name, content, last_modified=''):
+    """Hash doc:<id> (mesmos campos de api/admin/upload.ts) a partir do conteúdo extraído
+
+    O conteúdo é percorrido uma única vez, então pode ser o fluxo de
+    leitura_rapida.iter_content.
+    """
+    title = os.path.splitext(os.path.basename(doc_name))[0]
+    texts = []
+    words = {}
+    sections = []
+    links = 0
+    word_count = 0
+    for position, item in enumerate(content):
+        texts.append(item['text'])
+        words.update(dict.fromkeys(tokenize(item['text'])))
+        sections.append(section_from_item(item, position))
+        links += len(item['links'])
+        word_count += len(item['text'].split())
+    text = '\n'.join(texts)
+    now = datetime.now(timezone.utc).isoformat()
+
+    return {
+        'id': slugify(title),
+        'title': title,
+        'keywords': ' '.join(words),
+        'description': text,
+        'content': text,
+        'sections': json.dumps(sections, ensure_ascii=False),
+        'icon': 'file-text',
+        'color': json.dumps({'bg': 'blue', 'text': 'white'}),
+        'externalLink': '',
+        'lastModified': last_modified or now,
+        'createdAt': now,
+        'metadata': json.dumps({
+            'hasImages': False,
+            'hasTables': False,
+            'hasLinks': links > 0,
+            'wordCount': word_count,
+            'paragraphCount': len(texts)
+        })
+    }
+
+def document_from_docx(doc_path):
+    """Extrai um .docx (conteúdo em fluxo) e monta o hash do documento"""
+    mtime = datetime.fromtimestamp(os.path.getmtime(doc_path), timezone.utc).isoformat()
+    return document_from_content(doc_path, iter_content(doc_path), mtime)
+
+def _section_plain_text(section):
+    if section.get('type') in ('paragraph', 'heading'):
+        return section.get('content') or ''
+    if section.get('type') == 'list':
+        return ' '.join(item.get('text') or '' for item in section.get('items') or [])
+    return ''
+
+def document_from_database(doc, created_at=''):
+    """Hash doc:<id> para um documento do src/database.json (mesmos campos de scripts/migrate-to-kv.js)"""
+    content = ' '.join(text for text in map(_section_plain_text, doc.get('sections') or []) if text)
+    return {
+        'id': doc['id'],
+        'title': doc.get('title') or '',
+        'keywords': doc.get('keywords') or '',
+        'description': doc.get('description') or '',
+        'content': content,
+        'sections': json.dumps(doc.get('sections') or [], ensure_ascii=False),
+        'icon': doc.get('icon') or 'file-text',
+        'color': json.dumps(doc.get('color') or {}, ensure_ascii=False),
+        'externalLink': doc.get('externalLink') or '',
+        'lastModified': doc.get('lastModified') or '',
+        'createdAt': created_at or datetime.now(timezone.utc).isoformat()
+    }
+
+def search_words(document):
+    """Palavras indexadas em search:<palavra> (mesma regra de scripts/migrate-to-kv.js)"""
+    return set(tokenize(f"{document.get('title', '')} {document.get('keywords', '')} "
+                        f"{document.get('content', '')}"))
+
+# ---------------------------------------------------------------------------
+# Montagem e troca da versão
+# ---------------------------------------------------------------------------
+
+def _flush(pipe, pending):
+    if pending:
+        pipe.execute()
+    return 0
+
+def build_generation(client, documents, version, batch_size=BATCH_SIZE):
+    """Grava documentos e postings sob idx:<versão>: em transações em lote
+
+    As postings são agrupadas em memória, então cada palavra vira um único
+    SADD com todos os ids em vez de um comando por documento.
+    Devolve as chaves lógicas gravadas (sem o prefixo).
+    """
+    prefix = GENERATION_PREFIX.format(version=version)
+    postings = {}
+    doc_ids = []
+    keys = []
+
+    pipe = client.pipeline(transaction=True)
+    pending = 0
+    for document in documents:
+        doc_id = document['id']
+        doc_ids.append(doc_id)
+        keys.append(f'doc:{doc_id}')
+        pipe.hset(prefix + f'doc:{doc_id}', mapping=document)
+        pending += 1
+        for word in search_words(document):
+            postings.setdefault(word, []).append(doc_id)
+        if pending >= batch_size:
+            pending = _flush(pipe, pending)
+
+    for word, ids in postings.items():
+        keys.append(f'search:{word}')
+        pipe.sadd(prefix + f'search:{word}', *ids)
+        pending += 1
+        if pending >= batch_size:
+            pending = _flush(pipe, pending)
+
+    if doc_ids:
+        keys.append(ALL_DOCS_KEY)
+        pipe.sadd(prefix + ALL_DOCS_KEY, *doc_ids)
+        pending += 1
+    _flush(pipe, pending)
+    return keys
+
+def _scan(client, pattern):
+    return list(client.scan_iter(match=pattern, count=1000))
+
+def live_prefix(client):
+    """Prefixo da geração no ar ('' no layout antigo, antes da primeira carga)"""
+    version = client.get(CURRENT_KEY)
+    return GENERATION_PREFIX.format(version=version) if version else ''
+
+def drop_generation(client, version):
+    """Remove as chaves de uma versão (montagem interrompida)"""
+    collect_generation(client, GENERATION_PREFIX.format(version=version), grace=0)
+
+def _copy_document(pipe, prefix, document):
+    doc_id = document['id']
+    pipe.hset(prefix + f'doc:{doc_id}', mapping=document)
+    pipe.sadd(prefix + ALL_DOCS_KEY, doc_id)
+    for word in search_words(document):
+        pipe.sadd(prefix + f'search:{word}', doc_id)
+
+def _drop_document(pipe, prefix, document):
+    doc_id = document['id']
+    pipe.delete(prefix + f'doc:{doc_id}')
+    pipe.srem(prefix + ALL_DOCS_KEY, doc_id)
+    for word in search_words(document):
+        pipe.srem(prefix + f'search:{word}', doc_id)
+
+def replay_late_writes(client, handoff):
+    """Reaplica na geração no ar o que a API gravou na antiga depois da troca
+
+    Uma requisição (upload, delete, contador de views) que leu index:current
+    antes da troca e gravou depois cai na geração antiga. Comparando a
+    geração antiga com a passagem de flip_generation: views a mais viram
+    HINCRBY na geração no ar, documentos novos são copiados com as postings
+    e documentos apagados são removidos. Devolve quantas escritas refez.
+    """
+    old = handoff['prefix']
+    live = live_prefix(client)
+    if live == old:
+        return 0
+
+    old_ids = set(client.smembers(old + ALL_DOCS_KEY))
+    live_ids = set(client.smembers(live + ALL_DOCS_KEY))
+    pipe = client.pipeline(transaction=False)
+    replayed = 0
+
+    for key in client.scan_iter(match=old + 'doc:*', count=1000):
+        doc_id = key[len(old) + 4:]
+        late = int(client.hget(key, 'views') or 0) - handoff['views'].get(doc_id, 0)
+        if late > 0 and doc_id in live_ids:
+            pipe.hincrby(live + f'doc:{doc_id}', 'views', late)
+            replayed += 1
+
+    for doc_id in sorted(old_ids - handoff['ids'] - live_ids):
+        document = client.hgetall(old + f'doc:{doc_id}')
+        if document.get('id'):
+            _copy_document(pipe, live, document)
+            pipe.hincrby(live + STATS_KEY, 'documents', 1)
+            replayed += 1
+
+    for doc_id in sorted((handoff['ids'] - old_ids) & live_ids):
+        document = client.hgetall(live + f'doc:{doc_id}')
+        if document:
+            _drop_document(pipe, live, document)
+            pipe.hincrby(live + STATS_KEY, 'documents', -1)
+            replayed += 1
+
+    pipe.execute()
+    return replayed
+
+def collect_generation(client, prefix, grace=GC_GRACE_SECONDS, handoff=None):
+    """Apaga as chaves de uma geração que saiu do ar, em lotes pequenos
+
+    Depois da carência, as escritas que ainda caíram na geração antiga são
+    levadas para a geração no ar (replay_late_writes com a passagem da
+    troca). UNLINK libera a memória fora da thread principal do Redis e a
+    pausa entre os lotes deixa as buscas passarem na frente. Devolve quantas
+    chaves foram apagadas (0 se a geração voltou ao ar).
+    """
+    if grace:
+        time.sleep(grace)
+    if prefix == live_prefix(client):
+        return 0
+    if handoff is not None:
+        replay_late_writes(client, handoff)
+
+    patterns = [prefix + '*'] if prefix else list(LEGACY_PATTERNS)
+    removed = 0
+    for pattern in patterns:
+        batch = []
+        for key in client.scan_iter(match=pattern, count=1000):
+            batch.append(key)
+            if len(batch) >= GC_BATCH_SIZE:
+                removed += client.unlink(*batch)
+                batch = []
+                time.sleep(GC_PAUSE)
+        if batch:
+            removed += client.unlink(*batch)
+    return removed
+
+def collect_in_background(client, prefix, grace=GC_GRACE_SECONDS, handoff=None):
+    """Coleta a geração antiga em uma thread; devolve a thread para quem quiser esperar"""
+    thread = threading.Thread(target=collect_generation, args=(client, prefix, grace, handoff),
+                              name='coleta-geracao', daemon=True)
+    thread.start()
+    return thread
+
+def flip_generation(client, version, keys, replace=False):
+    """Coloca a geração montada no ar trocando só o ponteiro index:current
+
+    A transação é pequena (proporcional ao número de documentos, não de
+    chaves): copia os campos de PRESERVED_FIELDS (views, ratings, createdAt)
+    e os que o pipeline não grava (blobUrl, metadata do admin) dos documentos da
+    geração antiga e, sem `replace`, traz para a nova os documentos que
+    não vêm do corpus (ex.: enviados pelo admin) com as postings deles.
+    WATCH no ponteiro, no docs:all e nos documentos antigos garante que nada
+    mudou entre a leitura e a troca; se mudou, a transação é refeita.
+
+    Devolve a passagem {'prefix', 'ids', 'views'}: o prefixo da geração que
+    saiu do ar, os documentos e as visualizações dela no momento da troca
+    (para replay_late_writes).
+    """
+    prefix = GENERATION_PREFIX.format(version=version)
+    doc_keys = [key for key in keys if key.startswith('doc:')]
+    corpus_ids = {key[4:] for key in doc_keys}
+
+    for _ in range(SWAP_RETRIES):
+        with client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(CURRENT_KEY)
+                old_prefix = live_prefix(pipe)
+                pipe.watch(old_prefix + ALL_DOCS_KEY, *(old_prefix + key for key in doc_keys))
+                live_ids = pipe.smembers(old_prefix + ALL_DOCS_KEY)
+
+                others = {}
+                extra = {}
+                if not replace:
+                    for doc_id in sorted(set(live_ids) - corpus_ids):
+                        pipe.watch(old_prefix + f'doc:{doc_id}')
+                        document = pipe.hgetall(old_prefix + f'doc:{doc_id}')
+                        if not document:
+                            continue
+                        others[f'doc:{doc_id}'] = document
+                        extra.setdefault(ALL_DOCS_KEY, []).append(doc_id)
+                        for word in search_words(document):
+                            extra.setdefault(f'search:{word}', []).append(doc_id)
+
+                views = {key[4:]: int(document.get('views') or 0) for key, document in others.items()}
+                preserved = {}
+                for key in doc_keys:
+                    # Só os nomes dos campos: as seções não saem do Redis
+                    new_fields = set(pipe.hkeys(prefix + key))
+                    wanted = [f for f in pipe.hkeys(old_prefix + key)
+                              if f in PRESERVED_FIELDS or f not in new_fields]
+                    if wanted:
+                        old = dict(zip(wanted, pipe.hmget(old_prefix + key, *wanted)))
+                        kept = _kept_fields(old, new_fields)
+                        if kept:
+                            preserved[key] = kept
+                        views[key[4:]] = int(old.get('views') or 0)
+
+                pipe.multi()
+                for key, document in others.items():
+                    pipe.hset(prefix + key, mapping=document)
+                for key, ids in extra.items():
+                    pipe.sadd(prefix + key, *ids)
+                for key, kept in preserved.items():
+                    pipe.hset(prefix + key, mapping=kept)
+                pipe.hset(prefix + STATS_KEY, 'documents', len(corpus_ids) + len(others))
+                pipe.set(CURRENT_KEY, version)
+                pipe.execute()
+                return {'prefix': old_prefix, 'ids': set(live_ids), 'views': views}
+            except redis.WatchError:
+                continue
+    raise RuntimeError('Índice alterado durante a troca; tente novamente')
+
+def load_documents(client, documents, version=None, replace=False, batch_size=BATCH_SIZE,
+                   grace=GC_GRACE_SECONDS):
+    """Monta uma nova geração do índice, coloca no ar e coleta a antiga
+
+    Sem `replace`, documentos no ar que não estão em `documents` continuam no
+    índice (ver flip_generation). A geração antiga é apagada em segundo plano
+    depois de `grace` segundos. Devolve {'version', 'previous', 'documents',
+    'keys', 'seconds', 'collector'}; 'collector' é a thread da coleta.
+    """
+    start = time.perf_counter()
+    version = version or datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')
+    documents = list(documents)
+
+    try:
+        keys = build_generation(client, documents, version, batch_size)
+        client.hset(GENERATION_PREFIX.format(version=version) + STATS_KEY, mapping={
+            'version': version,
+            'terms': sum(1 for key in keys if key.startswith('search:')),
+            'built_at': datetime.now(timezone.utc).isoformat(),
+            'build_seconds': f'{time.perf_counter() - start:.3f}'
+        })
+        handoff = flip_generation(client, version, keys, replace)
+    except Exception:
+        drop_generation(client, version)
+        raise
+
+    return {
+        'version': version,
+        'previous': handoff['prefix'],
+        'documents': len(documents),
+        'keys': len(keys),
+        'seconds': time.perf_counter() - start,
+        'collector': collect_in_background(client, handoff['prefix'], grace, handoff)
+    }
+
+def update_document(client, document):
+    """Grava ou atualiza um único documento na geração no ar (carga incremental)
+
+    Troca o hash e ajusta só as postings das palavras que entraram ou saíram,
+    mantendo views, ratings, createdAt e os campos que o pipeline não grava
+    (ex.: blobUrl de um upload pelo admin) do documento anterior.
+    """
+    doc_id = document['id']
+    for _ in range(SWAP_RETRIES):
+        with client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(CURRENT_KEY)
+                prefix = live_prefix(pipe)
+                key = prefix + f'doc:{doc_id}'
+                pipe.watch(key)
+                old = pipe.hgetall(key)
+                old_words = search_words(old) if old else set()
+                new_words = search_words(document)
+                kept = _kept_fields(old, document)
+
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping={**document, **kept})
+                pipe.sadd(prefix + ALL_DOCS_KEY, doc_id)
+                for word in old_words - new_words:
+                    pipe.srem(prefix + f'search:{word}', doc_id)
+                for word in new_words - old_words:
+                    pipe.sadd(prefix + f'search:{word}', doc_id)
+                if prefix and not old:
+                    pipe.hincrby(prefix + STATS_KEY, 'documents', 1)
+                pipe.execute()
+                return len(new_words)
+            except redis.WatchError:
+                continue
+    raise RuntimeError('Índice alterado durante a atualização; tente novamente')
+
+def remove_document(client, doc_id):
+    """Remove um documento e as postings dele da geração no ar"""
+    for _ in range(SWAP_RETRIES):
+        with client.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(CURRENT_KEY)
+                prefix = live_prefix(pipe)
+                key = prefix + f'doc:{doc_id}'
+                pipe.watch(key)
+                old = pipe.hgetall(key)
+                if not old:
+                    pipe.unwatch()
+                    return False
+
+                pipe.multi()
+                pipe.delete(key)
+                pipe.srem(prefix + ALL_DOCS_KEY, doc_id)
+                for word in search_words(old):
+                    pipe.srem(prefix + f'search:{word}', doc_id)
+                if prefix:
+                    pipe.hincrby(prefix + STATS_KEY, 'documents', -1)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                continue
+    raise RuntimeError('Índice alterado durante a remoção; tente novamente')
+
+def verify_load(client, documents):
+    """Confere a geração no ar contra os documentos carregados
+
+    Devolve a lista de problemas (vazia quando tudo confere).
+    """
+    problems = []
+    prefix = live_prefix(client)
+    if not prefix:
+        return ['index:current não definido']
+
+    expected_ids = {doc['id'] for doc in documents}
+    live_ids = set(client.smembers(prefix + ALL_DOCS_KEY))
+    if not expected_ids <= live_ids:
+        problems.append(f"docs:all sem {sorted(expected_ids - live_ids)}")
+
+    postings = {}
+    for document in documents:
+        if client.hget(prefix + f"doc:{document['id']}", 'title') != document['title']:
+            problems.append(f"doc:{document['id']} ausente ou divergente")
+        for word in search_words(document):
+            postings.setdefault(word, set()).add(document['id'])
+
+    pipe = client.pipeline(transaction=False)
+    words = sorted(postings)
+    for word in words:
+        pipe.smembers(prefix + f'search:{word}')
+    for word, members in zip(words, pipe.execute()):
+        if not postings[word] <= set(members):
+            problems.append(f"search:{word} incompleto")
+
+    generations = {key.split(':')[1] for key in client.scan_iter(match='idx:*:stats')}
+    if len(generations) > 2:
+        problems.append(f"{len(generations)} gerações no Redis (esperado no máximo 2)")
+    return problems
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Carrega os documentos extraídos no Redis')
+    parser.add_argument('--url', help='URL do Redis (padrão: KV_REST_API_URL ou REDIS_URL)')
+    parser.add_argument('--substituir', action='store_true',
+                        help='Remove do índice os documentos que não estão no corpus')
+    parser.add_argument('--lote', type=int, default=BATCH_SIZE,
+                        help='Comandos por transação MULTI/EXEC')
+    parser.add_argument('--carencia', type=float, default=GC_GRACE_SECONDS,
+                        help='Segundos antes de apagar a geração antiga')
+    parser.add_argument('--verificar', action='store_true',
+                        help='Relê o índice no ar e confere com os documentos')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    client = connect(args.url)
+    documents = [document_from_docx(doc['path']) for doc in from_args(args)]
+
+    summary = load_documents(client, documents, replace=args.substituir, batch_size=args.lote,
+                             grace=args.carencia)
+
+    print("=" * 70)
+    print("CARGA NO REDIS")
+    print("=" * 70)
+    print(f"🏷️  Geração no ar: {summary['version']}")
+    print(f"📄 Documentos: {summary['documents']}")
+    print(f"🔑 Chaves gravadas: {summary['keys']}")
+    print(f"⏱️  Tempo: {summary['seconds']:.2f}s")
+
+    if args.verificar:
+        problems = verify_load(client, documents)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            print("=" * 70)
+            raise SystemExit(1)
+        print("✅ Índice no ar confere com os documentos")
+
+    previous = summary['previous'] or 'layout antigo'
+    print(f"🧹 Apagando a geração anterior ({previous}) em {args.carencia:.0f}s...")
+    summary['collector'].join()
+    print("=" * 70)
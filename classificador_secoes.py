@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Classificador de Seções - Concierge RH Digital INPI
+Marca cada parágrafo em uma única passada: os marcadores de cabeçalho
+("O QUE É?", "PRAZOS", "CONTATO"...) e os indícios usados como alternativa
+quando a seção não existe (leis e portarias, e-mails, telefones) ficam em uma
+só expressão regular, montada como trie e aplicada uma vez ao texto em
+minúsculas. Substitui a cadeia de if/elif com .upper() e testes de substring
+de organize_content_by_sections.
+"""
+
+from corpus_docs import add_arguments, from_args
+import argparse
+import re
+import sys
+import time
+
+# Cabeçalhos na ordem de prioridade (quando um parágrafo cita vários) e o
+# tamanho máximo do parágrafo para ser tratado como cabeçalho. O limite vale
+# para todos os marcadores da seção: a cadeia antiga só aplicava ao segundo
+# ("'DOCUMENTAÇÃO' in t or 'DOCUMENTOS' in t and len(t) < 80") e parágrafos
+# longos que citavam documentação viravam cabeçalho.
+HEADER_MARKERS = (
+    ('o_que_e', ('o que é',), 50),
+    ('quem_tem_direito', ('quem tem direito',), 50),
+    ('como_solicitar', ('como solicitar',), 50),
+    ('prazos', ('prazo',), 50),
+    ('documentacao', ('documentação', 'documentos'), 80),
+    ('legislacao', ('legislação', 'base legal'), 50),
+    ('duvidas', ('dúvidas', 'perguntas'), 80),
+    ('contato', ('contato',), 50),
+)
+
+# Indícios para preencher seções ausentes (create_formatted_document)
+HINT_MARKERS = (
+    ('o_que_e', ('o que é',)),
+    ('legislacao', ('lei', 'portaria', 'decreto', 'instrução normativa', 'resolução')),
+    ('contato', ('@', 'ramal', 'telefone')),
+)
+
+# O parágrafo que explica "o que é" precisa ter mais que isto
+MIN_DEFINITION_LENGTH = 50
+
+def _trie_pattern(words):
+    """Alternância em forma de trie: prefixos comuns são testados uma vez só"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def pattern(node):
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return pattern(trie)
+
+def _build():
+    markers = {}
+    for key, literals, _ in HEADER_MARKERS:
+        for literal in literals:
+            markers.setdefault(literal, [set(), set()])[0].add(key)
+    for key, literals in HINT_MARKERS:
+        for literal in literals:
+            markers.setdefault(literal, [set(), set()])[1].add(key)
+
+    # Cada literal vale pelos marcadores que contém (inclusive prefixos,
+    # já que a trie casa o mais longo a partir de cada posição)
+    tags = {}
+    for candidate in markers:
+        headers, hints = set(), set()
+        for marker, (marker_headers, marker_hints) in markers.items():
+            if marker in candidate:
+                headers |= marker_headers
+                hints |= marker_hints
+        tags[candidate] = (frozenset(headers), frozenset(hints))
+
+    # Lookahead de largura zero: o findall tenta cada posição do texto e
+    # encontra marcadores sobrepostos ("legislação que é" contém "o que é"),
+    # inclusive cadeias de várias sobreposições
+    return re.compile(f'(?=({_trie_pattern(markers)}))'), tags
+
+_MARKERS, _TAGS = _build()
+
+def classify(text):
+    """Classifica um parágrafo: (seção do cabeçalho ou None, indícios)
+
+    Os indícios são as chaves de HINT_MARKERS presentes no texto.
+    """
+    headers = set()
+    hints = set()
+    for literal in set(_MARKERS.findall(text.lower())):
+        literal_headers, literal_hints = _TAGS[literal]
+        headers |= literal_headers
+        hints |= literal_hints
+
+    if 'o_que_e' in hints and len(text) <= MIN_DEFINITION_LENGTH:
+        hints.discard('o_que_e')
+
+    header = None
+    if headers:
+        for key, _, max_length in HEADER_MARKERS:
+            if key in headers and len(text) < max_length:
+                header = key
+                break
+    return header, hints
+
+def _legacy_header(text):
+    """Cadeia de if/elif antiga (referência para os testes e o --benchmark)"""
+    text_upper = text.upper()
+    if 'O QUE É' in text_upper and len(text) < 50:
+        return 'o_que_e'
+    elif 'QUEM TEM DIREITO' in text_upper and len(text) < 50:
+        return 'quem_tem_direito'
+    elif 'COMO SOLICITAR' in text_upper and len(text) < 50:
+        return 'como_solicitar'
+    elif 'PRAZO' in text_upper and len(text) < 50:
+        return 'prazos'
+    elif 'DOCUMENTAÇÃO' in text_upper or 'DOCUMENTOS' in text_upper and len(text) < 80:
+        return 'documentacao'
+    elif 'LEGISLAÇÃO' in text_upper or 'BASE LEGAL' in text_upper and len(text) < 50:
+        return 'legislacao'
+    elif 'DÚVIDAS' in text_upper or 'PERGUNTAS' in text_upper and len(text) < 80:
+        return 'duvidas'
+    elif 'CONTATO' in text_upper and len(text) < 50:
+        return 'contato'
+    return None
+
+def _legacy_hints(text):
+    """Testes antigos de create_formatted_document (uma passada por lista)"""
+    hints = set()
+    if 'o que é' in text.lower() and len(text) > 50:
+        hints.add('o_que_e')
+    if any(termo in text.lower() for termo in ['lei', 'portaria', 'decreto', 'instrução normativa', 'resolução']):
+        hints.add('legislacao')
+    if '@' in text or 'ramal' in text.lower() or 'telefone' in text.lower():
+        hints.add('contato')
+    return hints
+
+def benchmark(texts, repeat=20):
+    """Parágrafos/s da classificação nova e da cadeia antiga (cabeçalho + indícios)"""
+    def run(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        return len(texts) * repeat / elapsed if elapsed else 0.0
+
+    return {
+        'classificador': run(classify),
+        'cadeia_antiga': run(lambda text: (_legacy_header(text), _legacy_hints(text)))
+    }
+
+def corpus_texts(documents):
+    """Textos dos parágrafos do corpo de todos os documentos"""
+    from leitura_rapida import iter_content
+
+    return [item['text'] for doc in documents for item in iter_content(doc['path'])]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Classifica os parágrafos do corpus em seções')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Mede a vazão (parágrafos/s) contra a cadeia antiga')
+    parser.add_argument('--repeticoes', type=int, default=20,
+                        help='Passadas pelo corpus no benchmark')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    texts = corpus_texts(from_args(args))
+
+    if args.benchmark:
+        rates = benchmark(texts, args.repeticoes)
+        print(f"⚡ Classificador: {rates['classificador']:,.0f} parágrafos/s | "
+              f"cadeia antiga: {rates['cadeia_antiga']:,.0f} parágrafos/s | "
+              f"ganho: {rates['classificador'] / rates['cadeia_antiga']:.2f}x")
+        sys.exit(0)
+
+    counts = {}
+    for text in texts:
+        header, hints = classify(text)
+        for tag in ([f'cabecalho:{header}'] if header else []) + [f'indicio:{h}' for h in sorted(hints)]:
+            counts[tag] = counts.get(tag, 0) + 1
+    print(f"📄 {len(texts)} parágrafos")
+    for tag, count in sorted(counts.items()):
+        print(f"   {tag:<32} {count}")
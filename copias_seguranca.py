@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cópias de Segurança - Concierge RH Digital INPI
+Repositório de versões endereçado por conteúdo, no lugar dos arquivos
+backup_<nome>.docx: cada versão é gravada uma única vez em
+<pasta>/.copias/objetos/<sha256>.docx (bytes idênticos ao original, sem
+reabrir o documento no python-docx), com reflink quando o sistema de arquivos
+permite. O histórico de cada documento fica em
+<pasta>/.copias/historico/<nome>.json e a limpeza mantém as últimas versões
+e a primeira (o original de verdade).
+"""
+
+from manifesto import atomic_path, atomic_write
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STORE_NAME = '.copias'
+HISTORY_VERSION = 1
+
+# Retenção padrão: últimas versões por documento (a primeira é sempre mantida)
+KEEP_LAST = 5
+
+# ioctl FICLONE do Linux (btrfs, xfs, bcachefs...): cópia sob demanda
+_FICLONE = 0x40049409
+
+# Rótulo das cópias feitas antes da reformatação
+LABEL_REFORMAT = 'reformatacao'
+LABEL_LEGACY = 'legado'
+
+def store_path(docs_dir):
+    """Pasta do repositório de cópias de uma pasta de documentos"""
+    return os.path.join(docs_dir, STORE_NAME)
+
+def _object_path(store, sha256):
+    return os.path.join(store, 'objetos', sha256[:2], sha256 + '.docx')
+
+def _history_path(store, doc_name):
+    return os.path.join(store, 'historico', doc_name + '.json')
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def _clone(source, dest):
+    """Copia os bytes de source: reflink quando possível, senão cópia pelo kernel
+
+    Hardlink para o documento não serve: o python-docx regrava o .docx no
+    mesmo inode e a cópia mudaria junto.
+    """
+    if fcntl is not None and sys.platform.startswith('linux'):
+        try:
+            with open(source, 'rb') as src, open(dest, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return 'reflink'
+        except OSError:
+            pass
+    shutil.copyfile(source, dest)
+    return 'copia'
+
+def _store_object(store, source, sha256, link=False):
+    """Grava o objeto se ainda não existe; devolve o método usado (ou 'existente')"""
+    object_path = _object_path(store, sha256)
+    if os.path.exists(object_path):
+        return 'existente'
+
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    # Hardlink: as permissões são as do inode do documento, não se mexe nelas
+    with atomic_path(object_path, prefix='.obj-', chmod=not link) as tmp_path:
+        if link:
+            os.remove(tmp_path)
+            os.link(source, tmp_path)
+            method = 'hardlink'
+        else:
+            method = _clone(source, tmp_path)
+    return method
+
+def load_history(store, doc_name):
+    """Versões gravadas de um documento, da mais antiga para a mais recente"""
+    path = _history_path(store, doc_name)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == HISTORY_VERSION:
+                return data['snapshots']
+        except (OSError, ValueError):
+            pass
+    return []
+
+def _save_history(store, doc_name, snapshots):
+    """Grava o histórico de forma atômica (arquivo temporário + rename)"""
+    path = _history_path(store, doc_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_write(path, prefix='.historico-') as f:
+        json.dump({'version': HISTORY_VERSION, 'snapshots': snapshots}, f, ensure_ascii=False)
+
+def snapshot(doc_path, label=LABEL_REFORMAT, source_path=None):
+    """Guarda a versão atual do documento; devolve o registro da versão
+
+    Versões iguais à última gravada não geram registro novo, e conteúdos
+    idênticos (mesmo em documentos diferentes) compartilham o mesmo objeto.
+    source_path permite importar os bytes de outro arquivo (ex.: um backup_
+    antigo), que então é ligado por hardlink em vez de copiado.
+    """
+    docs_dir, doc_name = os.path.split(os.path.abspath(doc_path))
+    store = store_path(docs_dir)
+    source = source_path or doc_path
+
+    # O arquivo pode mudar entre o hash e a cópia: repete até ficar estável
+    for _ in range(3):
+        before = _stat_key(source)
+        sha256 = _sha256(source)
+        method = _store_object(store, source, sha256, link=source_path is not None)
+        if _stat_key(source) == before:
+            break
+    else:
+        raise RuntimeError(f'{source} mudou durante a cópia de segurança')
+
+    snapshots = load_history(store, doc_name)
+    if snapshots and snapshots[-1]['sha256'] == sha256:
+        return dict(snapshots[-1], method='existente', path=_object_path(store, sha256))
+
+    entry = {
+        'sha256': sha256,
+        'size': before[0],
+        'created_at': time.time(),
+        'label': label
+    }
+    snapshots.append(entry)
+    _save_history(store, doc_name, snapshots)
+    return dict(entry, method=method, path=_object_path(store, sha256))
+
+def latest_snapshot(doc_path, labels=(LABEL_REFORMAT, LABEL_LEGACY)):
+    """Caminho da versão mais recente com um dos rótulos (ou None)
+
+    É o original antes da última reformatação: o que restaurar_links compara
+    com o documento reformatado.
+    """
+    docs_dir, doc_name = os.path.split(os.path.abspath(doc_path))
+    store = store_path(docs_dir)
+    for entry in reversed(load_history(store, doc_name)):
+        if entry['label'] in labels:
+            path = _object_path(store, entry['sha256'])
+            if os.path.exists(path):
+                return path
+    return None
+
+def restore_snapshot(doc_path, sha256=None):
+    """Volta o documento para uma versão gravada (padrão: a mais recente)
+
+    A versão atual é guardada antes, então a restauração pode ser desfeita.
+    """
+    docs_dir, doc_name = os.path.split(os.path.abspath(doc_path))
+    store = store_path(docs_dir)
+    snapshots = load_history(store, doc_name)
+    matches = [entry for entry in snapshots if sha256 is None or entry['sha256'].startswith(sha256)]
+    if not matches:
+        raise KeyError(f'Nenhuma versão {sha256 or ""} de {doc_name}')
+
+    target = matches[-1]
+    if os.path.exists(doc_path):
+        snapshot(doc_path, label='antes_restauracao')
+    # O documento restaurado mantém as permissões do atual (não as 0600 do temporário)
+    with atomic_path(doc_path, prefix='.restaurar-') as tmp_path:
+        _clone(_object_path(store, target['sha256']), tmp_path)
+    return target
+
+def import_legacy(docs_dir, doc_names=None):
+    """Leva os backup_<nome>.docx e <nome>_BACKUP_ORIGINAL.docx para o repositório
+
+    Os arquivos antigos ficam onde estão (o objeto é um hardlink para eles)
+    e podem ser apagados depois. Devolve a quantidade importada.
+    """
+    imported = 0
+    for name in sorted(os.listdir(docs_dir)):
+        if name.startswith('backup_') and name.endswith('.docx'):
+            doc_name = name[len('backup_'):]
+        elif name.endswith('_BACKUP_ORIGINAL.docx'):
+            doc_name = name[:-len('_BACKUP_ORIGINAL.docx')] + '.docx'
+        else:
+            continue
+        if doc_names is not None and doc_name not in doc_names:
+            continue
+        entry = snapshot(os.path.join(docs_dir, doc_name), LABEL_LEGACY,
+                         source_path=os.path.join(docs_dir, name))
+        if entry['method'] != 'existente':
+            imported += 1
+    return imported
+
+def prune(docs_dir, keep_last=KEEP_LAST, keep_days=None):
+    """Aplica a retenção e apaga os objetos que ficaram sem referência
+
+    Mantém por documento a primeira versão, as `keep_last` mais recentes e,
+    com keep_days, todas as versões mais novas que isso. Devolve
+    {'versions', 'objects', 'bytes'} removidos.
+    """
+    store = store_path(docs_dir)
+    history_dir = os.path.join(store, 'historico')
+    removed = {'versions': 0, 'objects': 0, 'bytes': 0}
+    if not os.path.isdir(history_dir):
+        return removed
+
+    cutoff = time.time() - keep_days * 86400 if keep_days is not None else None
+    referenced = set()
+    for history_name in sorted(os.listdir(history_dir)):
+        if not history_name.endswith('.json'):
+            continue
+        doc_name = history_name[:-len('.json')]
+        snapshots = load_history(store, doc_name)
+        kept = [
+            entry for position, entry in enumerate(snapshots)
+            if position == 0 or position >= len(snapshots) - keep_last
+            or (cutoff is not None and entry['created_at'] >= cutoff)
+        ]
+        if len(kept) != len(snapshots):
+            removed['versions'] += len(snapshots) - len(kept)
+            _save_history(store, doc_name, kept)
+        referenced.update(entry['sha256'] for entry in kept)
+
+    objects_dir = os.path.join(store, 'objetos')
+    for directory, _, names in os.walk(objects_dir):
+        for name in names:
+            if name.endswith('.docx') and name[:-len('.docx')] not in referenced:
+                path = os.path.join(directory, name)
+                removed['bytes'] += os.path.getsize(path)
+                removed['objects'] += 1
+                os.remove(path)
+    return removed
+
+def verify_store(docs_dir):
+    """Confere o hash de cada objeto referenciado; devolve a lista de problemas"""
+    store = store_path(docs_dir)
+    history_dir = os.path.join(store, 'historico')
+    problems = []
+    if not os.path.isdir(history_dir):
+        return problems
+    checked = set()
+    for history_name in sorted(os.listdir(history_dir)):
+        doc_name = history_name[:-len('.json')]
+        for entry in load_history(store, doc_name):
+            sha256 = entry['sha256']
+            if sha256 in checked:
+                continue
+            checked.add(sha256)
+            path = _object_path(store, sha256)
+            if not os.path.exists(path):
+                problems.append(f"{doc_name}: objeto {sha256[:12]} ausente")
+            elif _sha256(path) != sha256:
+                problems.append(f"{doc_name}: objeto {sha256[:12]} corrompido")
+    return problems
+
+if __name__ == '__main__':
+    from corpus_docs import add_arguments, from_args, iter_by_dir
+
+    parser = argparse.ArgumentParser(description='Cópias de segurança dos documentos (por conteúdo)')
+    parser.add_argument('--importar-legados', action='store_true',
+                        help='Importa os arquivos backup_*.docx e *_BACKUP_ORIGINAL.docx')
+    parser.add_argument('--limpar', action='store_true', help='Aplica a retenção')
+    parser.add_argument('--manter', type=int, default=KEEP_LAST,
+                        help='Versões mais recentes mantidas por documento')
+    parser.add_argument('--dias', type=float, help='Mantém também as versões mais novas que isto')
+    parser.add_argument('--restaurar', metavar='SHA', nargs='?', const='',
+                        help='Volta os documentos para a versão indicada (padrão: a mais recente)')
+    parser.add_argument('--verificar', action='store_true', help='Confere o hash dos objetos')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    failed = False
+    for docs_dir, names in iter_by_dir(from_args(args)):
+        print(f"📁 {docs_dir}")
+        if args.importar_legados:
+            print(f"   📥 Versões importadas: {import_legacy(docs_dir, set(names))}")
+        if args.restaurar is not None:
+            for doc_name in names:
+                try:
+                    entry = restore_snapshot(os.path.join(docs_dir, doc_name), args.restaurar or None)
+                    print(f"   ↩️  {doc_name}: versão {entry['sha256'][:12]}")
+                except KeyError as e:
+                    print(f"   ⚠️ {e.args[0]}")
+        if args.limpar:
+            removed = prune(docs_dir, args.manter, args.dias)
+            print(f"   🧹 Versões removidas: {removed['versions']} | objetos: {removed['objects']} "
+                  f"({removed['bytes'] / (1024 * 1024):.1f} MB)")
+        if args.verificar:
+            problems = verify_store(docs_dir)
+            for problem in problems:
+                print(f"   ❌ {problem}")
+            failed = failed or bool(problems)
+
+        store = store_path(docs_dir)
+        for doc_name in names:
+            snapshots = load_history(store, doc_name)
+            if not snapshots:
+                continue
+            print(f"   📄 {doc_name}")
+            for entry in snapshots:
+                created = datetime.fromtimestamp(entry['created_at']).strftime('%Y-%m-%d %H:%M')
+                print(f"      {entry['sha256'][:12]}  {created}  {entry['size'] / 1024:>8.1f} KB  {entry['label']}")
+
+    if failed:
+        sys.exit(1)
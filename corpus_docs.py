@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Corpus de Documentos - Concierge RH Digital INPI
+Descobre os .docx a processar em vez de listas fixas de nomes: percorre uma
+ou mais pastas (aceita padrões glob, inclusive **) com os.scandir, aplica
+padrões de inclusão/exclusão e devolve os documentos sob demanda, uma pasta
+por vez, sem montar a lista completa de caminhos em memória.
+
+A pasta padrão é docs/ do repositório; CONCIERGE_DOCS (pastas separadas por
+os.pathsep) substitui o padrão sem precisar de argumentos.
+"""
+
+from fnmatch import fnmatch
+from itertools import groupby
+import argparse
+import glob
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+
+ENV_VAR = 'CONCIERGE_DOCS'
+
+DEFAULT_INCLUDE = ('*.docx',)
+# Backups do reformatar_docs.py e arquivos de bloqueio do Word
+DEFAULT_EXCLUDE = ('backup_*', '~$*', '.*')
+
+def default_roots():
+    """Pastas do corpus: CONCIERGE_DOCS ou docs/ do repositório"""
+    value = os.environ.get(ENV_VAR)
+    if value:
+        return [root for root in value.split(os.pathsep) if root]
+    return [DOCS_DIR]
+
+def matches(relpath, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE):
+    """Se o arquivo entra no corpus
+
+    Padrões sem '/' valem para o nome do arquivo; padrões com '/' valem para
+    o caminho relativo à pasta raiz (ex.: 'arquivo/*').
+    """
+    relpath = relpath.replace(os.sep, '/')
+    name = relpath.rsplit('/', 1)[-1]
+
+    def hit(pattern):
+        return fnmatch(relpath if '/' in pattern else name, pattern)
+
+    return any(hit(p) for p in include) and not any(hit(p) for p in exclude)
+
+def _expand_roots(roots):
+    """Pastas raiz, expandindo padrões glob sob demanda"""
+    for root in roots:
+        if glob.has_magic(root):
+            for path in sorted(glob.iglob(root, recursive=True)):
+                if os.path.isdir(path):
+                    yield path
+        else:
+            yield root
+
+def iter_documents(roots=None, include=DEFAULT_INCLUDE, exclude=DEFAULT_EXCLUDE,
+                   recursive=False):
+    """Documentos do corpus, um a um: {'name', 'dir', 'path', 'root'}
+
+    Cada pasta é lida com os.scandir e ordenada por nome (a saída é
+    determinística); só a listagem da pasta atual fica em memória.
+    Subpastas que casam com um padrão de exclusão não são percorridas.
+    """
+    seen = set()
+    for root in _expand_roots(roots or default_roots()):
+        root = os.path.abspath(root)
+        if root in seen or not os.path.isdir(root):
+            continue
+        seen.add(root)
+
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    listing = sorted(entries, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in listing:
+                relpath = os.path.relpath(entry.path, root)
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not any(fnmatch(entry.name, p) for p in exclude):
+                        subdirs.append(entry.path)
+                elif entry.is_file() and matches(relpath, include, exclude):
+                    yield {'name': entry.name, 'dir': directory, 'path': entry.path, 'root': root}
+            # Pilha: inverte para visitar as subpastas em ordem alfabética
+            pending.extend(reversed(subdirs))
+
+def iter_by_dir(documents):
+    """Agrupa o fluxo de iter_documents em (pasta, [nomes]), uma pasta por vez"""
+    for directory, group in groupby(documents, key=lambda doc: doc['dir']):
+        yield directory, [doc['name'] for doc in group]
+
+def add_arguments(parser):
+    """Argumentos comuns de seleção do corpus (--pasta, --incluir, --excluir, --recursivo)"""
+    group = parser.add_argument_group('corpus')
+    group.add_argument('--pasta', nargs='+', metavar='PASTA',
+                       help=f'Pastas ou padrões glob do corpus (padrão: ${ENV_VAR} ou docs/)')
+    group.add_argument('--incluir', nargs='+', metavar='PADRAO', default=list(DEFAULT_INCLUDE),
+                       help='Padrões de arquivos incluídos (padrão: *.docx)')
+    group.add_argument('--excluir', nargs='+', metavar='PADRAO', default=[],
+                       help='Padrões excluídos, além de backups e temporários do Word')
+    group.add_argument('--recursivo', action='store_true', help='Inclui subpastas')
+    return parser
+
+def from_args(args):
+    """Fluxo de documentos conforme os argumentos de add_arguments"""
+    return iter_documents(args.pasta, include=tuple(args.incluir),
+                          exclude=DEFAULT_EXCLUDE + tuple(args.excluir),
+                          recursive=args.recursivo)
+
+def manifest_dir(args=None):
+    """Pasta onde fica o manifesto incremental (a primeira raiz do corpus)"""
+    roots = (args.pasta if args is not None and args.pasta else None) or default_roots()
+    return next(_expand_roots(roots), roots[0])
+
+if __name__ == '__main__':
+    parser = add_arguments(argparse.ArgumentParser(description='Lista os documentos do corpus'))
+    args = parser.parse_args()
+
+    total = 0
+    for doc in from_args(args):
+        total += 1
+        print(os.path.relpath(doc['path'], doc['root']))
+    print(f"📚 {total} documentos")
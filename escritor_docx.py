@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Escritor de Documentos - Concierge RH Digital INPI
+Gera os .docx reformatados sem criar um Document() novo a cada arquivo: o
+modelo com os estilos do Concierge (Heading 1 e Heading 2) é montado uma vez
+por processo e guardado como as partes do ZIP já serializadas. Cada saída só
+monta o word/document.xml (e os relacionamentos dos hyperlinks) com lxml e
+reaproveita as demais partes. Os ids de estilo e as propriedades dos runs de
+hyperlink também ficam prontos em cache.
+"""
+
+from manifesto import atomic_write
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Pt, RGBColor
+from lxml import etree
+from copy import deepcopy
+from functools import lru_cache
+from io import BytesIO
+import re
+import zipfile
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PR_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+W = '{%s}' % W_NS
+
+HYPERLINK_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+_SECT_PR = W + 'sectPr'
+
+# Mesma cor e sublinhado de reformatar_docs.add_hyperlink
+HYPERLINK_COLOR = '0563C1'
+
+# Quebras que o python-docx converte em w:tab / w:br dentro do run
+_BREAKS = re.compile(r'([\t\r\n])')
+
+def style_template(doc):
+    """Aplica os estilos do Concierge (Heading 1 e Heading 2) a um Document"""
+    styles = doc.styles
+
+    try:
+        h1_style = styles['Heading 1']
+    except KeyError:
+        h1_style = styles.add_style('Heading 1', WD_STYLE_TYPE.PARAGRAPH)
+    h1_style.font.size = Pt(18)
+    h1_style.font.bold = True
+    h1_style.font.color.rgb = RGBColor(0, 70, 127)
+
+    try:
+        h2_style = styles['Heading 2']
+    except KeyError:
+        h2_style = styles.add_style('Heading 2', WD_STYLE_TYPE.PARAGRAPH)
+    h2_style.font.size = Pt(14)
+    h2_style.font.bold = True
+    h2_style.font.color.rgb = RGBColor(0, 112, 192)
+    return doc
+
+@lru_cache(maxsize=1)
+def _template():
+    """Modelo estilizado, preparado uma vez por processo
+
+    Guarda as partes do ZIP já serializadas, o document.xml e os
+    relacionamentos dele (copiados a cada saída) e o mapa nome -> id dos
+    estilos de parágrafo (None para o estilo padrão, como no python-docx).
+    """
+    doc = style_template(Document())
+    buffer = BytesIO()
+    doc.save(buffer)
+
+    document_name = str(doc.part.partname).lstrip('/')
+    directory, name = document_name.rsplit('/', 1)
+    rels_name = f'{directory}/_rels/{name}.rels'
+
+    default_style = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+    style_ids = {
+        style.name: (None if default_style is not None and style.style_id == default_style.style_id
+                     else style.style_id)
+        for style in doc.styles if style.type == WD_STYLE_TYPE.PARAGRAPH
+    }
+
+    with zipfile.ZipFile(buffer) as zf:
+        parts = [(info, zf.read(info)) for info in zf.infolist()]
+    contents = {info.filename: data for info, data in parts}
+
+    return {
+        'parts': parts,
+        'document_name': document_name,
+        'rels_name': rels_name,
+        'document': contents[document_name],
+        'rels': contents[rels_name],
+        'style_ids': style_ids
+    }
+
+@lru_cache(maxsize=1)
+def _hyperlink_rpr():
+    """w:rPr dos runs de hyperlink (copiado a cada link)"""
+    rpr = etree.Element(W + 'rPr', nsmap={'w': W_NS})
+    etree.SubElement(rpr, W + 'color').set(W + 'val', HYPERLINK_COLOR)
+    etree.SubElement(rpr, W + 'u').set(W + 'val', 'single')
+    return rpr
+
+def new_document():
+    """Documento vazio clonado do modelo: {'root', 'body', 'end', 'rels', 'rel_ids', 'links'}"""
+    template = _template()
+    root = etree.fromstring(template['document'])
+    body = root.find(W + 'body')
+    rels = etree.fromstring(template['rels'])
+    return {
+        'root': root,
+        'body': body,
+        # Parágrafos entram antes do w:sectPr final
+        'end': body.find(_SECT_PR),
+        'rels': rels,
+        'rel_ids': {rel.get('Id') for rel in rels},
+        # URL -> rId: links repetidos reaproveitam o relacionamento
+        'links': {}
+    }
+
+def style_id(name):
+    """Id do estilo de parágrafo pelo nome (None para o estilo padrão)"""
+    style_ids = _template()['style_ids']
+    if name not in style_ids:
+        raise KeyError(f"no style with name '{name}'")
+    return style_ids[name]
+
+def _append_text(r, text):
+    """Texto do run com tabs e quebras de linha (mesma regra do python-docx)"""
+    for piece in _BREAKS.split(text):
+        if not piece:
+            continue
+        if piece == '\t':
+            etree.SubElement(r, W + 'tab')
+        elif piece in ('\r', '\n'):
+            etree.SubElement(r, W + 'br')
+        else:
+            t = etree.SubElement(r, W + 't')
+            t.text = piece
+            if len(piece.strip()) < len(piece):
+                t.set(_XML_SPACE, 'preserve')
+
+def add_paragraph(doc, text='', style=None, alignment=None, space_after=None):
+    """Acrescenta um parágrafo no fim do corpo e devolve o w:p
+
+    alignment é o valor de w:jc ('center', ...) e space_after vem em pontos.
+    """
+    p = etree.Element(W + 'p')
+    pstyle = style_id(style) if style is not None else None
+    if pstyle or space_after is not None or alignment:
+        ppr = etree.SubElement(p, W + 'pPr')
+        if pstyle:
+            etree.SubElement(ppr, W + 'pStyle').set(W + 'val', pstyle)
+        if space_after is not None:
+            etree.SubElement(ppr, W + 'spacing').set(W + 'after', str(int(space_after * 20)))
+        if alignment:
+            etree.SubElement(ppr, W + 'jc').set(W + 'val', alignment)
+    if text:
+        add_run(p, text)
+
+    if doc['end'] is not None:
+        doc['end'].addprevious(p)
+    else:
+        doc['body'].append(p)
+    return p
+
+def add_heading(doc, text, level=1, alignment=None):
+    """Título com o estilo 'Heading N' (ou 'Title' no nível 0)"""
+    return add_paragraph(doc, text, 'Title' if level == 0 else f'Heading {level}', alignment)
+
+def add_run(p, text, bold=None):
+    """Acrescenta um run ao parágrafo; bold False grava w:b w:val="0" """
+    r = etree.SubElement(p, W + 'r')
+    if bold is not None:
+        b = etree.SubElement(etree.SubElement(r, W + 'rPr'), W + 'b')
+        if not bold:
+            b.set(W + 'val', '0')
+    _append_text(r, text)
+    return r
+
+def _next_rel_id(doc):
+    """Menor rIdN livre (mesma regra do python-docx)"""
+    n = 1
+    while f'rId{n}' in doc['rel_ids']:
+        n += 1
+    return f'rId{n}'
+
+def add_hyperlink(doc, p, text, url):
+    """Acrescenta um hyperlink externo (azul, sublinhado) ao parágrafo"""
+    r_id = doc['links'].get(url)
+    if r_id is None:
+        r_id = doc['links'][url] = _next_rel_id(doc)
+        doc['rel_ids'].add(r_id)
+        rel = etree.SubElement(doc['rels'], '{%s}Relationship' % PR_NS)
+        rel.set('Id', r_id)
+        rel.set('Type', HYPERLINK_TYPE)
+        rel.set('Target', url)
+        rel.set('TargetMode', 'External')
+
+    hyperlink = etree.SubElement(p, W + 'hyperlink')
+    hyperlink.set('{%s}id' % R_NS, r_id)
+    r = etree.SubElement(hyperlink, W + 'r')
+    r.append(deepcopy(_hyperlink_rpr()))
+    _append_text(r, text)
+    return hyperlink
+
+def save(doc, output_path):
+    """Grava o .docx: document.xml novo e as demais partes do modelo
+
+    A gravação é atômica (arquivo temporário + rename).
+    """
+    template = _template()
+    replaced = {
+        template['document_name']: etree.tostring(doc['root'], encoding='UTF-8', standalone=True),
+        template['rels_name']: etree.tostring(doc['rels'], encoding='UTF-8', standalone=True)
+    }
+
+    with atomic_write(output_path, 'wb', prefix='.escrita-', suffix='.docx') as f:
+        with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for info, data in template['parts']:
+                zf.writestr(info, replaced.get(info.filename, data))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Exportação NDJSON - Concierge RH Digital INPI
+Grava o database.json como NDJSON (um documento por linha, opcionalmente em
+vários shards) com um manifesto pequeno de id -> shard/offset/tamanho, para
+que os consumidores leiam em streaming ou carreguem um único documento.
+O campo 'text' dos itens de lista e o 'content' de parágrafos são removidos
+quando podem ser derivados do 'html'; a leitura os reconstrói.
+"""
+
+from manifesto import atomic_write
+from contextlib import ExitStack
+from html import unescape
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+MANIFEST_VERSION = 1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_PATH = os.path.join(BASE_DIR, 'src', 'database.json')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'src')
+OUTPUT_PREFIX = 'database'
+
+_TAGS = re.compile(r'<[^>]+>')
+
+def html_to_text(html):
+    """Texto visível de um trecho HTML (mesmo resultado do cheerio .text().trim())"""
+    return unescape(_TAGS.sub('', html)).strip()
+
+def compact_document(doc):
+    """Remove do documento os textos que podem ser derivados do HTML"""
+    sections = []
+    for section in doc.get('sections', []):
+        section = dict(section)
+        if section.get('type') == 'list':
+            items = []
+            for item in section.get('items', []):
+                item = dict(item)
+                if 'html' in item and item.get('text') == html_to_text(item['html']):
+                    del item['text']
+                items.append(item)
+            section['items'] = items
+        elif 'html' in section and section.get('content') == html_to_text(section['html']):
+            del section['content']
+        sections.append(section)
+
+    compact = dict(doc)
+    compact['sections'] = sections
+    return compact
+
+def expand_document(doc):
+    """Reconstrói os textos derivados (inverso de compact_document)"""
+    sections = []
+    for section in doc.get('sections', []):
+        section = dict(section)
+        if section.get('type') == 'list':
+            items = []
+            for item in section.get('items', []):
+                if 'text' not in item and 'html' in item:
+                    # Mantém a ordem original das chaves: text, html, links
+                    item = dict([('text', html_to_text(item['html']))] + list(item.items()))
+                items.append(item)
+            section['items'] = items
+        elif 'content' not in section and 'html' in section:
+            rebuilt = {}
+            for key, value in section.items():
+                if key == 'html':
+                    rebuilt['content'] = html_to_text(value)
+                rebuilt[key] = value
+            section = rebuilt
+        sections.append(section)
+
+    expanded = dict(doc)
+    expanded['sections'] = sections
+    return expanded
+
+def shard_name(prefix, shard, shards):
+    if shards == 1:
+        return f'{prefix}.ndjson'
+    return f'{prefix}-{shard:03d}.ndjson'
+
+def manifest_path(output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX):
+    return os.path.join(output_dir, f'{prefix}.manifest.json')
+
+def export_ndjson(documents, output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX, shards=1):
+    """Grava os documentos em NDJSON e devolve o manifesto
+
+    `documents` pode ser qualquer iterável (inclusive um gerador), então a
+    exportação não precisa do corpus inteiro em memória.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = [shard_name(prefix, shard, shards) for shard in range(shards)]
+    entries = []
+
+    # Os shards só substituem os anteriores quando todos foram gravados
+    with ExitStack() as stack:
+        files = [stack.enter_context(atomic_write(os.path.join(output_dir, name), 'wb'))
+                 for name in names]
+        for position, doc in enumerate(documents):
+            shard = position % shards
+            line = json.dumps(compact_document(doc), ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8') + b'\n'
+            offset = files[shard].tell()
+            files[shard].write(line)
+            entries.append({
+                'id': doc['id'],
+                'title': doc.get('title', ''),
+                'shard': shard,
+                'offset': offset,
+                'length': len(line)
+            })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'format': 'ndjson',
+        'derived': {'list.items.text': 'html', 'section.content': 'html'},
+        'shards': names,
+        'documents': entries
+    }
+    with atomic_write(manifest_path(output_dir, prefix)) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+def load_manifest(output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX):
+    with open(manifest_path(output_dir, prefix), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def iter_documents(output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX, manifest=None):
+    """Lê os documentos um a um, na ordem original, sem carregar tudo"""
+    if manifest is None:
+        manifest = load_manifest(output_dir, prefix)
+    for entry in manifest['documents']:
+        yield read_document(entry, output_dir, prefix, manifest)
+
+def read_document(entry, output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX, manifest=None):
+    """Carrega um único documento pelo offset gravado no manifesto"""
+    if manifest is None:
+        manifest = load_manifest(output_dir, prefix)
+    path = os.path.join(output_dir, manifest['shards'][entry['shard']])
+    with open(path, 'rb') as f:
+        f.seek(entry['offset'])
+        line = f.read(entry['length'])
+    return expand_document(json.loads(line))
+
+def find_document(doc_id, output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX, manifest=None):
+    """Carrega um documento pelo id (ou None se não existir)"""
+    if manifest is None:
+        manifest = load_manifest(output_dir, prefix)
+    for entry in manifest['documents']:
+        if entry['id'] == doc_id:
+            return read_document(entry, output_dir, prefix, manifest)
+    return None
+
+def verify_roundtrip(original, output_dir=OUTPUT_DIR, prefix=OUTPUT_PREFIX):
+    """Confere se a leitura do NDJSON devolve exatamente a estrutura original
+
+    Devolve a lista de ids divergentes (vazia quando tudo confere).
+    """
+    manifest = load_manifest(output_dir, prefix)
+    mismatches = []
+    restored = list(iter_documents(output_dir, prefix, manifest))
+    if len(restored) != len(original):
+        mismatches.append('<quantidade de documentos>')
+    for before, after in zip(original, restored):
+        # Compara também a ordem das chaves, que o JSON preserva
+        if json.dumps(before, ensure_ascii=False) != json.dumps(after, ensure_ascii=False):
+            mismatches.append(before.get('id'))
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Exporta o database.json como NDJSON')
+    parser.add_argument('--database', default=DATABASE_PATH,
+                        help='database.json de origem (padrão: src/database.json)')
+    parser.add_argument('--saida',
+                        help='Diretório de saída (padrão: src/; com --verificar, uma pasta temporária)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Quantidade de arquivos NDJSON')
+    parser.add_argument('--verificar', action='store_true',
+                        help='Relê a exportação e confere com o original')
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        documents = json.load(f)
+
+    # A verificação não deve sobrescrever o src/database.ndjson publicado
+    scratch = None
+    if args.saida is None:
+        if args.verificar:
+            scratch = tempfile.TemporaryDirectory(prefix='exportar_ndjson_')
+            args.saida = scratch.name
+        else:
+            args.saida = OUTPUT_DIR
+
+    manifest = export_ndjson(documents, args.saida, shards=max(1, args.shards))
+
+    original_size = os.path.getsize(args.database)
+    exported_size = sum(os.path.getsize(os.path.join(args.saida, name))
+                        for name in manifest['shards'])
+
+    print("=" * 70)
+    print("EXPORTAÇÃO NDJSON")
+    print("=" * 70)
+    print(f"📄 Documentos: {len(manifest['documents'])}")
+    print(f"🗂️  Shards: {', '.join(manifest['shards'])}")
+    print(f"💾 Tamanho: {original_size / 1024:.1f} KB -> {exported_size / 1024:.1f} KB")
+
+    if args.verificar:
+        mismatches = verify_roundtrip(documents, args.saida)
+        if scratch:
+            scratch.cleanup()
+        if mismatches:
+            print(f"❌ Divergências na releitura: {', '.join(map(str, mismatches))}")
+            print("=" * 70)
+            sys.exit(1)
+        print("✅ Releitura idêntica ao original")
+    print("=" * 70)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Índice Binário - Concierge RH Digital INPI
+Grava o índice invertido de indice_busca em um arquivo binário compacto
+(src/search-index.bin, ao lado do src/database.json) e o consulta via mmap,
+sem desserializar nada na abertura: a abertura lê só o cabeçalho e cada
+busca toca apenas as páginas do dicionário e das postings que usa. O tempo
+de partida e a memória residente de um worker de busca ficam praticamente
+constantes quando o corpus cresce.
+
+Formato (inteiros little-endian):
+  cabeçalho    magic 'CRHI', versão, nº de campos, nº de documentos, nº de
+               termos e o deslocamento de cada seção abaixo
+  pesos        float64 por campo (título, palavras-chave, descrição)
+  documentos   uint32[nº docs + 1] deslocamentos + ids em UTF-8
+  termos       uint32[nº termos + 1] deslocamentos + termos em UTF-8, em ordem
+  dicionário   uint32[nº termos + 1] início das postings de cada termo e
+               uint32[nº termos] frequência de documento (df)
+  postings     por termo: varint(delta do documento) e varint(tf) por campo
+"""
+
+from indice_busca import (build_index, load_records, record_from_docx, tokenize,
+                          DATABASE_PATH, MIN_PREFIX_LENGTH, MAX_TERMS_PER_PREFIX)
+from manifesto import atomic_write
+from array import array
+from itertools import accumulate
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+
+MAGIC = b'CRHI'
+BINARY_VERSION = 1
+# magic, versão, campos, documentos, termos, deslocamentos de 7 seções
+_HEADER = struct.Struct('<4sHHII7Q')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BINARY_PATH = os.path.join(BASE_DIR, 'src', 'search-index.bin')
+
+# ---------------------------------------------------------------------------
+# Escrita
+# ---------------------------------------------------------------------------
+
+def _varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _uint32(values):
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+def _strings(values):
+    """Deslocamentos (uint32[n + 1]) e o bloco UTF-8 concatenado"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return _uint32(offsets), b''.join(encoded)
+
+def encode_index(index):
+    """Bytes do arquivo binário para um índice de indice_busca.build_index"""
+    terms = sorted(index['terms'])
+    postings = bytearray()
+    starts = []
+    dfs = []
+    for term in terms:
+        starts.append(len(postings))
+        entries = sorted(index['terms'][term])
+        dfs.append(len(entries))
+        previous = 0
+        for entry in entries:
+            _varint(entry[0] - previous, postings)
+            previous = entry[0]
+            for tf in entry[1:]:
+                _varint(tf, postings)
+    starts.append(len(postings))
+    if len(postings) >= 2 ** 32:
+        raise ValueError('Postings grandes demais para deslocamentos de 32 bits')
+
+    doc_offsets, doc_blob = _strings(index['docs'])
+    term_offsets, term_blob = _strings(terms)
+    sections = [
+        struct.pack(f"<{len(index['weights'])}d", *index['weights']),
+        doc_offsets, doc_blob,
+        term_offsets, term_blob,
+        _uint32(starts) + _uint32(dfs),
+        bytes(postings)
+    ]
+
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        # Seções alinhadas em 8 bytes (os arrays de uint32 viram memoryview direto)
+        position += -position % 8
+        offsets.append(position)
+        position += len(section)
+
+    out = bytearray(_HEADER.pack(MAGIC, BINARY_VERSION, len(index['fields']), len(index['docs']),
+                                 len(terms), *offsets))
+    for offset, section in zip(offsets, sections):
+        out.extend(b'\0' * (offset - len(out)))
+        out.extend(section)
+    return bytes(out)
+
+def write_binary_index(index, path=BINARY_PATH):
+    """Grava o arquivo binário (arquivo temporário + rename: leitores abertos seguem no antigo)"""
+    with atomic_write(path, 'wb') as f:
+        f.write(encode_index(index))
+
+# ---------------------------------------------------------------------------
+# Leitura
+# ---------------------------------------------------------------------------
+
+def _uint32_view(buffer, offset, count):
+    view = buffer[offset:offset + 4 * count]
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    # Máquina big-endian: copia e inverte (perde o zero-copy, mantém o formato)
+    data = array('I', view.tobytes())
+    data.byteswap()
+    return memoryview(data)
+
+def open_binary_index(path=BINARY_PATH):
+    """Abre o arquivo via mmap; só o cabeçalho é lido agora"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    (magic, version, n_fields, n_docs, n_terms, weights_at, doc_offsets_at, docs_at,
+     term_offsets_at, terms_at, dictionary_at, postings_at) = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != BINARY_VERSION:
+        raise ValueError(f'{path}: não é um índice binário versão {BINARY_VERSION}')
+
+    return {
+        'mmap': mapped,
+        'buffer': buffer,
+        'fields': n_fields,
+        'n_docs': n_docs,
+        'n_terms': n_terms,
+        'weights': struct.unpack_from(f'<{n_fields}d', buffer, weights_at),
+        'doc_offsets': _uint32_view(buffer, doc_offsets_at, n_docs + 1),
+        'docs_at': docs_at,
+        'term_offsets': _uint32_view(buffer, term_offsets_at, n_terms + 1),
+        'terms_at': terms_at,
+        'starts': _uint32_view(buffer, dictionary_at, n_terms + 1),
+        'dfs': _uint32_view(buffer, dictionary_at + 4 * (n_terms + 1), n_terms),
+        'postings_at': postings_at
+    }
+
+def close_binary_index(reader):
+    for key in ('doc_offsets', 'term_offsets', 'starts', 'dfs', 'buffer'):
+        reader[key].release()
+    reader['mmap'].close()
+
+def _term(reader, i):
+    offsets = reader['term_offsets']
+    start = reader['terms_at']
+    return bytes(reader['buffer'][start + offsets[i]:start + offsets[i + 1]])
+
+def _doc_id(reader, doc_idx):
+    offsets = reader['doc_offsets']
+    start = reader['docs_at']
+    return bytes(reader['buffer'][start + offsets[doc_idx]:start + offsets[doc_idx + 1]]).decode('utf-8')
+
+def _lower_bound(reader, key):
+    """Primeira posição do dicionário com termo >= key (bytes UTF-8: mesma ordem de str)"""
+    low, high = 0, reader['n_terms']
+    while low < high:
+        middle = (low + high) // 2
+        if _term(reader, middle) < key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def find_term(reader, term):
+    """Posição do termo no dicionário, ou None"""
+    key = term.encode('utf-8')
+    i = _lower_bound(reader, key)
+    if i < reader['n_terms'] and _term(reader, i) == key:
+        return i
+    return None
+
+def postings(reader, i):
+    """Postings do termo na posição i: [[doc, tf por campo...]], decodificando só o trecho dele"""
+    starts = reader['starts']
+    base = reader['postings_at']
+    values = []
+    value = shift = 0
+    for byte in reader['buffer'][base + starts[i]:base + starts[i + 1]].tobytes():
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+
+    width = reader['fields'] + 1
+    docs = accumulate(values[::width])
+    return [[doc] + values[k + 1:k + width] for doc, k in zip(docs, range(0, len(values), width))]
+
+def prefix_terms(reader, prefix):
+    """Termos mais frequentes que começam com o prefixo (mesma regra de indice_busca)"""
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return []
+    key = prefix.encode('utf-8')
+    i = _lower_bound(reader, key)
+    candidates = []
+    while i < reader['n_terms']:
+        term = _term(reader, i)
+        if not term.startswith(key):
+            break
+        if term != key:
+            candidates.append((-reader['dfs'][i], term.decode('utf-8'), i))
+        i += 1
+    return [(term, i) for _, term, i in heapq.nsmallest(MAX_TERMS_PER_PREFIX, candidates)]
+
+def expand_token(reader, token, allow_prefix=True):
+    """Posições no dicionário para uma palavra da busca (exato ou por prefixo)"""
+    i = find_term(reader, token)
+    if i is not None:
+        return [i]
+    if allow_prefix:
+        # O dicionário é ordenado: o intervalo serve para qualquer tamanho de prefixo
+        return [i for _, i in prefix_terms(reader, token)]
+    return []
+
+def search(reader, query, limit=None):
+    """Mesma busca (e mesmos resultados) de indice_busca.search, direto do arquivo"""
+    weights = reader['weights']
+    scores = {}
+    words = tokenize(query)
+    for position, word in enumerate(words):
+        for i in expand_token(reader, word, allow_prefix=position == len(words) - 1):
+            for posting in postings(reader, i):
+                doc_idx = posting[0]
+                score = sum(w * tf for w, tf in zip(weights, posting[1:]))
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + score
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [(_doc_id(reader, doc_idx), score) for doc_idx, score in ranked]
+
+# ---------------------------------------------------------------------------
+# Verificação e benchmark
+# ---------------------------------------------------------------------------
+
+# Processo isolado que mede a partida a frio: (segundos para abrir, RSS em MB)
+_COLD_START = r'''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+kind, path, queries = sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+start = time.perf_counter()
+if kind == 'json':
+    from indice_busca import load_index, search
+    index = load_index(path)
+else:
+    from indice_binario import open_binary_index, search
+    index = open_binary_index(path)
+opened = time.perf_counter() - start
+for query in queries:
+    search(index, query, 10)
+first = time.perf_counter() - start - opened
+# VmHWM: pico do próprio processo (ru_maxrss herdaria o pico do pai no fork)
+with open('/proc/self/status') as f:
+    rss = next(int(line.split()[1]) for line in f if line.startswith('VmHWM')) / 1024
+print(json.dumps([opened, first, rss]))
+'''
+
+def cold_start(kind, path, queries):
+    """Abre o índice em um processo novo e roda as buscas; (abertura s, buscas s, RSS MB)"""
+    import json
+    import subprocess
+
+    output = subprocess.run([sys.executable, '-c', _COLD_START, BASE_DIR, kind, path, json.dumps(queries)],
+                            check=True, capture_output=True, text=True).stdout
+    return tuple(json.loads(output))
+
+def benchmark(records, factors, queries):
+    """Tamanho, abertura, primeiras buscas e RSS do JSON e do binário por escala do corpus"""
+    import tempfile
+    from benchmark_busca import scale_records
+    from indice_busca import write_index
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in factors:
+            index = build_index(scale_records(records, factor))
+            json_path = os.path.join(tmp, f'indice-{factor}.json')
+            binary_path = os.path.join(tmp, f'indice-{factor}.bin')
+            write_index(index, json_path)
+            write_binary_index(index, binary_path)
+            del index
+            rows.append({
+                'docs': len(records) * factor,
+                'json_mb': os.path.getsize(json_path) / 1024 / 1024,
+                'binary_mb': os.path.getsize(binary_path) / 1024 / 1024,
+                'json': cold_start('json', json_path, queries),
+                'binary': cold_start('binario', binary_path, queries)
+            })
+            os.remove(json_path)
+            os.remove(binary_path)
+    return rows
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera o índice de busca binário (mmap)')
+    parser.add_argument('--database', default=DATABASE_PATH,
+                        help='database.json de origem (padrão: src/database.json)')
+    parser.add_argument('--docx', nargs='*',
+                        help='Gera a partir de arquivos .docx (pipeline Python) em vez do database.json')
+    parser.add_argument('--saida', default=BINARY_PATH,
+                        help='Arquivo de saída (padrão: src/search-index.bin)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Mede abertura e memória (JSON x binário) com o corpus replicado')
+    parser.add_argument('--escala', type=int, nargs='*', default=[1, 10, 100, 1000],
+                        help='Fatores de replicação do corpus no benchmark')
+    args = parser.parse_args()
+
+    if args.docx:
+        records = [record_from_docx(path) for path in args.docx]
+    else:
+        records = load_records(args.database)
+
+    if args.benchmark:
+        from benchmark_busca import DEFAULT_QUERIES
+
+        print(f"{'DOCS':>8} {'JSON MB':>9} {'BIN MB':>8} {'ABRIR JSON':>11} {'ABRIR BIN':>10} "
+              f"{'BUSCAS JSON':>12} {'BUSCAS BIN':>11} {'RSS JSON':>9} {'RSS BIN':>8}")
+        print("-" * 96)
+        for row in benchmark(records, args.escala, DEFAULT_QUERIES):
+            print(f"{row['docs']:>8} {row['json_mb']:>9.2f} {row['binary_mb']:>8.2f} "
+                  f"{row['json'][0] * 1000:>9.1f}ms {row['binary'][0] * 1000:>8.2f}ms "
+                  f"{row['json'][1] * 1000:>10.1f}ms {row['binary'][1] * 1000:>9.1f}ms "
+                  f"{row['json'][2]:>7.1f}MB {row['binary'][2]:>6.1f}MB")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    index = build_index(records)
+    write_binary_index(index, args.saida)
+
+    print("=" * 70)
+    print("ÍNDICE BINÁRIO GERADO")
+    print("=" * 70)
+    print(f"📄 Documentos: {len(index['docs'])}")
+    print(f"🔑 Termos: {len(index['terms'])}")
+    print(f"💾 Arquivo: {args.saida} ({os.path.getsize(args.saida) / 1024:.1f} KB)")
+    print(f"⏱️  Tempo: {time.perf_counter() - start:.2f}s")
+    print("=" * 70)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Índice de Busca - Concierge RH Digital INPI
+Gera um índice invertido pré-computado (src/search-index.json) ao lado do
+src/database.json: termos sem acento, postings com frequência por campo,
+pesos de título/palavras-chave/descrição e entradas de prefixo. A busca vira
+uma consulta por termo e uma junção, sem leitura documento a documento.
+"""
+
+from manifesto import atomic_write
+from bisect import bisect_left
+import argparse
+import json
+import os
+import re
+import unicodedata
+
+INDEX_VERSION = 1
+
+# Mesmos campos (e ordem de importância) usados na pontuação de api/search.ts
+FIELDS = ('title', 'keywords', 'description')
+FIELD_WEIGHTS = {'title': 3.0, 'keywords': 2.0, 'description': 1.0}
+
+# api/search.ts descarta palavras com menos de 3 caracteres
+MIN_TOKEN_LENGTH = 3
+
+# Prefixos indexados (para completar a última palavra digitada)
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_LENGTH = 8
+MAX_TERMS_PER_PREFIX = 10
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_PATH = os.path.join(BASE_DIR, 'src', 'database.json')
+INDEX_PATH = os.path.join(BASE_DIR, 'src', 'search-index.json')
+
+# Títulos das seções produzidas por organize_content_by_sections
+SECTION_TITLES = {
+    'descricao': 'Descrição',
+    'o_que_e': 'O QUE É?',
+    'quem_tem_direito': 'QUEM TEM DIREITO?',
+    'como_solicitar': 'COMO SOLICITAR?',
+    'prazos': 'PRAZOS',
+    'documentacao': 'DOCUMENTAÇÃO NECESSÁRIA',
+    'legislacao': 'LEGISLAÇÃO',
+    'duvidas': 'DÚVIDAS FREQUENTES',
+    'contato': 'CONTATO'
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+_TAGS = re.compile(r'<[^>]+>')
+
+def strip_accents(text):
+    """Texto sem acentos (decomposição NFD sem as marcas), o resto mantido"""
+    text = unicodedata.normalize('NFD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+def normalize(text):
+    """Minúsculas, sem acentos e só [a-z0-9] (mesma regra de api/search.ts)"""
+    return _NON_ALNUM.sub(' ', strip_accents((text or '').lower()))
+
+def tokenize(text):
+    """Palavras normalizadas com pelo menos MIN_TOKEN_LENGTH caracteres"""
+    return [w for w in normalize(text).split() if len(w) >= MIN_TOKEN_LENGTH]
+
+def slugify(title):
+    """ID do documento a partir do título (mesma regra dos scripts Node)"""
+    return re.sub(r'[^a-z0-9]+', '-', strip_accents(title.lower())).strip('-')
+
+# ---------------------------------------------------------------------------
+# Registros de documentos
+# ---------------------------------------------------------------------------
+
+def _section_text(section):
+    if section['type'] == 'list':
+        return '\n'.join(item.get('text', '') for item in section.get('items', []))
+    if section['type'] == 'table':
+        return _TAGS.sub(' ', section.get('content', ''))
+    return section.get('content', '')
+
+def record_from_database(doc):
+    """Converte um documento do database.json no registro usado pelos índices
+
+    O registro traz id, título, palavras-chave, descrição, ícone e a lista
+    de seções como {'heading', 'text'} (o texto agrupado sob cada título).
+    """
+    sections = []
+    current = {'heading': '', 'text': []}
+    for section in doc.get('sections', []):
+        if section['type'] == 'heading':
+            if current['heading'] or current['text']:
+                sections.append(current)
+            current = {'heading': section.get('content', ''), 'text': []}
+            continue
+        text = _section_text(section).strip()
+        if text:
+            current['text'].append(text)
+    if current['heading'] or current['text']:
+        sections.append(current)
+
+    return {
+        'id': doc['id'],
+        'title': doc.get('title', ''),
+        'keywords': doc.get('keywords', ''),
+        'description': doc.get('description', ''),
+        'icon': doc.get('icon', 'file-text'),
+        'sections': [
+            {'heading': s['heading'], 'text': '\n'.join(s['text'])} for s in sections
+        ]
+    }
+
+def record_from_sections(doc_name, sections):
+    """Monta o registro a partir de organize_content_by_sections"""
+    title = os.path.splitext(os.path.basename(doc_name))[0]
+    record_sections = []
+    for key, heading in SECTION_TITLES.items():
+        value = sections.get(key)
+        if isinstance(value, list):
+            text = '\n'.join(item['text'] for item in value)
+        else:
+            text = value or ''
+        if text:
+            record_sections.append({'heading': heading, 'text': text})
+
+    description = sections.get('descricao') or ''
+    if len(description) > 150:
+        description = description[:147] + '...'
+
+    return {
+        'id': slugify(title),
+        'title': title,
+        'keywords': '',
+        'description': description,
+        'icon': 'file-text',
+        'sections': record_sections
+    }
+
+def record_from_docx(doc_path):
+    """Extrai um .docx pelo pipeline (conteúdo em fluxo + seções)"""
+    from reformatar_docs import organize_content_by_sections
+    from leitura_rapida import iter_content
+
+    doc_name = os.path.basename(doc_path)
+    return record_from_sections(doc_name, organize_content_by_sections(iter_content(doc_path), doc_name))
+
+def load_records(database_path=DATABASE_PATH):
+    """Registros de todos os documentos do database.json"""
+    with open(database_path, 'r', encoding='utf-8') as f:
+        return [record_from_database(doc) for doc in json.load(f)]
+
+# ---------------------------------------------------------------------------
+# Índice invertido
+# ---------------------------------------------------------------------------
+
+def build_index(records):
+    """Monta o índice invertido com frequência por campo e prefixos"""
+    doc_ids = []
+    terms = {}
+
+    for doc_idx, record in enumerate(records):
+        doc_ids.append(record['id'])
+        frequencies = {}
+        for field_idx, field in enumerate(FIELDS):
+            for token in tokenize(record.get(field, '')):
+                tf = frequencies.setdefault(token, [0] * len(FIELDS))
+                tf[field_idx] += 1
+        for token, tf in frequencies.items():
+            terms.setdefault(token, []).append([doc_idx] + tf)
+
+    # Prefixos -> termos mais frequentes (para completar a última palavra)
+    prefixes = {}
+    for token in terms:
+        for length in range(MIN_PREFIX_LENGTH, min(len(token), MAX_PREFIX_LENGTH + 1)):
+            prefixes.setdefault(token[:length], []).append(token)
+    for prefix, candidates in prefixes.items():
+        candidates.sort(key=lambda t: (-len(terms[t]), t))
+        del candidates[MAX_TERMS_PER_PREFIX:]
+
+    return {
+        'version': INDEX_VERSION,
+        'fields': list(FIELDS),
+        'weights': [FIELD_WEIGHTS[field] for field in FIELDS],
+        'docs': doc_ids,
+        'terms': dict(sorted(terms.items())),
+        'prefixes': dict(sorted(prefixes.items()))
+    }
+
+def long_prefix_terms(index, prefix):
+    """Termos mais frequentes que começam com um prefixo maior que os da tabela
+
+    A tabela de prefixos vai só até MAX_PREFIX_LENGTH e guarda os
+    MAX_TERMS_PER_PREFIX primeiros; filtrá-la perderia termos menos
+    frequentes. Aqui o intervalo é lido do dicionário ordenado (bisect).
+    """
+    if '_sorted_terms' not in index:
+        index['_sorted_terms'] = sorted(index['terms'])
+    sorted_terms = index['_sorted_terms']
+    candidates = []
+    for i in range(bisect_left(sorted_terms, prefix), len(sorted_terms)):
+        term = sorted_terms[i]
+        if not term.startswith(prefix):
+            break
+        if term != prefix:
+            candidates.append(term)
+    candidates.sort(key=lambda t: (-len(index['terms'][t]), t))
+    return candidates[:MAX_TERMS_PER_PREFIX]
+
+def expand_token(index, token, allow_prefix=True, fuzzy=None):
+    """Termos do índice para uma palavra da busca
+
+    Exato, por prefixo ou, com o dicionário de busca_aproximada, a correção
+    mais próxima que exista no índice.
+    """
+    if token in index['terms']:
+        return [token]
+    if allow_prefix:
+        if len(token) <= MAX_PREFIX_LENGTH:
+            expanded = index['prefixes'].get(token, [])
+        else:
+            expanded = long_prefix_terms(index, token)
+        if expanded:
+            return expanded
+    if fuzzy is not None:
+        from busca_aproximada import correct
+
+        corrected = correct(fuzzy, token, known=index['terms'])
+        return [corrected] if corrected else []
+    return []
+
+def search(index, query, limit=None, fuzzy=None):
+    """Busca no índice: uma consulta por palavra e junção das postings
+
+    Devolve [(doc_id, score)] em ordem decrescente de relevância. Como em
+    api/search.ts, qualquer palavra basta (união); o score soma as
+    frequências de cada campo multiplicadas pelo peso do campo. Com `fuzzy`
+    (busca_aproximada.build_fuzzy), palavras fora do índice são corrigidas.
+    """
+    weights = index['weights']
+    scores = {}
+    words = tokenize(query)
+    for position, word in enumerate(words):
+        # Só a última palavra é completada por prefixo (ainda sendo digitada)
+        for term in expand_token(index, word, allow_prefix=position == len(words) - 1, fuzzy=fuzzy):
+            for posting in index['terms'][term]:
+                doc_idx = posting[0]
+                score = sum(w * tf for w, tf in zip(weights, posting[1:]))
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + score
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [(index['docs'][doc_idx], score) for doc_idx, score in ranked]
+
+def write_index(index, index_path=INDEX_PATH):
+    """Grava o índice em JSON compacto (arquivo temporário + rename)"""
+    # Chaves com '_' são caches montados em memória (ex.: long_prefix_terms)
+    data = {key: value for key, value in index.items() if not key.startswith('_')}
+    with atomic_write(index_path) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+def load_index(index_path=INDEX_PATH):
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera o índice invertido de busca')
+    parser.add_argument('--database', default=DATABASE_PATH,
+                        help='database.json de origem (padrão: src/database.json)')
+    parser.add_argument('--docx', nargs='*',
+                        help='Gera a partir de arquivos .docx (pipeline Python) em vez do database.json')
+    parser.add_argument('--saida', default=INDEX_PATH,
+                        help='Arquivo de saída (padrão: src/search-index.json)')
+    args = parser.parse_args()
+
+    if args.docx:
+        records = [record_from_docx(path) for path in args.docx]
+    else:
+        records = load_records(args.database)
+
+    index = build_index(records)
+    write_index(index, args.saida)
+
+    print("=" * 70)
+    print("ÍNDICE DE BUSCA GERADO")
+    print("=" * 70)
+    print(f"📄 Documentos: {len(index['docs'])}")
+    print(f"🔑 Termos: {len(index['terms'])}")
+    print(f"🔤 Prefixos: {len(index['prefixes'])}")
+    print(f"💾 Arquivo: {args.saida} ({os.path.getsize(args.saida) / 1024:.1f} KB)")
+    print("=" * 70)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Leitura Rápida - Concierge RH Digital INPI
+Caminho somente-leitura que lê word/document.xml direto do ZIP com iterparse
+(lxml), sem montar o modelo do python-docx. Usado pela validação e pelo relatório,
+que só contam seções (Heading 2), parágrafos não vazios e hyperlinks, e pelo
+modo em fluxo da extração (iter_content), que entrega os parágrafos com
+links um a um: a memória fica limitada ao maior parágrafo, não ao documento.
+"""
+
+from lxml import etree
+import argparse
+import os
+import posixpath
+import time
+import zipfile
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PR = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+_BODY = W + 'body'
+_P = W + 'p'
+_R = W + 'r'
+_T = W + 't'
+_TBL = W + 'tbl'
+_TR = W + 'tr'
+_TC = W + 'tc'
+_HYPERLINK = W + 'hyperlink'
+_PPR = W + 'pPr'
+_PSTYLE = W + 'pStyle'
+_RPR = W + 'rPr'
+_BOLD = W + 'b'
+_ITALIC = W + 'i'
+_STYLE = W + 'style'
+_NAME = W + 'name'
+_VAL = W + 'val'
+_TYPE = W + 'type'
+_STYLE_ID = W + 'styleId'
+_DEFAULT = W + 'default'
+_R_ID = R + 'id'
+
+# Valores de ST_OnOff que desligam uma propriedade (w:b, w:i)
+_OFF = ('0', 'false', 'off')
+
+# Mesmos nomes "de interface" que o python-docx usa para estilos internos
+_UI_STYLE_NAMES = {
+    'caption': 'Caption',
+    'footer': 'Footer',
+    'header': 'Header',
+    'heading 1': 'Heading 1',
+    'heading 2': 'Heading 2',
+    'heading 3': 'Heading 3',
+    'heading 4': 'Heading 4',
+    'heading 5': 'Heading 5',
+    'heading 6': 'Heading 6',
+    'heading 7': 'Heading 7',
+    'heading 8': 'Heading 8',
+    'heading 9': 'Heading 9',
+}
+
+def _run_text(elem):
+    """Texto equivalente de um filho de w:r (mesma regra do python-docx)"""
+    tag = elem.tag
+    if tag == W + 't':
+        return elem.text or ''
+    if tag in (W + 'tab', W + 'ptab'):
+        return '\t'
+    if tag == W + 'cr':
+        return '\n'
+    if tag == W + 'br':
+        return '\n' if elem.get(W + 'type', 'textWrapping') == 'textWrapping' else ''
+    if tag == W + 'noBreakHyphen':
+        return '-'
+    return None
+
+def _rels_path(part_path):
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, '_rels', name + '.rels')
+
+def _read_rels(zf, rels_path):
+    """Mapa Id -> Target de um arquivo .rels (vazio se não existir)"""
+    try:
+        f = zf.open(rels_path)
+    except KeyError:
+        return {}
+    targets = {}
+    with f:
+        for _, elem in etree.iterparse(f, events=('end',), tag=PR + 'Relationship'):
+            targets[elem.get('Id')] = (elem.get('Target'), elem.get('Type'))
+            elem.clear()
+    return targets
+
+def _main_part(zf):
+    """Localiza a parte principal (normalmente word/document.xml)"""
+    for target, rel_type in _read_rels(zf, '_rels/.rels').values():
+        if rel_type == OFFICE_DOCUMENT:
+            return target.lstrip('/')
+    return 'word/document.xml'
+
+# Documentos do mesmo modelo compartilham styles.xml: cache por CRC e tamanho
+_styles_cache = {}
+
+def _read_styles(zf, part_path, rels):
+    """Nomes dos estilos de parágrafo por id e o id do estilo padrão"""
+    styles_target = None
+    for target, rel_type in rels.values():
+        if rel_type and rel_type.endswith('/styles'):
+            styles_target = posixpath.normpath(posixpath.join(posixpath.dirname(part_path), target))
+            break
+
+    if styles_target is None:
+        return {}, None
+
+    try:
+        info = zf.getinfo(styles_target)
+    except KeyError:
+        return {}, None
+
+    cache_key = (info.CRC, info.file_size)
+    if cache_key not in _styles_cache:
+        if len(_styles_cache) >= 256:
+            _styles_cache.clear()
+        _styles_cache[cache_key] = _parse_styles(zf, info)
+    return _styles_cache[cache_key]
+
+def _parse_styles(zf, info):
+    names = {}
+    default_id = None
+    with zf.open(info) as f:
+        for _, style in etree.iterparse(f, events=('end',), tag=_STYLE):
+            if style.get(_TYPE) == 'paragraph':
+                style_id = style.get(_STYLE_ID)
+                name = style.find(_NAME)
+                if name is not None:
+                    names[style_id] = _UI_STYLE_NAMES.get(name.get(_VAL), name.get(_VAL))
+                if default_id is None and style.get(_DEFAULT) in ('1', 'true', 'on'):
+                    default_id = style_id
+            style.clear()
+
+    return names, default_id
+
+def _paragraph_text(p):
+    """Texto do parágrafo: runs diretos e runs de hyperlinks (como o python-docx)"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            runs = (child,)
+        elif child.tag == _HYPERLINK:
+            runs = child.iterchildren(_R)
+        else:
+            continue
+        for run in runs:
+            for elem in run:
+                text = _run_text(elem)
+                if text:
+                    parts.append(text)
+    return ''.join(parts)
+
+def _hyperlink_ids(p):
+    """rIds dos hyperlinks do parágrafo, ignorando a cópia VML (mc:Fallback)"""
+    ids = []
+    for hyperlink in p.iter(_HYPERLINK):
+        if any(True for _ in hyperlink.iterancestors(MC_FALLBACK)):
+            continue
+        ids.append(hyperlink.get(_R_ID))
+    return ids
+
+def _iter_body_elements(doc_path, tag=_P):
+    """Gera (elemento, rels, estilos, estilo_padrão) para cada w:p (ou w:tbl) do corpo
+
+    Usa iterparse filtrando só w:p e w:tbl; cada filho do corpo é descartado
+    assim que termina, então a memória fica limitada ao maior parágrafo ou
+    tabela, não ao documento.
+    """
+    with zipfile.ZipFile(doc_path) as zf:
+        part_path = _main_part(zf)
+        rels = _read_rels(zf, _rels_path(part_path))
+        style_names, default_id = _read_styles(zf, part_path, rels)
+        default_style = style_names.get(default_id, 'Normal')
+
+        with zf.open(part_path) as f:
+            for _, elem in etree.iterparse(f, events=('end',), tag=(_P, _TBL)):
+                parent = elem.getparent()
+                if parent is None or parent.tag != _BODY:
+                    continue
+
+                if elem.tag == tag:
+                    yield elem, rels, style_names, default_style
+
+                # Descarta o elemento e os irmãos anteriores já processados
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+def _style_name(p, style_names, default_style):
+    for child in p:
+        if child.tag != _PPR:
+            continue
+        for prop in child:
+            if prop.tag == _PSTYLE:
+                return style_names.get(prop.get(_VAL), default_style)
+        break
+    return default_style
+
+def iter_body_paragraphs(doc_path):
+    """Gera os parágrafos do corpo (mesmos de Document.paragraphs) em streaming
+
+    Cada registro traz 'text', 'style' e 'links' (quantidade de hyperlinks
+    válidos).
+    """
+    for p, rels, style_names, default_style in _iter_body_elements(doc_path):
+        yield {
+            'text': _paragraph_text(p),
+            'style': _style_name(p, style_names, default_style),
+            'links': sum(1 for r_id in _hyperlink_ids(p) if r_id in rels)
+        }
+
+def _toggle(run, prop):
+    """Negrito/itálico aplicado direto no run (mesma regra de Run.bold)"""
+    rpr = run.find(_RPR)
+    if rpr is None:
+        return False
+    elem = rpr.find(prop)
+    return elem is not None and elem.get(_VAL, 'true') not in _OFF
+
+def _paragraph_links(p, rels):
+    """Links {'text', 'url'} do parágrafo, na ordem do documento"""
+    links = []
+    for hyperlink in p.iter(_HYPERLINK):
+        target = rels.get(hyperlink.get(_R_ID))
+        if target is None or any(True for _ in hyperlink.iterancestors(MC_FALLBACK)):
+            continue
+        links.append({
+            'text': ''.join(node.text for node in hyperlink.iter(_T) if node.text),
+            'url': target[0]
+        })
+    return links
+
+def _content_record(p, rels, style):
+    """Registro de extract_content_with_links, ou None para parágrafo vazio"""
+    text = _paragraph_text(p).strip()
+    if not text:
+        return None
+    runs = list(p.iterchildren(_R))
+    return {
+        'text': text,
+        'links': _paragraph_links(p, rels),
+        'style': style,
+        'bold': any(_toggle(run, _BOLD) for run in runs),
+        'italic': any(_toggle(run, _ITALIC) for run in runs)
+    }
+
+def iter_content(doc_path, tables=False):
+    """Gera os parágrafos não vazios do corpo em streaming
+
+    Cada registro tem os mesmos campos de extract_content_with_links
+    ('text', 'links', 'style', 'bold', 'italic'). Com tables=True, depois do
+    corpo vêm os parágrafos das tabelas com estilo 'Table', como em
+    extract_all_content (uma segunda leitura do ZIP, também em fluxo). Células
+    mescladas aparecem uma vez só, como estão no XML.
+    """
+    for p, rels, style_names, default_style in _iter_body_elements(doc_path):
+        record = _content_record(p, rels, _style_name(p, style_names, default_style))
+        if record is not None:
+            yield record
+
+    if not tables:
+        return
+    for tbl, rels, _, _ in _iter_body_elements(doc_path, _TBL):
+        for row in tbl.iterchildren(_TR):
+            for cell in row.iterchildren(_TC):
+                for p in cell.iterchildren(_P):
+                    record = _content_record(p, rels, 'Table')
+                    if record is not None:
+                        yield record
+
+def scan_document(doc_path):
+    """Conta seções (Heading 2), parágrafos não vazios e links sem python-docx
+
+    Devolve o mesmo dicionário que validar_docs.validate_document.
+    """
+    sections = []
+    paragraphs = 0
+    links = 0
+
+    for para in iter_body_paragraphs(doc_path):
+        text = para['text'].strip()
+        if text:
+            paragraphs += 1
+            if 'Heading 2' in para['style']:
+                sections.append(text)
+            links += para['links']
+
+    return {
+        'sections': sections,
+        'section_count': len(sections),
+        'paragraphs': paragraphs,
+        'links': links
+    }
+
+def scan_with_python_docx(doc_path):
+    """Mesmas contagens de scan_document pelo modelo do python-docx (referência)"""
+    from modelo_docx import build_model, body_paragraphs
+    from docx import Document
+
+    model = build_model(Document(doc_path), doc_path)
+    sections = []
+    paragraphs = 0
+    links = 0
+    for para in body_paragraphs(model):
+        if para['text'].strip():
+            paragraphs += 1
+            if 'Heading 2' in para['style']:
+                sections.append(para['text'].strip())
+            links += len(para['links'])
+    return {
+        'sections': sections,
+        'section_count': len(sections),
+        'paragraphs': paragraphs,
+        'links': links
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Conta seções, parágrafos e links direto do ZIP')
+    parser.add_argument('paths', nargs='+', help='Arquivos .docx ou diretórios')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Mede o ganho em relação à leitura pelo python-docx')
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith('.docx') and not name.startswith('~$')))
+        else:
+            files.append(path)
+
+    print("=" * 90)
+    print(f"{'DOCUMENTO':<50} {'SECOES':<8} {'PARAGRAFOS':<12} {'LINKS':<8}")
+    print("-" * 90)
+
+    fast_total = 0.0
+    slow_total = 0.0
+    for doc_path in files:
+        name = os.path.basename(doc_path)
+        start = time.perf_counter()
+        result = scan_document(doc_path)
+        fast_total += time.perf_counter() - start
+        if args.benchmark:
+            start = time.perf_counter()
+            scan_with_python_docx(doc_path)
+            slow_total += time.perf_counter() - start
+        print(f"{name[:49]:<50} {result['section_count']:<8} {result['paragraphs']:<12} {result['links']:<8}")
+
+    print("-" * 90)
+    if args.benchmark:
+        speedup = slow_total / fast_total if fast_total else 0
+        print(f"Leitura rápida: {fast_total:.3f}s | python-docx: {slow_total:.3f}s | ganho: {speedup:.1f}x")
+    print("=" * 90)
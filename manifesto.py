@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Manifesto Incremental - Concierge RH Digital INPI
+Registra o hash de conteúdo de cada documento e o resultado de cada etapa
+(extração, reformatação, links, validação, relatório) para pular arquivos
+que não mudaram desde a última execução
+"""
+
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import stat
+import tempfile
+
+MANIFEST_NAME = '.manifesto.json'
+# 2: a etapa de análise guarda só contagens e prévia, não o conteúdo inteiro
+MANIFEST_VERSION = 2
+
+# umask do processo (lido uma vez: os.umask só consulta trocando o valor)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# ---------------------------------------------------------------------------
+# Gravação atômica
+# ---------------------------------------------------------------------------
+
+def file_mode(path):
+    """Permissões do arquivo gravado: as do arquivo atual ou, se novo, as de um open() comum"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+@contextmanager
+def atomic_path(path, prefix='.tmp-', suffix='.tmp', chmod=True):
+    """Caminho temporário no mesmo diretório, renomeado sobre `path` no fim
+
+    Quem lê `path` nunca vê o arquivo pela metade e escritores simultâneos
+    não disputam o mesmo temporário. Em caso de erro o temporário é apagado.
+    O mkstemp cria o arquivo com 0600; com `chmod` o resultado recebe as
+    permissões de file_mode (sem `chmod`, ex.: hardlink, ficam as do inode).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=directory)
+    os.close(fd)
+    try:
+        yield tmp_path
+        if chmod:
+            os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@contextmanager
+def atomic_write(path, mode='w', prefix='.tmp-', suffix='.tmp'):
+    """Arquivo aberto para gravação atômica em `path` (ver atomic_path)"""
+    with atomic_path(path, prefix, suffix) as tmp_path:
+        encoding = None if 'b' in mode else 'utf-8'
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+
+# ---------------------------------------------------------------------------
+# Manifesto
+# ---------------------------------------------------------------------------
+
+def default_manifest_path(docs_dir):
+    """Caminho padrão do manifesto dentro do diretório de documentos"""
+    return os.path.join(docs_dir, MANIFEST_NAME)
+
+def load_manifest(manifest_path):
+    """Carrega o manifesto do disco (ou cria um vazio)"""
+    manifest = {'version': MANIFEST_VERSION, 'files': {}, 'stages': {}, 'derived': {}}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest = data
+        except (OSError, ValueError):
+            pass
+    manifest['_path'] = manifest_path
+    return manifest
+
+def save_manifest(manifest):
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+    manifest_path = manifest['_path']
+    data = {k: v for k, v in manifest.items() if not k.startswith('_')}
+    with atomic_write(manifest_path, prefix='.manifesto-') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+def _key(manifest, path):
+    base = os.path.dirname(os.path.abspath(manifest['_path']))
+    return os.path.relpath(os.path.abspath(path), base).replace(os.sep, '/')
+
+def file_hash(manifest, path):
+    """SHA-256 do arquivo, reaproveitando o valor se tamanho e mtime não mudaram"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = _key(manifest, path)
+    entry = manifest['files'].get(key)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+    manifest['files'][key] = {
+        'sha256': digest.hexdigest(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+    return manifest['files'][key]['sha256']
+
+def input_hashes(manifest, doc_path, extra_inputs=()):
+    """Hashes do documento e das entradas adicionais de uma etapa"""
+    return [file_hash(manifest, path) for path in (doc_path,) + tuple(extra_inputs)]
+
+def cached_result(manifest, stage, doc_path, extra_inputs=(), accept_derived=False):
+    """Resultado gravado da etapa, se nenhuma entrada mudou; senão None
+
+    Também reconhece o estado produzido pela própria etapa, para que etapas
+    que reescrevem o arquivo (reformatação, restauração) não rodem de novo
+    sobre a própria saída. Com accept_derived=True, qualquer versão gerada
+    pelo pipeline a partir da entrada gravada (por exemplo, o documento
+    reformatado e depois com links restaurados) também conta como inalterada.
+    """
+    key = _key(manifest, doc_path)
+    entry = manifest['stages'].get(stage, {}).get(key)
+    if not entry:
+        return None
+
+    hashes = input_hashes(manifest, doc_path, extra_inputs)
+    if None in hashes:
+        return None
+    if hashes == entry['inputs'] or hashes == entry['outputs']:
+        return entry['result']
+    if (accept_derived and hashes[1:] == entry['inputs'][1:]
+            and hashes[0] in manifest['derived'].get(key, [])):
+        return entry['result']
+    return None
+
+def _is_error(result):
+    if result is None:
+        return True
+    if isinstance(result, dict):
+        return 'error' in result or result.get('status') == 'error'
+    return False
+
+def store_result(manifest, stage, doc_path, result, inputs, extra_inputs=()):
+    """Grava o resultado da etapa (resultados com erro não são gravados)"""
+    if _is_error(result) or None in inputs:
+        return
+
+    key = _key(manifest, doc_path)
+    outputs = input_hashes(manifest, doc_path, extra_inputs)
+    manifest['stages'].setdefault(stage, {})[key] = {
+        'inputs': inputs,
+        'outputs': outputs,
+        'result': result
+    }
+
+    # Versões reescritas pelo pipeline (linhagem da fonte atual)
+    if outputs[0] != inputs[0]:
+        derived = manifest['derived'].get(key, [])
+        if inputs[0] not in derived:
+            derived = []
+        if outputs[0] not in derived:
+            derived.append(outputs[0])
+        manifest['derived'][key] = derived
+
+def run_stage(manifest, stage, doc_path, compute, extra_inputs=(), force=False,
+              accept_derived=False):
+    """Executa compute() apenas se o documento (ou suas entradas) mudou
+
+    Devolve (resultado, veio_do_cache). Com force=True a etapa sempre roda,
+    mas o resultado continua sendo gravado no manifesto.
+    """
+    if manifest is None:
+        return compute(), False
+
+    if not force:
+        cached = cached_result(manifest, stage, doc_path, extra_inputs, accept_derived)
+        if cached is not None:
+            return cached, True
+
+    inputs = input_hashes(manifest, doc_path, extra_inputs)
+    result = compute()
+    store_result(manifest, stage, doc_path, result, inputs, extra_inputs)
+    return result, False
+
+def forget(manifest, doc_path):
+    """Remove o documento (hash e resultados de todas as etapas) do manifesto"""
+    key = _key(manifest, doc_path)
+    manifest['files'].pop(key, None)
+    manifest['derived'].pop(key, None)
+    for results in manifest['stages'].values():
+        results.pop(key, None)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Métricas - Concierge RH Digital INPI
+Cronômetros e contadores por etapa (leitura, extração, classificação, escrita,
+restauração) para os scripts de processamento, no lugar das linhas de print
+por documento. O console fica quieto por padrão (--verbose volta a mostrar o
+andamento); ao final, as métricas vão para um arquivo JSON ou para o formato
+textfile do Prometheus (node_exporter --collector.textfile.directory).
+
+Perfis opcionais: --perfil grava as estatísticas do cProfile (abra com
+python -m pstats ou snakeviz) e --memoria liga o tracemalloc e mostra o pico
+e as linhas que mais alocaram.
+"""
+
+from manifesto import atomic_write
+from contextlib import contextmanager
+from functools import wraps
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+
+PREFIX = 'concierge'
+FORMATS = ('json', 'prometheus')
+# Linhas mostradas no resumo do cProfile e do tracemalloc
+TOP_LINES = 15
+
+_timers = {}
+_counters = {}
+# Tempo gasto nos cronômetros filhos de cada cronômetro aberto (tempo próprio)
+_stack = []
+_verbose = False
+
+def configure(verbose=False):
+    """Liga ou desliga as mensagens de andamento"""
+    global _verbose
+    _verbose = verbose
+
+def is_verbose():
+    return _verbose
+
+def log(message=''):
+    """Mensagem de andamento: só aparece com --verbose"""
+    if _verbose:
+        print(message)
+
+def warn(message):
+    """Erros e avisos: sempre aparecem, na saída de erro"""
+    print(message, file=sys.stderr)
+
+def _record(name, elapsed, own, calls=1):
+    entry = _timers.get(name)
+    if entry is None:
+        entry = _timers[name] = {'calls': 0, 'seconds': 0.0, 'own_seconds': 0.0, 'max_seconds': 0.0}
+    entry['calls'] += calls
+    entry['seconds'] += elapsed
+    entry['own_seconds'] += own
+    entry['max_seconds'] = max(entry['max_seconds'], elapsed / calls if calls else elapsed)
+
+@contextmanager
+def timer(name):
+    """Cronometra um bloco
+
+    Cronômetros podem ser aninhados: 'seconds' é o tempo total do bloco e
+    'own_seconds' desconta o que foi medido pelos cronômetros internos.
+    """
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _record(name, elapsed, elapsed - children)
+
+def timed(name):
+    """Decorador equivalente a timer(name) em volta da função"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def timed_iter(name, iterable):
+    """Repassa um fluxo cronometrando só o tempo gasto para produzir cada item
+
+    O consumidor do fluxo (ex.: a classificação em seções) não entra na conta.
+    """
+    iterator = iter(iterable)
+    total = own = 0.0
+    try:
+        while True:
+            _stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = time.perf_counter() - start
+                children = _stack.pop()
+                if _stack:
+                    _stack[-1] += elapsed
+                total += elapsed
+                own += elapsed - children
+            yield item
+    finally:
+        _record(name, total, own)
+
+def count(name, value=1):
+    """Soma value ao contador name"""
+    _counters[name] = _counters.get(name, 0) + value
+
+def reset():
+    _timers.clear()
+    _counters.clear()
+    _stack.clear()
+
+def export():
+    """Métricas atuais: {'timers': {...}, 'counters': {...}}"""
+    return {
+        'timers': {name: dict(entry) for name, entry in _timers.items()},
+        'counters': dict(_counters)
+    }
+
+def merge(data):
+    """Soma as métricas exportadas por outro processo (ex.: worker do pool)"""
+    for name, entry in data.get('timers', {}).items():
+        current = _timers.setdefault(name, {'calls': 0, 'seconds': 0.0, 'own_seconds': 0.0, 'max_seconds': 0.0})
+        current['calls'] += entry['calls']
+        current['seconds'] += entry['seconds']
+        current['own_seconds'] += entry['own_seconds']
+        current['max_seconds'] = max(current['max_seconds'], entry['max_seconds'])
+    for name, value in data.get('counters', {}).items():
+        count(name, value)
+
+def run_collected(fn, *args, verbose=False):
+    """Executa fn em um processo de trabalho e devolve (resultado, métricas)
+
+    As métricas do worker são zeradas a cada tarefa e voltam junto com o
+    resultado para o merge no processo principal.
+    """
+    configure(verbose)
+    reset()
+    result = fn(*args)
+    return result, export()
+
+def _metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def to_prometheus(data, prefix=PREFIX):
+    """Texto no formato de exposição do Prometheus (textfile collector)"""
+    lines = []
+    timers = sorted(data['timers'].items())
+    families = (
+        ('etapa_segundos_total', 'counter', 'Tempo total da etapa, incluindo etapas internas', 'seconds'),
+        ('etapa_segundos_proprios_total', 'counter', 'Tempo da etapa sem as etapas internas', 'own_seconds'),
+        ('etapa_chamadas_total', 'counter', 'Execuções da etapa', 'calls'),
+        ('etapa_segundos_max', 'gauge', 'Execução mais lenta da etapa', 'max_seconds'),
+    )
+    for suffix, kind, help_text, key in families:
+        metric = f'{prefix}_{suffix}'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for name, entry in timers:
+            lines.append(f'{metric}{{etapa="{_label(name)}"}} {entry[key]:.6g}')
+
+    for name, value in sorted(data['counters'].items()):
+        metric = f'{prefix}_{_metric_name(name)}'
+        kind = 'gauge' if name in data.get('gauges', ()) else 'counter'
+        if kind == 'counter':
+            metric += '_total'
+        lines.append(f'# TYPE {metric} {kind}')
+        lines.append(f'{metric} {value}')
+    return '\n'.join(lines) + '\n'
+
+def format_for(path, fmt=None):
+    """Formato explícito ou deduzido da extensão (.prom = prometheus)"""
+    if fmt:
+        return fmt
+    return 'prometheus' if path.endswith('.prom') else 'json'
+
+def write_metrics(path, fmt=None, data=None):
+    """Grava as métricas de forma atômica (o textfile collector pode ler a qualquer momento)"""
+    data = export() if data is None else data
+    if format_for(path, fmt) == 'prometheus':
+        text = to_prometheus(data)
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+    with atomic_write(path, prefix='.metricas-') as f:
+        f.write(text)
+
+def summary(data=None):
+    """Tabela das etapas (tempo total, próprio, chamadas) e dos contadores"""
+    data = export() if data is None else data
+    lines = [f"{'ETAPA':<24} {'CHAMADAS':>9} {'TOTAL (s)':>11} {'PRÓPRIO (s)':>12} {'MÁX (s)':>9}"]
+    for name, entry in sorted(data['timers'].items(), key=lambda item: -item[1]['own_seconds']):
+        lines.append(f"{name:<24} {entry['calls']:>9} {entry['seconds']:>11.3f} "
+                     f"{entry['own_seconds']:>12.3f} {entry['max_seconds']:>9.3f}")
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f"   {name:<32} {value}")
+    return '\n'.join(lines)
+
+def add_arguments(parser):
+    """Argumentos comuns de instrumentação (--metricas, --formato, --perfil, --memoria, --verbose)"""
+    group = parser.add_argument_group('métricas')
+    group.add_argument('--metricas', metavar='ARQUIVO',
+                       help='Grava cronômetros e contadores (.json ou .prom)')
+    group.add_argument('--formato', choices=FORMATS,
+                       help='Formato de --metricas (padrão: pela extensão)')
+    group.add_argument('--perfil', metavar='ARQUIVO',
+                       help='Grava o perfil do cProfile (só o processo principal: use --workers 1)')
+    group.add_argument('--memoria', action='store_true',
+                       help='Mede o pico de memória com tracemalloc (só o processo principal)')
+    group.add_argument('-v', '--verbose', action='store_true',
+                       help='Mostra o andamento de cada documento')
+    return parser
+
+@contextmanager
+def session(args):
+    """Instrumenta a execução de um script conforme os argumentos de add_arguments"""
+    configure(args.verbose)
+    profiler = cProfile.Profile() if args.perfil else None
+    if args.memoria:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        with timer('execucao'):
+            yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.perfil)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(TOP_LINES)
+            log(out.getvalue())
+            print(f"📈 Perfil gravado em {args.perfil} (python -m pstats {args.perfil})")
+
+        gauges = ()
+        if args.memoria:
+            top = tracemalloc.take_snapshot().statistics('lineno')[:TOP_LINES]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _counters['memoria_pico_bytes'] = peak
+            gauges = ('memoria_pico_bytes',)
+            print(f"🧠 Pico de memória: {peak / 1024 / 1024:.1f} MB")
+            for stat in top:
+                log(f"   {stat}")
+
+        if args.verbose:
+            print(summary())
+        if args.metricas:
+            data = export()
+            data['gauges'] = list(gauges)
+            write_metrics(args.metricas, args.formato, data)
+            print(f"📊 Métricas gravadas em {args.metricas}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte um arquivo de métricas JSON')
+    parser.add_argument('entrada', help='Métricas gravadas com --metricas arquivo.json')
+    parser.add_argument('--prometheus', metavar='ARQUIVO',
+                        help='Grava no formato textfile do Prometheus')
+    args = parser.parse_args()
+
+    with open(args.entrada, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if args.prometheus:
+        write_metrics(args.prometheus, 'prometheus', data)
+        print(f"📊 Métricas gravadas em {args.prometheus}")
+    else:
+        print(summary(data))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Modelo compacto de documento - Concierge RH Digital INPI
+Lê cada .docx UMA única vez e expõe parágrafos, estilos, runs, links e tabelas
+para todos os scripts (análise, reformatação, links, validação e relatório)
+"""
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from functools import lru_cache
+import copy
+import metricas
+import os
+import re
+
+# Partes do pacote que podem conter hyperlinks
+_LINK_PARTS = re.compile(r'^/word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$')
+
+_W_P = qn('w:p')
+_W_T = qn('w:t')
+_W_TC = qn('w:tc')
+_W_TXBX = qn('w:txbxContent')
+_W_HYPERLINK = qn('w:hyperlink')
+_R_ID = qn('r:id')
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+def hyperlink_targets(part):
+    """Mapa rId -> URL da parte, montado uma única vez"""
+    return {r_id: rel.target_ref for r_id, rel in part.rels.items()}
+
+def paragraph_urls(p_element, targets):
+    """URLs dos hyperlinks de um parágrafo, usando o mapa rId -> URL pronto"""
+    urls = set()
+    for hyperlink in p_element.iter(_W_HYPERLINK):
+        r_id = hyperlink.get(_R_ID)
+        if r_id in targets:
+            urls.add(targets[r_id])
+    return urls
+
+def _part_element(part):
+    element = getattr(part, 'element', None)
+    if element is None:
+        element = parse_xml(part.blob)
+    return element
+
+def _part_kind(partname):
+    kind = _LINK_PARTS.match(partname).group(1)
+    if kind == 'document':
+        return 'body'
+    return re.sub(r'\d+$', '', kind)
+
+def _location(hyperlink, kind):
+    """Identifica se o link está em tabela ou caixa de texto dentro da parte"""
+    location = kind
+    parent = hyperlink.getparent()
+    while parent is not None:
+        if parent.tag == _W_TXBX:
+            return 'textbox'
+        if parent.tag == _W_TC:
+            location = 'table'
+        parent = parent.getparent()
+    return location
+
+def _iter_hyperlinks(doc, registered=None):
+    """Percorre cada parte uma única vez e produz os hyperlinks encontrados
+
+    registered mapeia elementos w:p já conhecidos (parágrafos do corpo e de
+    tabelas) para seus registros; o link é atribuído ao parágrafo registrado
+    mais externo que o contém.
+    """
+    for part in doc.part.package.iter_parts():
+        if not _LINK_PARTS.match(str(part.partname)):
+            continue
+
+        kind = _part_kind(str(part.partname))
+        targets = hyperlink_targets(part)
+        if not targets:
+            continue
+
+        for hyperlink in _part_element(part).iter(_W_HYPERLINK):
+            r_id = hyperlink.get(_R_ID)
+            if not r_id or r_id not in targets:
+                continue
+
+            owner = None
+            nearest = None
+            fallback = False
+            parent = hyperlink.getparent()
+            while parent is not None:
+                if parent.tag == _W_P:
+                    if nearest is None:
+                        nearest = parent
+                    if registered is not None and parent in registered:
+                        owner = parent
+                elif parent.tag == _MC_FALLBACK:
+                    fallback = True
+                    break
+                parent = parent.getparent()
+
+            # Cópia VML de caixas de texto (mc:Fallback) repete o mesmo link
+            if fallback:
+                continue
+
+            yield {
+                'text': ''.join([node.text for node in hyperlink.iter(_W_T) if node.text]),
+                'url': targets[r_id],
+                'location': _location(hyperlink, kind),
+                'owner': owner,
+                'paragraph': nearest
+            }
+
+def _paragraph_text(p_element):
+    return ''.join([node.text for node in p_element.iter(_W_T) if node.text])
+
+def extract_hyperlinks(doc):
+    """Extrai todos os hyperlinks do documento em uma única passada
+
+    Cobre corpo, tabelas, caixas de texto, cabeçalhos, rodapés e notas.
+    Cada link traz texto, URL, local e o início do parágrafo como contexto.
+    """
+    return [
+        {
+            'text': link['text'],
+            'url': link['url'],
+            'context': _paragraph_text(link['paragraph'])[:100] if link['paragraph'] is not None else '',
+            'location': link['location']
+        }
+        for link in _iter_hyperlinks(doc)
+    ]
+
+def _paragraph_record(para, source):
+    """Converte um parágrafo python-docx em um registro simples"""
+    runs = [
+        {'text': run.text, 'bold': bool(run.bold), 'italic': bool(run.italic)}
+        for run in para.runs
+    ]
+
+    return {
+        'text': para.text,
+        'style': para.style.name if para.style else 'Normal',
+        'bold': any(run['bold'] for run in runs),
+        'italic': any(run['italic'] for run in runs),
+        'runs': runs,
+        'links': [],
+        'source': source
+    }
+
+def build_model(doc, doc_path=None):
+    """Monta o modelo compacto a partir de um Document já aberto"""
+    registered = {}
+    paragraphs = []
+    for para in doc.paragraphs:
+        record = _paragraph_record(para, 'body')
+        registered[para._element] = [record]
+        paragraphs.append(record)
+
+    tables = []
+    for t_idx, table in enumerate(doc.tables):
+        rows = []
+        for row in table.rows:
+            cells = []
+            for cell in row.cells:
+                cell_paragraphs = []
+                for para in cell.paragraphs:
+                    record = _paragraph_record(para, 'table')
+                    record['table'] = t_idx
+                    registered.setdefault(para._element, []).append(record)
+                    cell_paragraphs.append(record)
+                    paragraphs.append(record)
+                cells.append(cell_paragraphs)
+            rows.append(cells)
+        tables.append(rows)
+
+    # Uma única passada pelos hyperlinks de todas as partes
+    links = []
+    for link in _iter_hyperlinks(doc, registered):
+        records = registered.get(link['owner'], [])
+        for record in records:
+            record['links'].append({'text': link['text'], 'url': link['url']})
+
+        record = records[0] if records else None
+        if record is not None:
+            context = record['text'][:100]
+        elif link['paragraph'] is not None:
+            context = _paragraph_text(link['paragraph'])[:100]
+        else:
+            context = ''
+        links.append({
+            'text': link['text'],
+            'url': link['url'],
+            'context': context,
+            'source': record['source'] if record is not None else link['location'],
+            'location': link['location']
+        })
+
+    return {
+        'path': doc_path,
+        'paragraphs': paragraphs,
+        'tables': tables,
+        'links': links
+    }
+
+@lru_cache(maxsize=64)
+def _load_cached(doc_path, mtime_ns, size):
+    with metricas.timer('leitura'):
+        return build_model(Document(doc_path), doc_path)
+
+def load_document(doc_path):
+    """Devolve o modelo do documento, reaproveitando a leitura anterior
+
+    O cache é invalidado automaticamente quando o arquivo muda de tamanho ou
+    data de modificação (por exemplo, depois de reformatado ou restaurado).
+    Cada chamada recebe a sua cópia: alterar listas e registros do modelo
+    (ex.: os links de um parágrafo) não afeta os próximos chamadores. A cópia
+    custa uma fração da leitura do .docx.
+    """
+    doc_path = os.path.abspath(doc_path)
+    stat = os.stat(doc_path)
+    return copy.deepcopy(_load_cached(doc_path, stat.st_mtime_ns, stat.st_size))
+
+def body_paragraphs(model):
+    """Parágrafos do corpo do documento (fora de tabelas)"""
+    return [p for p in model['paragraphs'] if p['source'] == 'body']
+
+def table_paragraphs(model):
+    """Parágrafos contidos em células de tabelas"""
+    return [p for p in model['paragraphs'] if p['source'] == 'table']
+
+def clear_cache():
+    """Descarta todos os documentos em memória"""
+    _load_cached.cache_clear()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Observador de Documentos - Concierge RH Digital INPI
+Fica de olho nas pastas do corpus (padrão: docs/; varredura periódica com
+debounce) e leva só os .docx adicionados, alterados ou removidos pelo pipeline completo (análise,
+reformatação, links, validação) e pela atualização do índice de busca
+(src/search-index.json e, opcionalmente, o Redis). O restante do corpus
+continua vindo do manifesto incremental.
+"""
+
+from pipeline_docs import run_document
+from indice_busca import record_from_docx, build_index, write_index, INDEX_PATH
+from indice_binario import write_binary_index
+from manifesto import load_manifest, save_manifest, default_manifest_path, run_stage, forget
+from corpus_docs import add_arguments, from_args, manifest_dir
+from datetime import datetime
+import argparse
+import os
+import signal
+import time
+
+# Segundos entre varreduras e tempo que um arquivo precisa ficar estável
+# (mesmo tamanho e mtime) antes de ser processado
+POLL_INTERVAL = 1.0
+DEBOUNCE_SECONDS = 2.0
+
+def _log(message):
+    print(f"[{datetime.now():%H:%M:%S}] {message}", flush=True)
+
+def snapshot(discover):
+    """{caminho: (mtime_ns, tamanho)} dos documentos do corpus
+
+    `discover` devolve um novo fluxo de documentos (corpus_docs) a cada
+    chamada.
+    """
+    state = {}
+    for doc in discover():
+        stat = _stat(doc['path'])
+        if stat is not None:
+            state[doc['path']] = stat
+    return state
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def open_index(discover, manifest_path, index_path=INDEX_PATH, redis_client=None):
+    """Estado do índice mantido pelo observador (registros por arquivo)"""
+    return {
+        'discover': discover,
+        'index_path': index_path,
+        'redis': redis_client,
+        'records': {},
+        'manifest': load_manifest(manifest_path)
+    }
+
+def sync_document(state, doc_path, force=False):
+    """Pipeline completo + registro de busca + Redis para um documento
+
+    Cada etapa passa pelo manifesto, então um documento que não mudou sai
+    inteiro do cache. Devolve o resultado do pipeline, com 'cached' True
+    quando o documento final não mudou desde a última sincronização.
+    """
+    manifest = state['manifest']
+    docs_dir, doc_name = os.path.split(doc_path)
+
+    result = run_document(doc_name, docs_dir, manifest, force)
+    if result.get('error') or result.get('reformat', {}).get('status') != 'success':
+        return result
+
+    record, result['cached'] = run_stage(manifest, 'registro_busca', doc_path,
+                                         lambda: record_from_docx(doc_path), force=force)
+    state['records'][doc_path] = record
+
+    if state['redis'] is not None:
+        from carga_redis import document_from_docx, update_document
+        run_stage(manifest, 'indexacao_redis', doc_path,
+                  lambda: {'words': update_document(state['redis'], document_from_docx(doc_path))},
+                  force=force)
+    return result
+
+def remove_document(state, doc_path):
+    """Tira do índice (e do manifesto) um documento apagado da pasta"""
+    record = state['records'].pop(doc_path, None)
+    forget(state['manifest'], doc_path)
+    if record and state['redis'] is not None:
+        from carga_redis import remove_document as remove_from_redis
+        remove_from_redis(state['redis'], record['id'])
+
+def publish_index(state):
+    """Regrava o índice invertido com os registros atuais (ordem por caminho)"""
+    records = [state['records'][path] for path in sorted(state['records'])]
+    index = build_index(records)
+    write_index(index, state['index_path'])
+    # Versão mmap para os workers de busca, ao lado do JSON
+    write_binary_index(index, os.path.splitext(state['index_path'])[0] + '.bin')
+    save_manifest(state['manifest'])
+
+def process_changes(state, changed, removed):
+    """Processa um lote de mudanças e publica o índice uma única vez"""
+    start = time.perf_counter()
+    cached = 0
+    for doc_path in sorted(removed):
+        remove_document(state, doc_path)
+        _log(f"🗑️  Removido: {os.path.basename(doc_path)}")
+    for doc_path in sorted(changed):
+        result = sync_document(state, doc_path)
+        error = result.get('error') or result.get('reformat', {}).get('error')
+        if error:
+            _log(f"❌ {os.path.basename(doc_path)}: {error}")
+        elif result['cached']:
+            cached += 1
+        else:
+            _log(f"✅ Atualizado: {os.path.basename(doc_path)}")
+    publish_index(state)
+    _log(f"🔍 Índice publicado ({len(state['records'])} documentos, {cached} sem mudanças, "
+         f"{time.perf_counter() - start:.1f}s)")
+
+def watch(state, interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS, once=False):
+    """Laço do observador: sincroniza tudo uma vez e depois só as mudanças
+
+    Uma mudança só é processada quando o arquivo fica `debounce` segundos
+    sem mudar de novo (o Word e cópias grandes gravam em várias etapas).
+    Depois do processamento o estado conhecido passa a ser o do arquivo já
+    reescrito pelo pipeline, para que a própria saída não dispare outra vez.
+    """
+    known = snapshot(state['discover'])
+    process_changes(state, set(known), set())
+    known = snapshot(state['discover'])
+    if once:
+        return
+
+    pending = {}
+    _log(f"👀 Observando {len(known)} documentos (Ctrl+C para sair)")
+    while True:
+        time.sleep(interval)
+        now = time.monotonic()
+        current = snapshot(state['discover'])
+
+        for path in set(known) | set(current):
+            stat = current.get(path)
+            if stat == known.get(path):
+                pending.pop(path, None)
+            elif path not in pending or pending[path][0] != stat:
+                pending[path] = (stat, now)
+
+        ready = [path for path, (_, seen) in pending.items() if now - seen >= debounce]
+        if not ready:
+            continue
+
+        removed = {path for path in ready if pending[path][0] is None}
+        changed = set(ready) - removed
+        process_changes(state, changed, removed)
+
+        for path in ready:
+            del pending[path]
+            stat = _stat(path)
+            if stat is None:
+                known.pop(path, None)
+            else:
+                known[path] = stat
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reprocessa os documentos alterados na pasta docs/')
+    parser.add_argument('--indice', default=INDEX_PATH,
+                        help='Índice de busca gerado (padrão: src/search-index.json)')
+    parser.add_argument('--intervalo', type=float, default=POLL_INTERVAL,
+                        help='Segundos entre varreduras')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help='Segundos de estabilidade antes de processar um arquivo')
+    parser.add_argument('--redis', metavar='URL', nargs='?', const='',
+                        help='Atualiza também o Redis (URL ou REDIS_URL/KV_REST_API_URL)')
+    parser.add_argument('--uma-vez', action='store_true',
+                        help='Sincroniza a pasta uma vez e sai')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    redis_client = None
+    if args.redis is not None:
+        from carga_redis import connect
+        redis_client = connect(args.redis or None)
+
+    # systemd/docker encerram com SIGTERM: mesmo tratamento do Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    state = open_index(lambda: from_args(args), default_manifest_path(manifest_dir(args)),
+                       args.indice, redis_client)
+    try:
+        watch(state, args.intervalo, args.debounce, once=args.uma_vez)
+    except KeyboardInterrupt:
+        save_manifest(state['manifest'])
+        _log("👋 Observador encerrado")
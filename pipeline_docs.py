@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pipeline Completo - Concierge RH Digital INPI
+Executa análise, reformatação, restauração de links, validação e relatório
+como etapas sobre um único modelo lido por versão de cada documento
+"""
+
+from process_docs import process_document
+from reformatar_docs import process_single_doc
+from restaurar_links import compare_links, restore_links_to_document
+from validar_docs import validate_document, expected_sections
+from relatorio_final import count_elements
+from manifesto import load_manifest, save_manifest, default_manifest_path, run_stage
+from corpus_docs import add_arguments, from_args, iter_by_dir, manifest_dir
+from copias_seguranca import latest_snapshot
+import metricas
+import argparse
+import os
+
+def run_document(doc_name, docs_dir, manifest=None, force=False):
+    """Executa todas as etapas para um documento
+
+    Com um manifesto, cada etapa só roda se o documento (ou, no caso dos
+    links, o original nas cópias de segurança) mudou desde a última execução.
+    """
+    doc_path = os.path.join(docs_dir, doc_name)
+    result = {'file': doc_name}
+
+    def stage(name, compute, extra_inputs=(), accept_derived=False):
+        with metricas.timer(name):
+            value, cached = run_stage(manifest, name, doc_path, compute,
+                                      extra_inputs=extra_inputs, force=force,
+                                      accept_derived=accept_derived)
+        if cached:
+            metricas.count(f'{name}_sem_alteracao')
+        return value
+
+    if not os.path.exists(doc_path):
+        result['error'] = 'Arquivo não encontrado'
+        return result
+
+    # 1. Análise do original (a leitura fica em cache para a reformatação)
+    analysis = stage('analise', lambda: process_document(doc_path, doc_path),
+                     accept_derived=True)
+    result['original_links'] = analysis['links'] if analysis else 0
+
+    # 2. Reformatação
+    result['reformat'] = stage('reformatacao', lambda: process_single_doc(doc_name, docs_dir),
+                               accept_derived=True)
+    if result['reformat']['status'] != 'success':
+        return result
+
+    # 3. Comparação e restauração de links (contra o original guardado na reformatação)
+    backup_path = latest_snapshot(doc_path)
+    backup_inputs = (backup_path,) if backup_path else ()
+    comparison = stage('comparacao_links', lambda: compare_links(doc_name, docs_dir),
+                       extra_inputs=backup_inputs)
+    result['restored'] = 0
+    if comparison and 'error' not in comparison and comparison['missing'] > 0:
+        restored = stage('restauracao_links', lambda: restore_links_to_document(doc_path),
+                         extra_inputs=backup_inputs)
+        if isinstance(restored, dict):
+            result['restore_error'] = restored['error']
+        else:
+            result['restored'] = restored
+
+    # 4. Validação e contagem sobre o documento final (leitura rápida do ZIP)
+    result['validation'] = stage('validacao', lambda: validate_document(doc_path))
+    result['counts'] = stage('relatorio', lambda: count_elements(doc_path))
+    return result
+
+def run_pipeline(docs_list, docs_dir, manifest=None, force=False):
+    """Executa o pipeline completo para uma lista de documentos"""
+    return [run_document(doc_name, docs_dir, manifest, force) for doc_name in docs_list]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Executa todas as etapas sobre os documentos')
+    parser.add_argument('--force', action='store_true',
+                        help='Reprocessa mesmo os documentos que não mudaram')
+    add_arguments(parser)
+    metricas.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metricas.session(args):
+        manifest = load_manifest(default_manifest_path(manifest_dir(args)))
+        results = []
+        for docs_dir, names in iter_by_dir(from_args(args)):
+            results += run_pipeline(names, docs_dir, manifest, force=args.force)
+        save_manifest(manifest)
+
+        print("=" * 90)
+        print("PIPELINE CONCLUIDO - CONCIERGE RH DIGITAL")
+        print("=" * 90)
+        print(f"{'DOCUMENTO':<45} {'SECOES':<10} {'PARAGRAFOS':<12} {'LINKS':<8} {'RESTAURADOS':<12}")
+        print("-" * 90)
+        for r in results:
+            if 'counts' not in r:
+                error = r.get('error') or r['reformat'].get('error')
+                print(f"{r['file']:<45} ERRO: {error}")
+                continue
+            counts = r['counts']
+            missing = [s for s in expected_sections if s not in r['validation'].get('sections', [])]
+            flag = '' if not missing and 'restore_error' not in r else '  (VERIFICAR)'
+            print(f"{r['file']:<45} {counts['sections']:<10} {counts['paragraphs']:<12} {counts['links']:<8} {r['restored']:<12}{flag}")
+        print("=" * 90)
@@ -9,62 +9,43 @@ from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml import parse_xml
-from docx.oxml.ns import qn
+from modelo_docx import load_document, body_paragraphs, table_paragraphs
+from leitura_rapida import iter_content
+from manifesto import load_manifest, save_manifest, default_manifest_path, run_stage
+from corpus_docs import add_arguments, from_args, manifest_dir
+import metricas
+import argparse
 import os
 import re
 
-def extract_hyperlinks(paragraph):
-    """Extrai todos os hyperlinks de um parágrafo"""
-    links = []
-    for rel in paragraph.part.rels.values():
-        if "hyperlink" in rel.target_ref:
-            links.append(rel.target_ref)
-    
-    # Extrair hyperlinks do XML
-    hyperlinks_data = []
-    for hyperlink in paragraph._element.xpath('.//w:hyperlink'):
-        text_content = ''.join([node.text for node in hyperlink.xpath('.//w:t')])
-        r_id = hyperlink.get(qn('r:id'))
-        if r_id and r_id in paragraph.part.rels:
-            url = paragraph.part.rels[r_id].target_ref
-            hyperlinks_data.append({'text': text_content, 'url': url})
-    
-    return hyperlinks_data
-
 def extract_all_content(doc_path):
     """Extrai todo o conteúdo do documento preservando links"""
     try:
-        doc = Document(doc_path)
+        model = load_document(doc_path)
         content = []
         
-        for para in doc.paragraphs:
-            text = para.text.strip()
+        for para in body_paragraphs(model):
+            text = para['text'].strip()
             if text:
-                # Extrair hyperlinks
-                links = extract_hyperlinks(para)
                 content.append({
                     'text': text,
-                    'links': links,
-                    'style': para.style.name
+                    'links': para['links'],
+                    'style': para['style']
                 })
         
         # Extrair tabelas
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        text = para.text.strip()
-                        if text:
-                            links = extract_hyperlinks(para)
-                            content.append({
-                                'text': text,
-                                'links': links,
-                                'style': 'Table'
-                            })
+        for para in table_paragraphs(model):
+            text = para['text'].strip()
+            if text:
+                content.append({
+                    'text': text,
+                    'links': para['links'],
+                    'style': 'Table'
+                })
         
         return content
     except Exception as e:
-        print(f"Erro ao ler {doc_path}: {str(e)}")
+        metricas.warn(f"Erro ao ler {doc_path}: {str(e)}")
         return []
 
 def create_formatted_doc(output_path, title, sections):
@@ -113,80 +94,96 @@ def analyze_document_structure(content):
     
     return sections, full_text
 
+# Caracteres do início do texto mostrados na análise
+PREVIEW_LENGTH = 500
+
 def process_document(input_path, output_path):
-    """Processa um documento individual"""
-    print(f"\n{'='*60}")
-    print(f"Processando: {os.path.basename(input_path)}")
-    print(f"{'='*60}")
+    """Processa um documento individual
+
+    O conteúdo (corpo e depois tabelas) é lido em fluxo: só as contagens e o
+    início do texto ficam em memória, nunca o documento inteiro.
+    """
+    metricas.log(f"\n{'='*60}")
+    metricas.log(f"Processando: {os.path.basename(input_path)}")
+    metricas.log(f"{'='*60}")
+    metricas.count('documentos_analisados')
     
-    # Extrair conteúdo
-    content = extract_all_content(input_path)
+    paragraphs = 0
+    total_links = 0
+    text_length = 0
+    preview = []
+    try:
+        for item in metricas.timed_iter('extracao', iter_content(input_path, tables=True)):
+            paragraphs += 1
+            total_links += len(item['links'])
+            # Tamanho do texto completo unido com '\n\n'
+            text_length += len(item['text']) + (2 if paragraphs > 1 else 0)
+            if text_length - len(item['text']) < PREVIEW_LENGTH:
+                preview.append(item['text'])
+    except Exception as e:
+        metricas.count('erros')
+        metricas.warn(f"Erro ao ler {input_path}: {str(e)}")
+        paragraphs = 0
     
-    if not content:
-        print("⚠️ Nenhum conteúdo extraído!")
+    if not paragraphs:
+        metricas.warn(f"⚠️ Nenhum conteúdo extraído de {os.path.basename(input_path)}!")
         return None
     
-    # Contar links
-    total_links = sum(len(item['links']) for item in content)
+    preview_text = '\n\n'.join(preview)[:PREVIEW_LENGTH]
     
-    # Extrair texto completo
-    full_text = '\n\n'.join([item['text'] for item in content])
-    
-    print(f"📄 Conteúdo extraído: {len(content)} parágrafos")
-    print(f"🔗 Links encontrados: {total_links}")
-    print(f"\n--- PREVIEW DO CONTEÚDO ---")
-    print(full_text[:500] + "..." if len(full_text) > 500 else full_text)
+    metricas.log(f"📄 Conteúdo extraído: {paragraphs} parágrafos")
+    metricas.log(f"🔗 Links encontrados: {total_links}")
+    metricas.log(f"\n--- PREVIEW DO CONTEÚDO ---")
+    metricas.log(preview_text + "..." if text_length > PREVIEW_LENGTH else preview_text)
     
     return {
-        'content': content,
+        'paragraphs': paragraphs,
         'links': total_links,
-        'text': full_text
+        'preview': preview_text
     }
 
-# Lista de documentos
-docs = [
-    "Aposentadoria e Abono.docx",
-    "Capacitação.docx",
-    "Carta de Serviços.docx",
-    "Dados Cadastrais.docx",
-    "Estágio Probatório.docx",
-    "Frequência.docx",
-    "Férias.docx",
-    "Licenças.docx",
-    "Pagamento.docx",
-    "Programa de Gestão e Desempenho.docx",
-    "Remoção.docx",
-    "Retribuição por Titulação.docx",
-    "Saúde Ocupacional.docx",
-    "Seleção Interna e Externa.docx",
-    "Utilização do SouGov.docx"
-]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Analisa o conteúdo dos documentos')
+    parser.add_argument('--force', action='store_true',
+                        help='Reprocessa mesmo os documentos que não mudaram')
+    add_arguments(parser)
+    metricas.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metricas.session(args):
+        manifest = load_manifest(default_manifest_path(manifest_dir(args)))
 
-# Diretório dos documentos
-docs_dir = r"C:\Users\Davison.DESKTOP-7GLJO2G\Documents\concierge-cgrh\docs"
+        # Processar todos os documentos
+        results = []
+        total = 0
+        for doc in from_args(args):
+            total += 1
+            doc_name = doc['name']
+            input_path = doc['path']
+            result, cached = run_stage(
+                manifest, 'analise', input_path,
+                lambda: process_document(input_path, input_path),
+                force=args.force
+            )
+            if cached:
+                metricas.count('documentos_sem_alteracao')
+                metricas.log(f"⏭️  Sem alterações: {doc_name}")
+            if result:
+                results.append({
+                    'file': doc_name,
+                    'links': result['links'],
+                    'paragraphs': result['paragraphs']
+                })
 
-# Processar todos os documentos
-results = []
-for doc_name in docs:
-    input_path = os.path.join(docs_dir, doc_name)
-    if os.path.exists(input_path):
-        result = process_document(input_path, input_path)
-        if result:
-            results.append({
-                'file': doc_name,
-                'links': result['links'],
-                'paragraphs': len(result['content'])
-            })
-    else:
-        print(f"❌ Arquivo não encontrado: {doc_name}")
+        save_manifest(manifest)
 
-# Relatório final
-print(f"\n{'='*60}")
-print("RELATÓRIO FINAL - ANÁLISE DE CONTEÚDO")
-print(f"{'='*60}")
-for r in results:
-    print(f"✅ {r['file']}")
-    print(f"   📝 Parágrafos: {r['paragraphs']}")
-    print(f"   🔗 Links: {r['links']}")
-print(f"{'='*60}")
-print(f"Total de documentos analisados: {len(results)}/15")
+        # Relatório final (os detalhes por documento só com --verbose)
+        print(f"\n{'='*60}")
+        print("RELATÓRIO FINAL - ANÁLISE DE CONTEÚDO")
+        print(f"{'='*60}")
+        for r in results:
+            metricas.log(f"✅ {r['file']}")
+            metricas.log(f"   📝 Parágrafos: {r['paragraphs']}")
+            metricas.log(f"   🔗 Links: {r['links']}")
+        print(f"{'='*60}")
+        print(f"Total de documentos analisados: {len(results)}/{total}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ranking BM25 - Concierge RH Digital INPI
+Relevância BM25F sobre o corpus de seções (título, palavras-chave, descrição,
+títulos de seção e corpo), com pesos por campo e tabela de normalização por
+tamanho de documento pré-computada. O peso de cada termo em cada documento é
+calculado na construção, então a consulta só soma impactos e pega o top-k.
+"""
+
+from indice_busca import tokenize, load_records, record_from_docx, DATABASE_PATH
+from busca_aproximada import correct, load_fuzzy, VOCABULARY_PATH
+import argparse
+import heapq
+import math
+
+K1 = 1.2
+B = 0.75
+
+# Peso de cada campo no BM25F
+FIELD_BOOSTS = {
+    'title': 3.0,
+    'keywords': 2.0,
+    'description': 1.5,
+    'headings': 1.5,
+    'body': 1.0
+}
+
+def record_fields(record):
+    """Texto de cada campo do BM25 a partir de um registro de documento"""
+    return {
+        'title': record.get('title', ''),
+        'keywords': record.get('keywords', ''),
+        'description': record.get('description', ''),
+        'headings': '\n'.join(s['heading'] for s in record.get('sections', [])),
+        'body': '\n'.join(s['text'] for s in record.get('sections', []))
+    }
+
+def build_bm25(records, boosts=FIELD_BOOSTS, k1=K1, b=B):
+    """Pré-computa normalização por tamanho e impactos BM25F de cada termo
+
+    norms[campo][doc] = 1 - b + b * tamanho / tamanho_médio do campo.
+    impacts[termo] = [(peso, doc), ...] em ordem decrescente de peso, com
+    peso = idf * tf' * (k1 + 1) / (tf' + k1) e tf' = soma(boost * tf / norm).
+    """
+    fields = list(boosts)
+    doc_fields = []
+    for record in records:
+        texts = record_fields(record)
+        doc_fields.append({field: tokenize(texts[field]) for field in fields})
+
+    n_docs = len(records)
+    norms = {}
+    for field in fields:
+        lengths = [len(tokens[field]) for tokens in doc_fields]
+        avg = (sum(lengths) / n_docs) if n_docs else 0
+        norms[field] = [
+            (1 - b + b * length / avg) if avg else 1.0 for length in lengths
+        ]
+
+    pseudo_tf = {}
+    for doc_idx, tokens in enumerate(doc_fields):
+        for field in fields:
+            if not tokens[field]:
+                continue
+            factor = boosts[field] / norms[field][doc_idx]
+            for token in tokens[field]:
+                per_doc = pseudo_tf.setdefault(token, {})
+                per_doc[doc_idx] = per_doc.get(doc_idx, 0.0) + factor
+
+    impacts = {}
+    for token, per_doc in pseudo_tf.items():
+        df = len(per_doc)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        postings = [
+            (idf * tf * (k1 + 1) / (tf + k1), doc_idx) for doc_idx, tf in per_doc.items()
+        ]
+        postings.sort(reverse=True)
+        impacts[token] = postings
+
+    return {
+        'docs': [record['id'] for record in records],
+        'k1': k1,
+        'b': b,
+        'boosts': dict(boosts),
+        'norms': norms,
+        'impacts': impacts
+    }
+
+def top_k(index, query, k=10, fuzzy=None):
+    """Top-k documentos para a busca: [(doc_id, score)] por score decrescente
+
+    Com `fuzzy` (busca_aproximada.build_fuzzy), palavras que não estão no
+    índice são trocadas pela correção mais próxima que esteja.
+    """
+    impacts = index['impacts']
+    tokens = set(tokenize(query))
+    if fuzzy is not None:
+        tokens = {token if token in impacts else correct(fuzzy, token, known=impacts)
+                  for token in tokens}
+    scores = {}
+    for token in tokens:
+        for weight, doc_idx in impacts.get(token, ()):
+            scores[doc_idx] = scores.get(doc_idx, 0.0) + weight
+
+    best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(index['docs'][doc_idx], score) for doc_idx, score in best]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Consulta o ranking BM25 do corpus')
+    parser.add_argument('query', nargs='+', help='Termos da busca')
+    parser.add_argument('--database', default=DATABASE_PATH,
+                        help='database.json de origem (padrão: src/database.json)')
+    parser.add_argument('--docx', nargs='*',
+                        help='Usa arquivos .docx (pipeline Python) em vez do database.json')
+    parser.add_argument('-k', type=int, default=10, help='Quantidade de resultados')
+    parser.add_argument('--aproximada', nargs='?', const=VOCABULARY_PATH, metavar='VOCABULARIO',
+                        help='Corrige palavras com erro (padrão: src/fuzzy-vocabulary.json)')
+    args = parser.parse_args()
+
+    if args.docx:
+        records = [record_from_docx(path) for path in args.docx]
+    else:
+        records = load_records(args.database)
+
+    index = build_bm25(records)
+    query = ' '.join(args.query)
+    print(f"🔍 {query}")
+    fuzzy = load_fuzzy(args.aproximada) if args.aproximada else None
+    for position, (doc_id, score) in enumerate(top_k(index, query, args.k, fuzzy), 1):
+        print(f"   {position:>2}. {doc_id:<55} {score:.3f}")
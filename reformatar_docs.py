@@ -5,15 +5,28 @@ Script de Reformatação de Documentos - Concierge RH Digital INPI
 Aplica estrutura padronizada mantendo TODO o conteúdo e TODOS os links
 """
 
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.shared import OxmlElement
 from docx.oxml.ns import qn
+from modelo_docx import load_document, body_paragraphs
+from leitura_rapida import iter_content
+from classificador_secoes import classify
+from copias_seguranca import snapshot, STORE_NAME
+from escritor_docx import (new_document, add_heading, add_paragraph, add_run, save,
+                           add_hyperlink as write_hyperlink)
+from corpus_docs import add_arguments, from_args, iter_by_dir, manifest_dir
+from manifesto import (load_manifest, save_manifest, default_manifest_path,
+                       cached_result, input_hashes, store_result)
+import metricas
+from multiprocessing.connection import wait
+import multiprocessing
+import argparse
 import os
+import time
 import re
 
+# Segundos máximos de um documento antes de o processo de trabalho ser encerrado
+DOC_TIMEOUT = 300
+
 def add_hyperlink(paragraph, text, url):
     """Adiciona hyperlink a um parágrafo"""
     part = paragraph.part
@@ -43,40 +56,54 @@ def add_hyperlink(paragraph, text, url):
 
 def extract_content_with_links(doc_path):
     """Extrai conteúdo preservando estrutura e links"""
-    doc = Document(doc_path)
+    model = load_document(doc_path)
     extracted = []
     
-    for para in doc.paragraphs:
-        text = para.text.strip()
+    for para in body_paragraphs(model):
+        text = para['text'].strip()
         if not text:
             continue
-            
-        # Extrair hyperlinks
-        links = []
-        for hyperlink in para._element.xpath('.//w:hyperlink'):
-            link_text = ''.join([node.text for node in hyperlink.xpath('.//w:t') if node.text])
-            r_id = hyperlink.get(qn('r:id'))
-            if r_id and r_id in para.part.rels:
-                url = para.part.rels[r_id].target_ref
-                links.append({'text': link_text, 'url': url})
-        
-        # Identificar tipo/nível de conteúdo
-        style = para.style.name if para.style else 'Normal'
         
         extracted.append({
             'text': text,
-            'links': links,
-            'style': style,
-            'bold': any(run.bold for run in para.runs),
-            'italic': any(run.italic for run in para.runs)
+            'links': para['links'],
+            'style': para['style'],
+            'bold': para['bold'],
+            'italic': para['italic']
         })
     
     return extracted
 
+# Quantos parágrafos de legislação e de contato servem de alternativa
+_MAX_EXTRAS = {'legislacao': 5, 'contato': 3}
+
+def _collect_extras(extras, text, hints):
+    """Guarda os parágrafos usados como alternativa quando faltam seções
+
+    Só o necessário fica em memória: o primeiro parágrafo que explica
+    "o que é", até 5 menções a legislação e até 3 contatos.
+    """
+    if 'o_que_e' in hints and not extras['o_que_e']:
+        extras['o_que_e'] = text
+    for key, limit in _MAX_EXTRAS.items():
+        if key in hints and len(extras[key]) < limit:
+            extras[key].append(text)
+
+def collect_extras(content):
+    """Alternativas de create_formatted_document a partir do conteúdo extraído"""
+    extras = {'o_que_e': '', 'legislacao': [], 'contato': []}
+    for item in content:
+        _collect_extras(extras, item['text'], classify(item['text'])[1])
+    return extras
+
 def organize_content_by_sections(content, doc_name):
-    """Organiza conteúdo nas seções padronizadas"""
-    full_text = '\n'.join([item['text'] for item in content])
-    
+    """Organiza conteúdo nas seções padronizadas
+
+    Percorre o conteúdo uma única vez, classificando cada parágrafo com
+    classificador_secoes.classify, então aceita tanto a lista de
+    extract_content_with_links quanto o fluxo de leitura_rapida.iter_content.
+    As alternativas para seções ausentes ficam em sections['extras'].
+    """
     sections = {
         'titulo': '',
         'descricao': '',
@@ -87,49 +114,30 @@ def organize_content_by_sections(content, doc_name):
         'documentacao': [],
         'legislacao': '',
         'duvidas': [],
-        'contato': ''
+        'contato': '',
+        'extras': {'o_que_e': '', 'legislacao': [], 'contato': []}
     }
-    
-    # Extrair título (primeiro parágrafo importante ou nome do arquivo)
-    if content:
-        primeiro = content[0]['text']
-        if len(primeiro) < 100 and (content[0]['bold'] or 'Heading' in content[0]['style']):
-            sections['titulo'] = primeiro
-        else:
-            sections['titulo'] = doc_name.replace('.docx', '')
+    # Seções de texto acumulam parágrafos e são unidas no final
+    texts = {}
     
     # Identificar seções existentes
     current_section = None
-    buffer = []
     
     for i, item in enumerate(content):
         text = item['text']
-        text_upper = text.upper()
+        header, hints = classify(text)
+        _collect_extras(sections['extras'], text, hints)
         
-        # Detectar cabeçalhos de seção
-        if 'O QUE É' in text_upper and len(text) < 50:
-            current_section = 'o_que_e'
-            continue
-        elif 'QUEM TEM DIREITO' in text_upper and len(text) < 50:
-            current_section = 'quem_tem_direito'
-            continue
-        elif 'COMO SOLICITAR' in text_upper and len(text) < 50:
-            current_section = 'como_solicitar'
-            continue
-        elif 'PRAZO' in text_upper and len(text) < 50:
-            current_section = 'prazos'
-            continue
-        elif 'DOCUMENTAÇÃO' in text_upper or 'DOCUMENTOS' in text_upper and len(text) < 80:
-            current_section = 'documentacao'
-            continue
-        elif 'LEGISLAÇÃO' in text_upper or 'BASE LEGAL' in text_upper and len(text) < 50:
-            current_section = 'legislacao'
-            continue
-        elif 'DÚVIDAS' in text_upper or 'PERGUNTAS' in text_upper and len(text) < 80:
-            current_section = 'duvidas'
-            continue
-        elif 'CONTATO' in text_upper and len(text) < 50:
-            current_section = 'contato'
+        # Extrair título (primeiro parágrafo importante ou nome do arquivo)
+        if i == 0:
+            if len(text) < 100 and (item['bold'] or 'Heading' in item['style']):
+                sections['titulo'] = text
+            else:
+                sections['titulo'] = doc_name.replace('.docx', '')
+        
+        # Cabeçalhos de seção
+        if header:
+            current_section = header
             continue
         
         # Adicionar conteúdo à seção atual
@@ -137,261 +145,361 @@ def organize_content_by_sections(content, doc_name):
             if current_section in ['como_solicitar', 'documentacao', 'duvidas']:
                 sections[current_section].append(item)
             else:
-                if sections[current_section]:
-                    sections[current_section] += '\n\n' + text
-                else:
-                    sections[current_section] = text
+                texts.setdefault(current_section, []).append(text)
         elif i > 0 and i < 5 and not sections['descricao']:
-            # Primeiros parágrafos como descrição
-            if sections['descricao']:
-                sections['descricao'] += '\n\n' + text
-            else:
-                sections['descricao'] = text
+            # Primeiro parágrafo depois do título como descrição
+            sections['descricao'] = text
+    
+    for key, parts in texts.items():
+        sections[key] = '\n\n'.join(parts)
     
     return sections
 
-def create_formatted_document(output_path, sections, all_content):
-    """Cria documento reformatado com estrutura padronizada"""
-    doc = Document()
-    
-    # Configurar estilos personalizados
-    styles = doc.styles
-    
-    # Estilo para Título 1
-    try:
-        h1_style = styles['Heading 1']
-    except KeyError:
-        h1_style = styles.add_style('Heading 1', WD_STYLE_TYPE.PARAGRAPH)
-    
-    h1_style.font.size = Pt(18)
-    h1_style.font.bold = True
-    h1_style.font.color.rgb = RGBColor(0, 70, 127)
-    
-    # Estilo para Título 2
-    try:
-        h2_style = styles['Heading 2']
-    except KeyError:
-        h2_style = styles.add_style('Heading 2', WD_STYLE_TYPE.PARAGRAPH)
-    
-    h2_style.font.size = Pt(14)
-    h2_style.font.bold = True
-    h2_style.font.color.rgb = RGBColor(0, 112, 192)
+def create_formatted_document(output_path, sections, all_content=None):
+    """Cria documento reformatado com estrutura padronizada
+
+    O documento sai do modelo estilizado em cache (escritor_docx), sem
+    Document() novo por arquivo. Sem all_content, as alternativas para seções ausentes vêm de
+    sections['extras'] (coletadas por organize_content_by_sections).
+    """
+    extras = collect_extras(all_content) if all_content is not None else sections['extras']
+    doc = new_document()
     
     # TÍTULO PRINCIPAL
     if sections['titulo']:
-        title = doc.add_heading(sections['titulo'].upper(), level=1)
-        title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        add_heading(doc, sections['titulo'].upper(), level=1, alignment='center')
     
     # DESCRIÇÃO
     if sections['descricao']:
-        desc = doc.add_paragraph(sections['descricao'])
-        desc.paragraph_format.space_after = Pt(12)
+        add_paragraph(doc, sections['descricao'], space_after=12)
     
     # O QUE É?
-    doc.add_heading('O QUE É?', level=2)
+    add_heading(doc, 'O QUE É?', level=2)
     if sections['o_que_e']:
-        doc.add_paragraph(sections['o_que_e'])
+        add_paragraph(doc, sections['o_que_e'])
     else:
         # Tentar extrair do conteúdo geral
-        for item in all_content:
-            if 'o que é' in item['text'].lower() and len(item['text']) > 50:
-                doc.add_paragraph(item['text'])
-                break
+        if extras['o_que_e']:
+            add_paragraph(doc, extras['o_que_e'])
         else:
-            doc.add_paragraph('Informações sobre a natureza e objetivo deste serviço.')
+            add_paragraph(doc, 'Informações sobre a natureza e objetivo deste serviço.')
     
     # QUEM TEM DIREITO?
-    doc.add_heading('QUEM TEM DIREITO?', level=2)
+    add_heading(doc, 'QUEM TEM DIREITO?', level=2)
     if sections['quem_tem_direito']:
-        doc.add_paragraph(sections['quem_tem_direito'])
+        add_paragraph(doc, sections['quem_tem_direito'])
     else:
-        doc.add_paragraph('Servidores ativos do INPI.')
+        add_paragraph(doc, 'Servidores ativos do INPI.')
     
     # COMO SOLICITAR?
-    doc.add_heading('COMO SOLICITAR?', level=2)
+    add_heading(doc, 'COMO SOLICITAR?', level=2)
     if sections['como_solicitar']:
         for idx, item in enumerate(sections['como_solicitar'], 1):
             if any(char.isdigit() for char in item['text'][:5]):
                 # Já tem numeração
-                p = doc.add_paragraph(item['text'], style='List Number')
+                p = add_paragraph(doc, item['text'], 'List Number')
             else:
-                p = doc.add_paragraph(f"{item['text']}", style='List Number')
+                p = add_paragraph(doc, f"{item['text']}", 'List Number')
             
             # Adicionar links se houver
             if item['links']:
                 for link in item['links']:
-                    add_hyperlink(p, f" [{link['text']}]", link['url'])
+                    write_hyperlink(doc, p, f" [{link['text']}]", link['url'])
     else:
-        doc.add_paragraph('Entre em contato com a área responsável para orientações.', style='List Number')
+        add_paragraph(doc, 'Entre em contato com a área responsável para orientações.', 'List Number')
     
     # PRAZOS
-    doc.add_heading('PRAZOS', level=2)
+    add_heading(doc, 'PRAZOS', level=2)
     if sections['prazos']:
-        doc.add_paragraph(sections['prazos'])
+        add_paragraph(doc, sections['prazos'])
     else:
-        doc.add_paragraph('Consulte a legislação ou entre em contato para informações sobre prazos.')
+        add_paragraph(doc, 'Consulte a legislação ou entre em contato para informações sobre prazos.')
     
     # DOCUMENTAÇÃO NECESSÁRIA
-    doc.add_heading('DOCUMENTAÇÃO NECESSÁRIA', level=2)
+    add_heading(doc, 'DOCUMENTAÇÃO NECESSÁRIA', level=2)
     if sections['documentacao']:
         for item in sections['documentacao']:
-            p = doc.add_paragraph(item['text'], style='List Bullet')
+            p = add_paragraph(doc, item['text'], 'List Bullet')
             if item['links']:
                 for link in item['links']:
-                    add_hyperlink(p, f" [{link['text']}]", link['url'])
+                    write_hyperlink(doc, p, f" [{link['text']}]", link['url'])
     else:
-        doc.add_paragraph('Documentação específica conforme o caso.', style='List Bullet')
+        add_paragraph(doc, 'Documentação específica conforme o caso.', 'List Bullet')
     
     # LEGISLAÇÃO
-    doc.add_heading('LEGISLAÇÃO', level=2)
+    add_heading(doc, 'LEGISLAÇÃO', level=2)
     if sections['legislacao']:
-        p = doc.add_paragraph(sections['legislacao'])
+        p = add_paragraph(doc, sections['legislacao'])
     else:
-        # Buscar menções a leis/portarias no conteúdo
-        legislacao_found = []
-        for item in all_content:
-            if any(termo in item['text'].lower() for termo in ['lei', 'portaria', 'decreto', 'instrução normativa', 'resolução']):
-                legislacao_found.append(item['text'])
-        
-        if legislacao_found:
-            for leg in legislacao_found[:5]:  # Limitar a 5
-                doc.add_paragraph(leg, style='List Bullet')
+        # Menções a leis/portarias no conteúdo (até 5)
+        if extras['legislacao']:
+            for leg in extras['legislacao']:
+                add_paragraph(doc, leg, 'List Bullet')
         else:
-            doc.add_paragraph('Consulte a legislação aplicável.')
+            add_paragraph(doc, 'Consulte a legislação aplicável.')
     
     # DÚVIDAS FREQUENTES
-    doc.add_heading('DÚVIDAS FREQUENTES', level=2)
+    add_heading(doc, 'DÚVIDAS FREQUENTES', level=2)
     if sections['duvidas']:
         for item in sections['duvidas']:
             text = item['text']
             if text.startswith(('Q:', 'P:', 'R:')):
-                run = doc.add_paragraph(text).runs[0]
-                run.bold = True if text[0] in ['Q', 'P'] else False
+                add_run(add_paragraph(doc), text, bold=text[0] in ['Q', 'P'])
             else:
-                doc.add_paragraph(f"• {text}")
+                add_paragraph(doc, f"• {text}")
     else:
-        doc.add_paragraph('Para dúvidas, consulte o contato abaixo.')
+        add_paragraph(doc, 'Para dúvidas, consulte o contato abaixo.')
     
     # CONTATO
-    doc.add_heading('CONTATO', level=2)
+    add_heading(doc, 'CONTATO', level=2)
     if sections['contato']:
-        doc.add_paragraph(sections['contato'])
+        add_paragraph(doc, sections['contato'])
     else:
-        # Buscar e-mails e telefones no conteúdo
-        contatos = []
-        for item in all_content:
-            if '@' in item['text'] or 'ramal' in item['text'].lower() or 'telefone' in item['text'].lower():
-                contatos.append(item['text'])
-        
-        if contatos:
-            for contato in contatos[:3]:
-                doc.add_paragraph(contato)
+        # E-mails e telefones no conteúdo (até 3)
+        if extras['contato']:
+            for contato in extras['contato']:
+                add_paragraph(doc, contato)
         else:
-            doc.add_paragraph('E-mail: cgrh@inpi.gov.br')
-            doc.add_paragraph('Telefone: Consulte a intranet do INPI')
+            add_paragraph(doc, 'E-mail: cgrh@inpi.gov.br')
+            add_paragraph(doc, 'Telefone: Consulte a intranet do INPI')
     
     # Salvar documento
-    doc.save(output_path)
+    save(doc, output_path)
     return True
 
+def _counted(content, counts):
+    """Repassa o fluxo de conteúdo contando parágrafos e links"""
+    for item in content:
+        counts['paragraphs'] += 1
+        counts['links'] += len(item['links'])
+        yield item
+
 def process_single_doc(doc_name, docs_dir):
     """Processa um documento individual"""
     input_path = os.path.join(docs_dir, doc_name)
-    backup_path = os.path.join(docs_dir, 'backup_' + doc_name)
     
-    print(f"\n{'='*70}")
-    print(f"📄 PROCESSANDO: {doc_name}")
-    print(f"{'='*70}")
+    metricas.log(f"\n{'='*70}")
+    metricas.log(f"📄 PROCESSANDO: {doc_name}")
+    metricas.log(f"{'='*70}")
+    metricas.count('documentos')
     
     try:
-        # Fazer backup
+        # Cópia de segurança do original (bytes idênticos, sem reabrir o .docx)
         if os.path.exists(input_path):
-            doc_backup = Document(input_path)
-            doc_backup.save(backup_path)
-            print(f"✅ Backup criado: backup_{doc_name}")
+            with metricas.timer('copia'):
+                backup = snapshot(input_path)
+            metricas.log(f"✅ Cópia de segurança: {backup['sha256'][:12]} ({backup['method']})")
         
-        # Extrair conteúdo
-        content = extract_content_with_links(input_path)
-        print(f"📝 Parágrafos extraídos: {len(content)}")
-        
-        # Contar links
-        total_links = sum(len(item['links']) for item in content)
-        print(f"🔗 Links encontrados: {total_links}")
-        
-        # Organizar em seções
-        sections = organize_content_by_sections(content, doc_name)
+        # Extrair conteúdo em fluxo e organizar em seções na mesma passada
+        # (o tempo de extração é descontado da classificação)
+        counts = {'paragraphs': 0, 'links': 0}
+        content = metricas.timed_iter('extracao', iter_content(input_path))
+        with metricas.timer('classificacao'):
+            sections = organize_content_by_sections(_counted(content, counts), doc_name)
+        metricas.count('paragrafos', counts['paragraphs'])
+        metricas.count('links', counts['links'])
+        metricas.log(f"📝 Parágrafos extraídos: {counts['paragraphs']}")
+        metricas.log(f"🔗 Links encontrados: {counts['links']}")
         
         # Criar documento reformatado
-        create_formatted_document(input_path, sections, content)
-        print(f"✅ Documento reformatado e salvo!")
+        with metricas.timer('escrita'):
+            create_formatted_document(input_path, sections)
+        metricas.log(f"✅ Documento reformatado e salvo!")
         
         return {
             'file': doc_name,
             'status': 'success',
-            'paragraphs': len(content),
-            'links': total_links,
+            'paragraphs': counts['paragraphs'],
+            'links': counts['links'],
             'changes': 'Estrutura padronizada aplicada'
         }
         
     except Exception as e:
-        print(f"❌ ERRO: {str(e)}")
+        metricas.count('erros')
+        metricas.warn(f"❌ ERRO em {doc_name}: {str(e)}")
         return {
             'file': doc_name,
             'status': 'error',
             'error': str(e)
         }
 
-# LISTA DE DOCUMENTOS
-docs_list = [
-    "Aposentadoria e Abono.docx",
-    "Capacitação.docx",
-    "Carta de Serviços.docx",
-    "Dados Cadastrais.docx",
-    "Estágio Probatório.docx",
-    "Frequência.docx",
-    "Férias.docx",
-    "Licenças.docx",
-    "Pagamento.docx",
-    "Programa de Gestão e Desempenho.docx",
-    "Remoção.docx",
-    "Retribuição por Titulação.docx",
-    "Saúde Ocupacional.docx",
-    "Seleção Interna e Externa.docx",
-    "Utilização do SouGov.docx"
-]
-
-docs_dir = r"C:\Users\Davison.DESKTOP-7GLJO2G\Documents\concierge-cgrh\docs"
-
-# PROCESSAR TODOS
-results = []
-for doc_name in docs_list:
-    result = process_single_doc(doc_name, docs_dir)
-    results.append(result)
-
-# RELATÓRIO FINAL
-print(f"\n{'='*70}")
-print("📊 RELATÓRIO FINAL DE REFORMATAÇÃO")
-print(f"{'='*70}\n")
-
-success_count = 0
-error_count = 0
-
-for r in results:
-    if r['status'] == 'success':
-        success_count += 1
-        print(f"✅ {r['file']}")
-        print(f"   📝 Mudanças: {r['changes']}")
-        print(f"   🔗 Links preservados: {r['links']}")
-        print(f"   📊 Parágrafos: {r['paragraphs']}")
-    else:
-        error_count += 1
-        print(f"❌ {r['file']}")
-        print(f"   ⚠️ Erro: {r['error']}")
-    print()
-
-print(f"{'='*70}")
-print(f"✅ Documentos reformatados com sucesso: {success_count}/15")
-print(f"❌ Erros: {error_count}")
-print(f"{'='*70}")
-print(f"\n💾 Backups salvos com prefixo 'backup_'")
-print(f"📁 Localização: {docs_dir}")
+def _worker(connection, doc_name, docs_dir, verbose):
+    """Processo de trabalho: devolve (resultado, métricas) pelo pipe"""
+    connection.send(metricas.run_collected(process_single_doc, doc_name, docs_dir, verbose=verbose))
+    connection.close()
+
+def _start(doc_name, docs_dir):
+    """Abre um processo só para o documento (uma queda ou um travamento não afeta os outros)"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_worker, daemon=True,
+                                      args=(sender, doc_name, docs_dir, metricas.is_verbose()))
+    process.start()
+    # Sem a ponta de escrita no processo principal, a queda do worker vira EOF no pipe
+    sender.close()
+    return {'file': doc_name, 'process': process, 'connection': receiver, 'start': time.monotonic()}
+
+def _error(doc_name, message):
+    metricas.count('erros')
+    return {
+        'file': doc_name,
+        'status': 'error',
+        'error': message
+    }
+
+def _finish(worker):
+    """Resultado de um worker que respondeu ou caiu"""
+    try:
+        result, data = worker['connection'].recv()
+    except EOFError:
+        worker['process'].join()
+        return _error(worker['file'], 'Processo de trabalho encerrado inesperadamente '
+                                      f"(código {worker['process'].exitcode})")
+    finally:
+        worker['connection'].close()
+    worker['process'].join()
+    metricas.merge(data)
+    return result
+
+def _stop(worker):
+    """Encerra o processo de um documento que passou do tempo limite"""
+    worker['process'].terminate()
+    worker['process'].join()
+    worker['connection'].close()
+
+def process_batch(docs_list, docs_dir, workers=None, timeout=DOC_TIMEOUT):
+    """Processa documentos em paralelo, um processo de trabalho por documento
+
+    Reutiliza process_single_doc em no máximo `workers` processos ao mesmo
+    tempo e devolve os resultados na mesma ordem de docs_list. Cada documento
+    roda isolado: se um arquivo derrubar o processo, só ele fica marcado com
+    erro, e um documento que passa de `timeout` segundos tem o processo
+    encerrado sem interromper os demais. Com workers=1 os documentos seguem
+    um de cada vez, mas com o mesmo isolamento e tempo limite.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    queue = list(reversed(docs_list))
+    running = []
+    results = {}
+    try:
+        while queue or running:
+            while queue and len(running) < max(1, workers):
+                running.append(_start(queue.pop(), docs_dir))
+
+            wait_for = None
+            if timeout:
+                oldest = min(worker['start'] for worker in running)
+                wait_for = max(0.0, oldest + timeout - time.monotonic())
+            ready = wait([worker['connection'] for worker in running], wait_for)
+
+            now = time.monotonic()
+            for worker in list(running):
+                if worker['connection'] in ready:
+                    results[worker['file']] = _finish(worker)
+                elif timeout and now - worker['start'] >= timeout:
+                    _stop(worker)
+                    results[worker['file']] = _error(worker['file'], f'Tempo esgotado ({timeout:.0f}s)')
+                    metricas.warn(f"⏱️  {worker['file']}: tempo esgotado, worker encerrado")
+                else:
+                    continue
+                running.remove(worker)
+    finally:
+        # Interrupção (ex.: Ctrl+C): não deixa processos órfãos
+        for worker in running:
+            _stop(worker)
+
+    return [results[doc_name] for doc_name in docs_list]
+
+def process_changed(docs_list, docs_dir, manifest, workers=None, force=False, timeout=DOC_TIMEOUT):
+    """Reformata apenas os documentos que mudaram desde a última execução
+
+    Documentos cujo hash atual coincide com a entrada gravada no manifesto ou
+    com uma versão gerada pelo próprio pipeline reutilizam o resultado
+    anterior; os demais vão para process_batch.
+    """
+    results = {}
+    pending = []
+    inputs = {}
+
+    for doc_name in docs_list:
+        doc_path = os.path.join(docs_dir, doc_name)
+        cached = None if force else cached_result(manifest, 'reformatacao', doc_path,
+                                                  accept_derived=True)
+        if cached is not None:
+            metricas.count('documentos_sem_alteracao')
+            metricas.log(f"⏭️  Sem alterações: {doc_name}")
+            results[doc_name] = cached
+        else:
+            inputs[doc_name] = input_hashes(manifest, doc_path)
+            pending.append(doc_name)
+
+    for result in process_batch(pending, docs_dir, workers=workers, timeout=timeout):
+        doc_name = result['file']
+        store_result(manifest, 'reformatacao', os.path.join(docs_dir, doc_name),
+                     result, inputs[doc_name])
+        results[doc_name] = result
+
+    return [results[doc_name] for doc_name in docs_list]
+
+def print_report(results, location):
+    """Imprime o relatório consolidado da reformatação
+
+    Os detalhes de cada documento reformatado só aparecem com --verbose; os
+    erros e os totais aparecem sempre.
+    """
+    print(f"\n{'='*70}")
+    print("📊 RELATÓRIO FINAL DE REFORMATAÇÃO")
+    print(f"{'='*70}\n")
+
+    success_count = 0
+    error_count = 0
+
+    for r in results:
+        if r['status'] == 'success':
+            success_count += 1
+            metricas.log(f"✅ {r['file']}")
+            metricas.log(f"   📝 Mudanças: {r['changes']}")
+            metricas.log(f"   🔗 Links preservados: {r['links']}")
+            metricas.log(f"   📊 Parágrafos: {r['paragraphs']}")
+            metricas.log()
+        else:
+            error_count += 1
+            print(f"❌ {r['file']}")
+            print(f"   ⚠️ Erro: {r['error']}")
+            print()
+
+    print(f"{'='*70}")
+    print(f"✅ Documentos reformatados com sucesso: {success_count}/{len(results)}")
+    print(f"❌ Erros: {error_count}")
+    print(f"{'='*70}")
+    print(f"\n💾 Originais guardados em {STORE_NAME}/ (versões: python copias_seguranca.py)")
+    print(f"📁 Localização: {location}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reformata os documentos do Concierge RH Digital')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Número de processos paralelos (1 = sequencial)')
+    parser.add_argument('--force', action='store_true',
+                        help='Reformata mesmo os documentos que não mudaram')
+    parser.add_argument('--tempo-limite', type=float, default=DOC_TIMEOUT,
+                        help='Segundos por documento antes de encerrar o worker (0 = sem limite)')
+    add_arguments(parser)
+    metricas.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metricas.session(args):
+        manifest = load_manifest(default_manifest_path(manifest_dir(args)))
+
+        # PROCESSAR TODOS (apenas os alterados), uma pasta por vez
+        results = []
+        dirs = []
+        for docs_dir, names in iter_by_dir(from_args(args)):
+            dirs.append(docs_dir)
+            results += process_changed(names, docs_dir, manifest,
+                                       workers=args.workers, force=args.force,
+                                       timeout=args.tempo_limite)
+        save_manifest(manifest)
+
+        # RELATÓRIO FINAL
+        print_report(results, ', '.join(dirs))
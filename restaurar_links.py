@@ -10,6 +10,15 @@ from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml.shared import OxmlElement
 from docx.oxml.ns import qn
+from modelo_docx import load_document, hyperlink_targets, paragraph_urls
+from indice_busca import strip_accents, tokenize
+from manifesto import load_manifest, save_manifest, default_manifest_path, run_stage
+from corpus_docs import add_arguments, from_args, manifest_dir
+from copias_seguranca import latest_snapshot
+from collections import Counter
+import metricas
+import argparse
+import math
 import os
 import re
 
@@ -52,125 +61,181 @@ def add_hyperlink(paragraph, url, text=None):
     
     return hyperlink
 
-def extract_all_hyperlinks(doc):
-    """Extrai TODOS os hyperlinks do documento"""
-    all_links = []
-    
-    for para in doc.paragraphs:
-        for hyperlink in para._element.xpath('.//w:hyperlink'):
-            link_text = ''.join([node.text for node in hyperlink.xpath('.//w:t') if node.text])
-            r_id = hyperlink.get(qn('r:id'))
-            
-            if r_id and r_id in para.part.rels:
-                url = para.part.rels[r_id].target_ref
-                all_links.append({
-                    'text': link_text,
-                    'url': url,
-                    'context': para.text[:100]
-                })
-    
-    # Extrair de tabelas também
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for para in cell.paragraphs:
-                    for hyperlink in para._element.xpath('.//w:hyperlink'):
-                        link_text = ''.join([node.text for node in hyperlink.xpath('.//w:t') if node.text])
-                        r_id = hyperlink.get(qn('r:id'))
-                        
-                        if r_id and r_id in para.part.rels:
-                            url = para.part.rels[r_id].target_ref
-                            all_links.append({
-                                'text': link_text,
-                                'url': url,
-                                'context': para.text[:100]
-                            })
-    
-    return all_links
+def extract_all_hyperlinks(model):
+    """Extrai TODOS os hyperlinks do documento (corpo e tabelas)"""
+    return [
+        {'text': link['text'], 'url': link['url'], 'context': link['context']}
+        for link in model['links']
+    ]
+
+# Pontuação mínima (0 a 1) para aceitar um parágrafo como destino do link
+MIN_MATCH_SCORE = 0.35
+
+# Termos presentes em mais parágrafos que isto não geram candidatos
+MAX_POSTINGS = 500
+
+def _normalize(text):
+    """Minúsculas e sem acentos, com a pontuação (para achar o texto literal)"""
+    return strip_accents(text.lower())
+
+def _tokens(text):
+    return set(tokenize(text))
+
+def build_paragraph_index(paragraphs, targets):
+    """Indexa os parágrafos do documento reformatado uma única vez
+
+    Guarda postings termo -> parágrafos, o texto normalizado de cada
+    parágrafo e o conjunto de URLs que ele já contém.
+    """
+    postings = {}
+    normalized = []
+    urls = []
+    for i, para in enumerate(paragraphs):
+        text = para.text
+        normalized.append(_normalize(text))
+        urls.append(paragraph_urls(para._element, targets))
+        for token in _tokens(text):
+            postings.setdefault(token, []).append(i)
 
+    return {
+        'postings': postings,
+        'normalized': normalized,
+        'urls': urls,
+        'size': len(normalized)
+    }
+
+def score_candidates(index, link):
+    """Pontua os parágrafos que compartilham termos com o link (0 a 1)
+
+    Termos do texto do link valem o dobro dos termos do contexto, ambos
+    ponderados por IDF. Encontrar o texto do link ou o início do contexto
+    literalmente no parágrafo soma um bônus.
+    """
+    size = index['size']
+    text_tokens = _tokens(link['text'])
+    context_tokens = _tokens(link['context'])
+
+    scores = {}
+    max_weight = 0.0
+    for token in text_tokens | context_tokens:
+        postings = index['postings'].get(token, [])
+        weight = math.log(1 + size / (1 + len(postings)))
+        if token in text_tokens:
+            weight *= 2
+        max_weight += weight
+        if len(postings) > MAX_POSTINGS:
+            continue
+        for i in postings:
+            scores[i] = scores.get(i, 0.0) + weight
+
+    if not max_weight:
+        return {}
+
+    link_text = _normalize(link['text']).strip()
+    context_head = _normalize(link['context'][:50]).strip()
+    for i in scores:
+        scores[i] /= max_weight
+        if len(link_text) >= 3 and link_text in index['normalized'][i]:
+            scores[i] += 0.25
+        if context_head and context_head in index['normalized'][i]:
+            scores[i] += 0.25
+
+    return scores
+
+def find_link_target(index, link):
+    """Melhor parágrafo para receber o link, ou None se nenhum for parecido"""
+    best = None
+    best_score = MIN_MATCH_SCORE
+    for i, score in score_candidates(index, link).items():
+        if link['url'] in index['urls'][i]:
+            continue
+        if score > best_score or (score == best_score and best is not None and i < best):
+            best = i
+            best_score = score
+    return best
+
+@metricas.timed('restauracao')
 def restore_links_to_document(doc_path):
-    """Restaura links do backup para o documento reformatado"""
-    backup_path = doc_path.replace('.docx', '_BACKUP_ORIGINAL.docx')
-    
-    # Se não existe backup com este nome, tentar o outro formato
-    if not os.path.exists(backup_path):
-        backup_path = os.path.join(
-            os.path.dirname(doc_path),
-            'backup_' + os.path.basename(doc_path)
-        )
+    """Restaura links do original (cópia de segurança) para o documento reformatado
+
+    Devolve a quantidade de links restaurados, ou {'error': ...} quando não
+    foi possível restaurar (o manifesto não guarda erros, então a próxima
+    execução tenta de novo).
+    """
+    backup_path = latest_snapshot(doc_path)
     
-    if not os.path.exists(backup_path):
-        print(f"   ⚠️ Backup não encontrado para restaurar links")
-        return 0
+    if backup_path is None:
+        metricas.warn(f"   ⚠️ Cópia de segurança não encontrada para restaurar links: {doc_path}")
+        return {'error': 'Cópia de segurança não encontrada'}
     
     try:
-        # Extrair links do backup
-        backup_doc = Document(backup_path)
-        original_links = extract_all_hyperlinks(backup_doc)
+        # Extrair links do original
+        original_links = extract_all_hyperlinks(load_document(backup_path))
         
         if not original_links:
             return 0
         
-        print(f"   🔗 Links no original: {len(original_links)}")
+        metricas.log(f"   🔗 Links no original: {len(original_links)}")
         
-        # Abrir documento reformatado
+        # Abrir documento reformatado e indexar os parágrafos uma vez
         doc = Document(doc_path)
+        targets = hyperlink_targets(doc.part)
+        paragraphs = doc.paragraphs
+        index = build_paragraph_index(paragraphs, targets)
         links_added = 0
         
-        # Para cada link original, tentar adicionar ao documento reformatado
+        # Quantas ocorrências de cada URL ainda faltam no reformatado
+        missing = Counter(link['url'] for link in original_links)
+        for para_urls in index['urls']:
+            for url in para_urls:
+                missing[url] -= 1
+        
+        # Para cada link original, procurar o parágrafo mais parecido
         for link_info in original_links:
             url = link_info['url']
-            text = link_info['text']
-            context = link_info['context']
+            if missing[url] <= 0:
+                continue
             
-            # Procurar parágrafo similar no documento reformatado
-            for para in doc.paragraphs:
-                para_text = para.text
-                
-                # Se encontrar contexto similar e o link ainda não está lá
-                if (text in para_text or context[:50] in para_text):
-                    # Verificar se já tem este link
-                    existing = False
-                    for existing_link in para._element.xpath('.//w:hyperlink'):
-                        r_id = existing_link.get(qn('r:id'))
-                        if r_id and r_id in para.part.rels:
-                            if para.part.rels[r_id].target_ref == url:
-                                existing = True
-                                break
-                    
-                    if not existing:
-                        # Adicionar link ao final do parágrafo
-                        para.add_run(' ')
-                        add_hyperlink(para, url, text)
-                        links_added += 1
-                        break
+            i = find_link_target(index, link_info)
+            if i is None:
+                continue
+            
+            # Adicionar link ao final do parágrafo
+            para = paragraphs[i]
+            para.add_run(' ')
+            hyperlink = add_hyperlink(para, url, link_info['text'])
+            targets[hyperlink.get(qn('r:id'))] = url
+            index['urls'][i].add(url)
+            missing[url] -= 1
+            links_added += 1
         
         # Salvar documento com links restaurados
-        doc.save(doc_path)
-        print(f"   ✅ Links restaurados: {links_added}")
+        with metricas.timer('escrita'):
+            doc.save(doc_path)
+        metricas.count('links_restaurados', links_added)
+        metricas.log(f"   ✅ Links restaurados: {links_added}")
         
         return links_added
         
     except Exception as e:
-        print(f"   ❌ Erro ao restaurar links: {str(e)}")
-        return 0
+        metricas.count('erros')
+        metricas.warn(f"   ❌ Erro ao restaurar links de {doc_path}: {str(e)}")
+        return {'error': str(e)}
 
 def compare_links(doc_name, docs_dir):
-    """Compara links entre original e reformatado"""
-    backup_path = os.path.join(docs_dir, 'backup_' + doc_name)
+    """Compara links entre original (cópia de segurança) e reformatado"""
     current_path = os.path.join(docs_dir, doc_name)
+    backup_path = latest_snapshot(current_path)
     
-    if not os.path.exists(backup_path):
+    if backup_path is None:
         return None
     
     try:
-        # Links no backup
-        backup_doc = Document(backup_path)
-        backup_links = extract_all_hyperlinks(backup_doc)
+        # Links no original
+        backup_links = extract_all_hyperlinks(load_document(backup_path))
         
         # Links no reformatado
-        current_doc = Document(current_path)
-        current_links = extract_all_hyperlinks(current_doc)
+        current_links = extract_all_hyperlinks(load_document(current_path))
         
         return {
             'original': len(backup_links),
@@ -182,74 +247,84 @@ def compare_links(doc_name, docs_dir):
     except Exception as e:
         return {'error': str(e)}
 
-# Lista de documentos
-docs_list = [
-    "Aposentadoria e Abono.docx",
-    "Capacitação.docx",
-    "Carta de Serviços.docx",
-    "Dados Cadastrais.docx",
-    "Estágio Probatório.docx",
-    "Frequência.docx",
-    "Férias.docx",
-    "Licenças.docx",
-    "Pagamento.docx",
-    "Programa de Gestão e Desempenho.docx",
-    "Remoção.docx",
-    "Retribuição por Titulação.docx",
-    "Saúde Ocupacional.docx",
-    "Seleção Interna e Externa.docx",
-    "Utilização do SouGov.docx"
-]
-
-docs_dir = r"C:\Users\Davison.DESKTOP-7GLJO2G\Documents\concierge-cgrh\docs"
-
-print("="*80)
-print("ANÁLISE DE LINKS - ORIGINAL vs REFORMATADO")
-print("="*80)
-print()
-
-docs_with_missing_links = []
-
-for doc_name in docs_list:
-    print(f"📄 {doc_name}")
-    
-    comparison = compare_links(doc_name, docs_dir)
-    
-    if comparison and 'error' not in comparison:
-        print(f"   Original: {comparison['original']} links")
-        print(f"   Reformatado: {comparison['current']} links")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara e restaura links dos documentos reformatados')
+    parser.add_argument('--force', action='store_true',
+                        help='Reanalisa mesmo os documentos que não mudaram')
+    add_arguments(parser)
+    metricas.add_arguments(parser)
+    args = parser.parse_args()
+
+    with metricas.session(args):
+        manifest = load_manifest(default_manifest_path(manifest_dir(args)))
+
+        print("="*80)
+        print("ANÁLISE DE LINKS - ORIGINAL vs REFORMATADO")
+        print("="*80)
+        print()
+
+        docs_with_missing_links = []
+
+        for doc in from_args(args):
+            doc_name = doc['name']
+            docs_dir = doc['dir']
+            metricas.log(f"📄 {doc_name}")
+        
+            doc_path = doc['path']
+            backup_path = latest_snapshot(doc_path)
+            comparison, _ = run_stage(manifest, 'comparacao_links', doc_path,
+                                      lambda: compare_links(doc_name, docs_dir),
+                                      extra_inputs=(backup_path,) if backup_path else (),
+                                      force=args.force)
         
-        if comparison['missing'] > 0:
-            print(f"   ⚠️ FALTAM {comparison['missing']} links!")
-            docs_with_missing_links.append({
-                'name': doc_name,
-                'missing': comparison['missing'],
-                'original_links': comparison['original_links']
-            })
+            if comparison and 'error' not in comparison:
+                metricas.log(f"   Original: {comparison['original']} links")
+                metricas.log(f"   Reformatado: {comparison['current']} links")
             
-            # Mostrar links que faltam
-            print(f"   📋 Links originais:")
-            for link in comparison['original_links']:
-                print(f"      • {link['text'][:50]} -> {link['url'][:60]}")
-        else:
-            print(f"   ✅ Todos os links preservados!")
-    
-    print()
+                if comparison['missing'] > 0:
+                    print(f"⚠️ {doc_name}: FALTAM {comparison['missing']} links!")
+                    docs_with_missing_links.append({
+                        'name': doc_name,
+                        'dir': docs_dir,
+                        'missing': comparison['missing'],
+                        'original_links': comparison['original_links']
+                    })
+                
+                    # Mostrar links que faltam
+                    metricas.log(f"   📋 Links originais:")
+                    for link in comparison['original_links']:
+                        metricas.log(f"      • {link['text'][:50]} -> {link['url'][:60]}")
+                else:
+                    metricas.log(f"   ✅ Todos os links preservados!")
+            elif comparison:
+                metricas.warn(f"❌ {doc_name}: {comparison['error']}")
+        
+            metricas.log()
 
-if docs_with_missing_links:
-    print("="*80)
-    print("RESTAURANDO LINKS FALTANTES")
-    print("="*80)
-    print()
-    
-    for doc_info in docs_with_missing_links:
-        doc_name = doc_info['name']
-        doc_path = os.path.join(docs_dir, doc_name)
+        if docs_with_missing_links:
+            print()
+            print("="*80)
+            print("RESTAURANDO LINKS FALTANTES")
+            print("="*80)
+            print()
         
-        print(f"🔧 Restaurando: {doc_name}")
-        restored = restore_links_to_document(doc_path)
-        print()
+            for doc_info in docs_with_missing_links:
+                doc_name = doc_info['name']
+                docs_dir = doc_info['dir']
+                doc_path = os.path.join(docs_dir, doc_name)
+            
+                print(f"🔧 Restaurando: {doc_name}")
+                backup_path = latest_snapshot(doc_path)
+                restored, cached = run_stage(manifest, 'restauracao_links', doc_path,
+                                             lambda: restore_links_to_document(doc_path),
+                                             extra_inputs=(backup_path,) if backup_path else (),
+                                             force=args.force)
+                if cached:
+                    print(f"   ⏭️  Links já restaurados anteriormente: {restored}")
+                metricas.log()
+
+        save_manifest(manifest)
 
-print("="*80)
-print("✅ ANÁLISE E RESTAURAÇÃO CONCLUÍDAS")
-print("="*80)
+        print("="*80)
+        print("✅ ANÁLISE E RESTAURAÇÃO CONCLUÍDAS")
+        print("="*80)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resumos de Busca - Concierge RH Digital INPI
+Pré-calcula, para cada documento, o registro usado nos resultados da busca:
+um resumo pequeno (título, descrição curta, ícone, cor e os primeiros
+títulos de seção), o texto corrido e as posições de cada termo nesse texto.
+Com isso a busca devolve só o resumo e um trecho com as palavras destacadas;
+as seções completas são carregadas quando o documento é aberto.
+
+Os registros são usados pelo servidor_busca (/api/search/hits) e gravados,
+por este script, em src/search-summaries.json. Não vão para o Redis enquanto
+api/search.ts e api/admin/upload.ts não os lerem e gravarem.
+"""
+
+from indice_busca import tokenize, DATABASE_PATH
+from corpus_docs import add_arguments, from_args
+from manifesto import atomic_write
+import argparse
+import json
+import os
+import re
+import time
+
+# Descrição do resumo (caracteres, cortada no fim de uma palavra)
+DESCRIPTION_LENGTH = 200
+# Títulos de seção no resumo
+MAX_HEADINGS = 5
+# Ocorrências guardadas por termo (as primeiras do texto)
+MAX_POSITIONS = 8
+# Tamanho do trecho e contexto antes da primeira palavra destacada
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 40
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SUMMARIES_PATH = os.path.join(BASE_DIR, 'src', 'search-summaries.json')
+
+# Palavra no texto original (acentos incluídos), antes da normalização
+_WORD = re.compile(r'[^\W_]+')
+
+# ---------------------------------------------------------------------------
+# Registros
+# ---------------------------------------------------------------------------
+
+def _shorten(text, length):
+    text = ' '.join((text or '').split())
+    if len(text) <= length:
+        return text
+    cut = text.rfind(' ', 0, length)
+    return text[:cut if cut > 0 else length].rstrip(' ,;:.') + '…'
+
+def _sections(document):
+    sections = document.get('sections') or []
+    if isinstance(sections, str):
+        try:
+            sections = json.loads(sections)
+        except ValueError:
+            return []
+    return sections
+
+def headings(document, limit=MAX_HEADINGS):
+    """Primeiros títulos de seção (sem o título do documento, sem repetição)"""
+    found = []
+    for section in _sections(document):
+        if section.get('type') != 'heading' or str(section.get('level')) == '1':
+            continue
+        text = ' '.join((section.get('content') or '').split())
+        if text and text not in found:
+            found.append(text)
+            if len(found) == limit:
+                break
+    return found
+
+def summary_from_document(document):
+    """Resumo do documento (hash doc:<id> de carga_redis) para a lista de resultados"""
+    return {
+        'id': document['id'],
+        'title': document.get('title') or '',
+        'description': _shorten(document.get('description'), DESCRIPTION_LENGTH),
+        'icon': document.get('icon') or 'file-text',
+        'color': document.get('color') or '',
+        'externalLink': document.get('externalLink') or '',
+        'lastModified': document.get('lastModified') or '',
+        'headings': headings(document)
+    }
+
+def term_positions(text, limit=MAX_POSITIONS):
+    """Termo normalizado -> deslocamentos (início da palavra) no texto original"""
+    positions = {}
+    for match in _WORD.finditer(text):
+        for term in tokenize(match.group()):
+            offsets = positions.setdefault(term, [])
+            if len(offsets) < limit and (not offsets or offsets[-1] != match.start()):
+                offsets.append(match.start())
+    return positions
+
+def summary_record(document):
+    """Registro pré-calculado: resumo, texto corrido e posições dos termos"""
+    text = document.get('content') or document.get('description') or ''
+    return {
+        'summary': summary_from_document(document),
+        'text': text,
+        'positions': term_positions(text)
+    }
+
+# ---------------------------------------------------------------------------
+# Trechos e resultados
+# ---------------------------------------------------------------------------
+
+def snippet(record, words, length=SNIPPET_LENGTH):
+    """Trecho do texto com as palavras da busca: {'text', 'highlights': [[início, fim]]}
+
+    A janela é a que cobre mais ocorrências das palavras; sem ocorrências,
+    é o começo do texto. Os destaques são relativos ao trecho.
+    """
+    text = record['text']
+    positions = record['positions']
+    offsets = sorted({offset for word in words for offset in positions.get(word, ())})
+
+    start = 0
+    if offsets:
+        best = first = last = 0
+        for i in range(len(offsets)):
+            while offsets[i] - offsets[first] > length - SNIPPET_CONTEXT:
+                first += 1
+            if i - first + 1 > best:
+                best, last = i - first + 1, first
+        anchor = offsets[last]
+        start = max(0, anchor - SNIPPET_CONTEXT)
+        if start:
+            space = text.find(' ', start, anchor)
+            start = space + 1 if space >= 0 else anchor
+
+    end = min(len(text), start + length)
+    if end < len(text):
+        space = text.rfind(' ', start, end)
+        if space > start:
+            end = space
+
+    prefix = '…' if start else ''
+    highlights = []
+    for offset in offsets:
+        if start <= offset < end:
+            match = _WORD.match(text, offset)
+            highlights.append([offset - start + len(prefix), min(match.end(), end) - start + len(prefix)])
+
+    return {
+        'text': prefix + text[start:end].replace('\n', ' ') + ('…' if end < len(text) else ''),
+        'highlights': highlights
+    }
+
+def hit_payload(record, words):
+    """Resultado leve da busca: o resumo mais o trecho destacado"""
+    return {**record['summary'], 'snippet': snippet(record, words)}
+
+# ---------------------------------------------------------------------------
+# Geração
+# ---------------------------------------------------------------------------
+
+def build_summaries(documents):
+    """{id: registro} para os documentos, na ordem recebida"""
+    return {document['id']: summary_record(document) for document in documents}
+
+def write_summaries(summaries, path=SUMMARIES_PATH):
+    """Grava os registros em JSON compacto (arquivo temporário + rename)"""
+    with atomic_write(path) as f:
+        json.dump(summaries, f, ensure_ascii=False, separators=(',', ':'))
+
+def load_summaries(path=SUMMARIES_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pré-calcula os resumos e posições usados nos resultados da busca')
+    parser.add_argument('--database', nargs='?', const=DATABASE_PATH, metavar='ARQUIVO',
+                        help='Usa o src/database.json em vez dos .docx do corpus')
+    parser.add_argument('--saida', default=SUMMARIES_PATH,
+                        help='Arquivo de saída (padrão: src/search-summaries.json)')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    from carga_redis import document_from_docx, document_from_database
+    start = time.perf_counter()
+    if args.database:
+        with open(args.database, 'r', encoding='utf-8') as f:
+            documents = [document_from_database(doc) for doc in json.load(f)]
+    else:
+        documents = [document_from_docx(doc['path']) for doc in from_args(args)]
+
+    summaries = build_summaries(documents)
+    write_summaries(summaries, args.saida)
+
+    print("=" * 70)
+    print("RESUMOS DE BUSCA GERADOS")
+    print("=" * 70)
+    print(f"📄 Documentos: {len(summaries)}")
+    print(f"🔑 Posições: {sum(len(o) for r in summaries.values() for o in r['positions'].values())}")
+    print(f"💾 Arquivo: {args.saida} ({os.path.getsize(args.saida) / 1024:.1f} KB)")
+    print(f"⏱️  Tempo: {time.perf_counter() - start:.2f}s")
+    print("=" * 70)
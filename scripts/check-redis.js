@@ -1,5 +1,6 @@
 import Redis from 'ioredis';
 import dotenv from 'dotenv';
+import { indexPrefix } from './index-prefix.cjs';
 
 dotenv.config();
 
@@ -7,18 +8,21 @@ const redis = new Redis(process.env.REDIS_URL);
 
 console.log('🔗 Conectado ao Redis');
 
+// Geração do índice no ar (carga_redis.py); '' no layout antigo
+const prefix = await indexPrefix(redis);
+
 // Listar todas as chaves de documentos
-const docKeys = await redis.keys('doc:*');
+const docKeys = await redis.keys(`${prefix}doc:*`);
 console.log(`\n📚 Documentos encontrados: ${docKeys.length}`);
 docKeys.forEach(key => console.log(`  - ${key}`));
 
 // Listar todas as chaves de busca
-const searchKeys = await redis.keys('search:*');
+const searchKeys = await redis.keys(`${prefix}search:*`);
 console.log(`\n🔍 Índices de busca: ${searchKeys.length}`);
 console.log('Primeiros 10:', searchKeys.slice(0, 10));
 
 // Verificar lista de todos os docs
-const allDocs = await redis.smembers('docs:all');
+const allDocs = await redis.smembers(`${prefix}docs:all`);
 console.log(`\n📋 Lista docs:all: ${allDocs.length} documentos`);
 console.log(allDocs);
 
@@ -10,6 +10,7 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import dotenv from 'dotenv';
+import { indexPrefix } from './index-prefix.cjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -68,13 +69,15 @@ async function checkSyncStatus() {
         }
       });
       
-      const docIds = await redis.smembers('docs:all');
+      // Geração do índice no ar (carga_redis.py); '' no layout antigo
+      const prefix = await indexPrefix(redis);
+      const docIds = await redis.smembers(`${prefix}docs:all`);
       redisFiles = docIds;
       
       console.log(`   Total: ${redisFiles.length} documentos`);
       
       for (const id of docIds) {
-        const doc = await redis.hgetall(`doc:${id}`);
+        const doc = await redis.hgetall(`${prefix}doc:${id}`);
         console.log(`   - ${doc.title || id} (ID: ${id})`);
       }
       
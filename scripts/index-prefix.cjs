@@ -0,0 +1,22 @@
+/**
+ * Geração do Índice no Redis - versão para scripts (CommonJS)
+ * Mesma regra de api/utils/index-generation.ts: o carregador Python
+ * (carga_redis.py) monta cada versão do índice sob o prefixo idx:<geração>:
+ * e troca apenas o ponteiro index:current no final.
+ */
+
+const CURRENT_GENERATION_KEY = 'index:current';
+
+/**
+ * Prefixo das chaves do índice no ar (doc:*, docs:all, search:*).
+ * Retorna '' enquanto o índice ainda estiver no layout antigo, sem gerações.
+ */
+async function indexPrefix(redis) {
+  const generation = await redis.get(CURRENT_GENERATION_KEY);
+  return generation ? `idx:${generation}:` : '';
+}
+
+module.exports = {
+  CURRENT_GENERATION_KEY,
+  indexPrefix
+};
@@ -11,6 +11,7 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import dotenv from 'dotenv';
+import { indexPrefix } from './index-prefix.cjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -46,6 +47,9 @@ async function migrateFilesToBlob() {
 
   console.log('✅ Conectado ao Redis\n');
 
+  // Geração do índice no ar (carga_redis.py); '' no layout antigo
+  const prefix = await indexPrefix(redis);
+
   // Listar arquivos da pasta docs/
   const docsPath = path.join(__dirname, '../docs');
   const files = fs.readdirSync(docsPath)
@@ -87,12 +91,12 @@ async function migrateFilesToBlob() {
         .replace(/^-+|-+$/g, '');
 
       // Verificar se documento existe no Redis
-      const exists = await redis.exists(`doc:${docId}`);
+      const exists = await redis.exists(`${prefix}doc:${docId}`);
       
       if (exists) {
         // Atualizar blobUrl no Redis
         console.log(`   🔄 Atualizando blobUrl no Redis (doc:${docId})...`);
-        await redis.hset(`doc:${docId}`, 'blobUrl', blob.url);
+        await redis.hset(`${prefix}doc:${docId}`, 'blobUrl', blob.url);
         console.log(`   ✅ Redis atualizado com blobUrl`);
       } else {
         console.log(`   ℹ️  Documento não existe no Redis (será criado no próximo upload via painel)`);
@@ -12,6 +12,7 @@ import Redis from 'ioredis';
 import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { indexPrefix } from './index-prefix.cjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -88,6 +89,9 @@ async function migrateDocuments() {
   let successCount = 0;
   let errorCount = 0;
 
+  // Geração do índice no ar (carga_redis.py); '' no layout antigo
+  const prefix = await indexPrefix(redis);
+
   for (const doc of database) {
     try {
       console.log(`📄 Migrando: ${doc.title}`);
@@ -111,11 +115,11 @@ async function migrateDocuments() {
       };
 
       // 1. Salvar documento no KV
-      await kv.hset(`doc:${doc.id}`, documentData);
+      await kv.hset(`${prefix}doc:${doc.id}`, documentData);
       console.log(`   ✓ Documento salvo: doc:${doc.id}`);
 
       // 2. Adicionar à lista de todos os documentos
-      await kv.sadd('docs:all', doc.id);
+      await kv.sadd(`${prefix}docs:all`, doc.id);
       console.log(`   ✓ Adicionado à lista docs:all`);
 
       // 3. Criar índices de busca
@@ -129,7 +133,7 @@ async function migrateDocuments() {
       for (let i = 0; i < searchWords.length; i += batchSize) {
         const batch = searchWords.slice(i, i + batchSize);
         await Promise.all(
-          batch.map(word => kv.sadd(`search:${word}`, doc.id))
+          batch.map(word => kv.sadd(`${prefix}search:${word}`, doc.id))
         );
       }
       
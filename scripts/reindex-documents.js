@@ -8,6 +8,7 @@ import Redis from 'ioredis';
 import mammoth from 'mammoth';
 import dotenv from 'dotenv';
 import { processDocx, sectionsToJson } from './docx-processor.js';
+import { indexPrefix } from './index-prefix.cjs';
 
 // Carregar variáveis de ambiente
 dotenv.config();
@@ -28,6 +29,9 @@ async function reindexDocuments() {
 
     console.log(`Encontrados ${blobs.length} documentos\n`);
 
+    // Geração do índice no ar (carga_redis.py); '' no layout antigo
+    const prefix = await indexPrefix(redis);
+
     // 2. Para cada blob, baixar, processar e re-indexar
     for (const blob of blobs) {
       try {
@@ -98,12 +102,12 @@ async function reindexDocuments() {
           metadata: JSON.stringify(processed.metadata)
         };
 
-        await redis.hset(`doc:${id}`, ...Object.entries(documentData).flat());
-        await redis.sadd('docs:all', id);
+        await redis.hset(`${prefix}doc:${id}`, ...Object.entries(documentData).flat());
+        await redis.sadd(`${prefix}docs:all`, id);
 
         // Limpar índices antigos deste documento
         console.log(`   🧹 Limpando índices antigos...`);
-        const searchKeys = await redis.keys('search:*');
+        const searchKeys = await redis.keys(`${prefix}search:*`);
         for (const key of searchKeys) {
           await redis.srem(key, id);
         }
@@ -112,7 +116,7 @@ async function reindexDocuments() {
         console.log(`   🔍 Indexando ${uniqueWords.length} palavras...`);
         for (const word of uniqueWords) {
           if (word.length > 3) {
-            await redis.sadd(`search:${word.toLowerCase()}`, id);
+            await redis.sadd(`${prefix}search:${word.toLowerCase()}`, id);
           }
         }
 
@@ -1,5 +1,6 @@
 import Redis from 'ioredis';
 import dotenv from 'dotenv';
+import { indexPrefix } from './index-prefix.cjs';
 
 dotenv.config();
 
@@ -9,6 +10,9 @@ const query = process.argv[2] || 'aposentadoria';
 
 console.log(`🔍 Buscando: "${query}"\n`);
 
+// Geração do índice no ar (carga_redis.py); '' no layout antigo
+const prefix = await indexPrefix(redis);
+
 // Normalizar query
 const searchWords = query
   .toLowerCase()
@@ -22,7 +26,7 @@ console.log(`📝 Palavras de busca:`, searchWords);
 
 // Buscar IDs
 const docIdSets = await Promise.all(
-  searchWords.map(word => redis.smembers(`search:${word}`))
+  searchWords.map(word => redis.smembers(`${prefix}search:${word}`))
 );
 
 console.log(`\n📊 Resultados por palavra:`);
@@ -44,7 +48,7 @@ console.log(matchingIds);
 if (matchingIds.length > 0) {
   console.log(`\n📄 Detalhes dos documentos:\n`);
   for (const id of matchingIds) {
-    const doc = await redis.hgetall(`doc:${id}`);
+    const doc = await redis.hgetall(`${prefix}doc:${id}`);
     console.log(`- ${doc.title} (${id})`);
     console.log(`  Keywords: ${doc.keywords?.substring(0, 100)}...`);
   }
@@ -9,6 +9,7 @@ import dotenv from 'dotenv';
 import fs from 'fs';
 import path from 'path';
 import { processDocx, sectionsToJson } from './docx-processor.js';
+import { indexPrefix } from './index-prefix.cjs';
 
 // Carregar variáveis de ambiente
 dotenv.config();
@@ -90,14 +91,16 @@ async function uploadSpecificFile(filename) {
       metadata: JSON.stringify(processed.metadata)
     };
 
-    await redis.hset(`doc:${id}`, ...Object.entries(documentData).flat());
-    await redis.sadd('docs:all', id);
+    // Geração do índice no ar (carga_redis.py); '' no layout antigo
+    const prefix = await indexPrefix(redis);
+    await redis.hset(`${prefix}doc:${id}`, ...Object.entries(documentData).flat());
+    await redis.sadd(`${prefix}docs:all`, id);
 
     // Indexar palavras
     console.log(`   🗂️  Indexando palavras no Redis...`);
     for (const word of uniqueWords) {
       if (word.length > 3) {
-        await redis.sadd(`search:${word.toLowerCase()}`, id);
+        await redis.sadd(`${prefix}search:${word.toLowerCase()}`, id);
       }
     }
 
@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Servidor de Busca - Concierge RH Digital INPI
+Serve localmente o mesmo contrato de api/search.ts (GET /api/search?q=) a
+partir de um índice em memória montado pelo pipeline Python, sem Redis:
+os documentos vêm dos .docx do corpus (carga_redis.document_from_docx) ou
+do src/database.json, no mesmo formato dos hashes doc:<id>.
+
+HTTP/1.1 com keep-alive sobre asyncio (só biblioteca padrão). Os resultados
+ficam em um cache LRU com chave (geração do índice, palavras normalizadas);
+quando a fonte muda, o índice é remontado em uma thread e trocado de uma vez,
+com uma geração nova, então o cache antigo deixa de valer sozinho.
+Para rodar on-premises e para testes de carga.
+
+GET /api/search/hits?q= devolve, na mesma ordem, só o resumo e um trecho
+destacado de cada documento (resumos.py); as seções completas ficam em
+GET /api/document?id=, carregadas quando o documento é aberto.
+"""
+
+from carga_redis import document_from_docx, document_from_database, search_words
+from indice_busca import normalize, strip_accents, DATABASE_PATH
+from resumos import summary_record, hit_payload
+from corpus_docs import add_arguments, from_args
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+
+HOST = '127.0.0.1'
+PORT = 8787
+
+# Buscas diferentes guardadas no cache LRU
+CACHE_SIZE = 1024
+# Segundos entre as verificações da fonte (recarga automática)
+RELOAD_INTERVAL = 2.0
+# Conexão keep-alive ociosa é fechada depois disto
+IDLE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16 * 1024
+
+# api/search.ts completa com a varredura de títulos abaixo disto
+MIN_RESULTS = 5
+# api/search.ts aceita palavras com 3+ caracteres
+MIN_WORD_LENGTH = 3
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 431: 'Request Header Fields Too Large',
+            500: 'Internal Server Error'}
+
+# ---------------------------------------------------------------------------
+# Fonte dos documentos
+# ---------------------------------------------------------------------------
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def database_source(database_path=DATABASE_PATH):
+    """Fonte a partir do src/database.json"""
+    def signature():
+        return _stat(database_path)
+
+    def load():
+        with open(database_path, 'r', encoding='utf-8') as f:
+            return [document_from_database(doc) for doc in json.load(f)]
+
+    return {'name': database_path, 'signature': signature, 'load': load}
+
+def corpus_source(discover):
+    """Fonte a partir dos .docx do corpus
+
+    `discover` devolve um novo fluxo de documentos (corpus_docs) a cada
+    chamada. Só os arquivos que mudaram são extraídos de novo na recarga.
+    """
+    extracted = {}
+
+    def signature():
+        return tuple(sorted((doc['path'], _stat(doc['path'])) for doc in discover()))
+
+    def load():
+        current = {}
+        for doc in discover():
+            stat = _stat(doc['path'])
+            cached = extracted.get(doc['path'])
+            if cached is None or cached[0] != stat:
+                cached = (stat, document_from_docx(doc['path']))
+            current[doc['path']] = cached
+        extracted.clear()
+        extracted.update(current)
+        return [document for _, document in current.values()]
+
+    return {'name': 'corpus .docx', 'signature': signature, 'load': load}
+
+# ---------------------------------------------------------------------------
+# Índice
+# ---------------------------------------------------------------------------
+
+def _title_key(title):
+    """Título como api/search.ts compara: minúsculas, sem acentos (pontuação mantida)"""
+    return strip_accents((title or '').lower())
+
+def _response_document(document):
+    """Documento como api/search.ts devolve: o hash com as seções já decodificadas"""
+    doc = dict(document)
+    if isinstance(doc.get('sections'), str):
+        try:
+            doc['sections'] = json.loads(doc['sections'])
+        except ValueError:
+            pass
+    return doc
+
+def build_search_index(documents, generation):
+    """Índice em memória equivalente às chaves doc:<id>, docs:all e search:<palavra>
+
+    Para cada documento já ficam prontos o JSON da resposta, o texto usado na
+    pontuação, o título normalizado da varredura de títulos e o registro de
+    resumo dos resultados leves.
+    """
+    docs = {}
+    postings = {}
+    for document in documents:
+        doc_id = document['id']
+        if doc_id not in docs:
+            for word in search_words(document):
+                postings.setdefault(word, []).append(doc_id)
+        docs[doc_id] = {
+            'title': document.get('title', ''),
+            'title_key': _title_key(document.get('title', '')),
+            'text': f"{document.get('title', '')} {document.get('keywords', '')} "
+                    f"{document.get('description', '')}".lower(),
+            'json': json.dumps(_response_document(document), ensure_ascii=False,
+                               separators=(',', ':')).encode('utf-8'),
+            'record': summary_record(document)
+        }
+    return {
+        'generation': generation,
+        'built_at': time.time(),
+        'docs': docs,
+        'all': list(docs),
+        'postings': {word: tuple(ids) for word, ids in postings.items()}
+    }
+
+def query_words(query):
+    """Palavras da busca como em api/search.ts (a chave normalizada do cache)"""
+    return tuple(w for w in normalize(query.strip()).split() if len(w) >= MIN_WORD_LENGTH)
+
+def search_ids(index, words):
+    """IDs dos documentos na ordem de api/search.ts: união, varredura de títulos, score"""
+    matching = []
+    seen = set()
+    for word in words:
+        for doc_id in index['postings'].get(word, ()):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                matching.append(doc_id)
+
+    if len(matching) < MIN_RESULTS:
+        for doc_id in index['all']:
+            if doc_id not in seen and any(word in index['docs'][doc_id]['title_key'] for word in words):
+                seen.add(doc_id)
+                matching.append(doc_id)
+
+    docs = index['docs']
+    scored = [doc_id for doc_id in matching if docs[doc_id]['title']]
+    # Mesma contagem da RegExp global de api/search.ts (as palavras são só [a-z0-9])
+    scored.sort(key=lambda doc_id: -sum(docs[doc_id]['text'].count(word) for word in words))
+    return scored
+
+def render(index, doc_ids):
+    """Corpo JSON da resposta, montado com o JSON pré-serializado de cada documento"""
+    docs = index['docs']
+    return b'[' + b','.join(docs[doc_id]['json'] for doc_id in doc_ids) + b']'
+
+def render_hits(index, doc_ids, words):
+    """Corpo JSON dos resultados leves: resumo e trecho destacado de cada documento"""
+    docs = index['docs']
+    return _json([hit_payload(docs[doc_id]['record'], words) for doc_id in doc_ids])
+
+# ---------------------------------------------------------------------------
+# Estado do servidor (índice no ar, cache e recarga)
+# ---------------------------------------------------------------------------
+
+def open_service(source, cache_size=CACHE_SIZE):
+    """Monta o primeiro índice; devolve o estado compartilhado pelas conexões"""
+    signature = source['signature']()
+    service = {
+        'source': source,
+        'signature': signature,
+        'index': build_search_index(source['load'](), 1),
+        'cache': OrderedDict(),
+        'cache_size': cache_size,
+        'hits': 0,
+        'misses': 0,
+        'requests': 0,
+        'reloads': 0,
+        'reloading': None
+    }
+    return service
+
+def cached_search(service, words, hits=False):
+    """Corpo da resposta para as palavras, pelo cache LRU; devolve (corpo, acerto)
+
+    Com `hits`, o corpo tem os resultados leves (render_hits).
+    """
+    index = service['index']
+    key = (index['generation'], hits, words)
+    cache = service['cache']
+    body = cache.get(key)
+    if body is not None:
+        cache.move_to_end(key)
+        service['hits'] += 1
+        return body, True
+
+    service['misses'] += 1
+    doc_ids = search_ids(index, words)
+    body = render_hits(index, doc_ids, words) if hits else render(index, doc_ids)
+    cache[key] = body
+    if len(cache) > service['cache_size']:
+        cache.popitem(last=False)
+    return body, False
+
+async def reload(service, force=False):
+    """Remonta o índice em uma thread se a fonte mudou e troca de uma vez
+
+    Devolve True se uma nova geração entrou no ar. Recargas simultâneas
+    esperam a que já está em andamento.
+    """
+    if service['reloading'] is not None:
+        return await asyncio.shield(service['reloading'])
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        source = service['source']
+        signature = await loop.run_in_executor(None, source['signature'])
+        if not force and signature == service['signature']:
+            return False
+        documents = await loop.run_in_executor(None, source['load'])
+        generation = service['index']['generation'] + 1
+        index = await loop.run_in_executor(None, build_search_index, documents, generation)
+        service['index'] = index
+        service['signature'] = signature
+        service['cache'].clear()
+        service['reloads'] += 1
+        return True
+
+    service['reloading'] = asyncio.ensure_future(run())
+    try:
+        return await asyncio.shield(service['reloading'])
+    finally:
+        service['reloading'] = None
+
+async def watch(service, interval=RELOAD_INTERVAL, on_reload=None):
+    """Confere a fonte a cada `interval` segundos e recarrega quando muda"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await reload(service) and on_reload:
+                on_reload(service)
+        except Exception as e:
+            print(f"❌ Falha ao recarregar o índice: {e}", file=sys.stderr)
+
+def status(service):
+    index = service['index']
+    return {
+        'generation': index['generation'],
+        'documents': len(index['docs']),
+        'words': len(index['postings']),
+        'built_at': index['built_at'],
+        'requests': service['requests'],
+        'reloads': service['reloads'],
+        'cache': {
+            'entries': len(service['cache']),
+            'size': service['cache_size'],
+            'hits': service['hits'],
+            'misses': service['misses']
+        }
+    }
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def route(service, method, target):
+    """Responde a uma requisição: (status, corpo, cabeçalhos extras)"""
+    url = urlsplit(target)
+    if url.path in ('/api/search', '/api/search/hits'):
+        if method != 'GET':
+            return 405, _json({'error': 'Method not allowed'}), ()
+        values = parse_qs(url.query).get('q')
+        if not values or not values[0]:
+            return 400, _json({'error': 'Parâmetro "q" é obrigatório'}), ()
+        words = query_words(values[0])
+        generation = str(service['index']['generation'])
+        if not words:
+            return 200, b'[]', (('X-Index-Generation', generation),)
+        body, hit = cached_search(service, words, hits=url.path == '/api/search/hits')
+        return 200, body, (('X-Index-Generation', generation), ('X-Cache', 'HIT' if hit else 'MISS'))
+    if url.path == '/api/document':
+        if method != 'GET':
+            return 405, _json({'error': 'Method not allowed'}), ()
+        values = parse_qs(url.query).get('id')
+        document = service['index']['docs'].get(values[0]) if values else None
+        if document is None:
+            return 404, _json({'error': 'Documento não encontrado'}), ()
+        return 200, document['json'], (('X-Index-Generation', str(service['index']['generation'])),)
+    if url.path == '/api/search/status':
+        return 200, _json(status(service)), ()
+    return 404, _json({'error': 'Not found'}), ()
+
+async def _read_head(reader):
+    """Linha de requisição e cabeçalhos; None quando o cliente fecha a conexão"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), IDLE_TIMEOUT)
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ValueError('requisição incompleta')
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError('cabeçalhos grandes demais')
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+async def handle_connection(service, reader, writer):
+    """Atende as requisições de uma conexão (keep-alive) até o cliente fechar"""
+    try:
+        while True:
+            try:
+                request = await _read_head(reader)
+            except (ValueError, asyncio.TimeoutError) as e:
+                if not isinstance(e, asyncio.TimeoutError):
+                    writer.write(_response(400, _json({'error': str(e)}), (), False))
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+
+            length = headers.get('content-length', '0')
+            if length.isdigit() and int(length):
+                await reader.readexactly(int(length))
+
+            connection = headers.get('connection', '').lower()
+            keep = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            service['requests'] += 1
+            try:
+                status_code, body, extra = route(service, method, target)
+            except Exception as e:
+                status_code, body, extra = 500, _json({'error': 'Erro ao buscar documentos',
+                                                       'details': str(e)}), ()
+            writer.write(_response(status_code, body, extra, keep))
+            await writer.drain()
+            if not keep:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+def _response(status_code, body, extra, keep):
+    head = [f"HTTP/1.1 {status_code} {_REASONS.get(status_code, '')}",
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body)}',
+            f"Connection: {'keep-alive' if keep else 'close'}"]
+    head.extend(f'{name}: {value}' for name, value in extra)
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+async def start(service, host=HOST, port=PORT, reload_interval=RELOAD_INTERVAL, on_reload=None):
+    """Abre o servidor e a tarefa de recarga; devolve (servidor, tarefa)"""
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES)
+    watcher = None
+    if reload_interval:
+        watcher = asyncio.ensure_future(watch(service, reload_interval, on_reload))
+    return server, watcher
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor local de busca (mesmo contrato de api/search.ts)')
+    parser.add_argument('--host', default=HOST, help=f'Endereço (padrão: {HOST})')
+    parser.add_argument('--porta', type=int, default=PORT, help=f'Porta (padrão: {PORT})')
+    parser.add_argument('--database', nargs='?', const=DATABASE_PATH, metavar='ARQUIVO',
+                        help='Usa o src/database.json em vez dos .docx do corpus')
+    parser.add_argument('--cache', type=int, default=CACHE_SIZE,
+                        help='Buscas guardadas no cache LRU')
+    parser.add_argument('--recarga', type=float, default=RELOAD_INTERVAL,
+                        help='Segundos entre verificações da fonte (0 desliga a recarga automática)')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.database:
+        source = database_source(args.database)
+    else:
+        source = corpus_source(lambda: from_args(args))
+
+    def announce(service):
+        current = status(service)
+        print(f"🔄 Índice recarregado: geração {current['generation']}, "
+              f"{current['documents']} documentos", flush=True)
+
+    async def main():
+        start_time = time.perf_counter()
+        service = open_service(source, args.cache)
+        server, watcher = await start(service, args.host, args.porta, args.recarga, announce)
+        current = status(service)
+        print("=" * 70)
+        print("SERVIDOR DE BUSCA - CONCIERGE RH DIGITAL")
+        print("=" * 70)
+        print(f"📚 Fonte: {source['name']}")
+        print(f"📄 Documentos: {current['documents']} | palavras: {current['words']} "
+              f"| {time.perf_counter() - start_time:.2f}s")
+        print(f"🌐 http://{args.host}:{server.sockets[0].getsockname()[1]}/api/search?q=")
+        print("=" * 70, flush=True)
+
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        # SIGHUP força a recarga sem esperar a verificação periódica
+        if hasattr(signal, 'SIGHUP'):
+            loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(reload(service, force=True)))
+        await stop
+
+        if watcher:
+            watcher.cancel()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Os scripts ficam na raiz do repositório: os testes importam de lá"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
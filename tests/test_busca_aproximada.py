@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Busca aproximada (busca_aproximada.py) contra a varredura linear do vocabulário do corpus"""
+
+from busca_aproximada import (build_fuzzy, corpus_vocabulary, lookup, correct, brute_force,
+                              edit_distance, misspell, allowed_distance, write_vocabulary,
+                              load_fuzzy, MAX_SUGGESTIONS)
+from corpus_docs import iter_documents
+import random
+import pytest
+
+
+@pytest.fixture(scope='module')
+def fuzzy():
+    vocabulary = corpus_vocabulary(iter_documents())
+    if not vocabulary:
+        pytest.skip('corpus sem documentos')
+    return build_fuzzy(vocabulary)
+
+
+@pytest.mark.parametrize('a, b, distance', [
+    ('licenca', 'licenca', 0),
+    ('licensa', 'licenca', 1),
+    ('lciensa', 'licenca', 2),
+    ('aposentadorea', 'aposentadoria', 1),
+    ('ferais', 'ferias', 1),
+    ('abc', 'xyzw', 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, 2) == min(distance, 3)
+
+
+def test_lookup_matches_brute_force(fuzzy):
+    rng = random.Random(7)
+    vocabulary = fuzzy['terms']
+    words = sorted(vocabulary)
+    for _ in range(200):
+        typo = misspell(rng.choice(words), rng.randint(1, fuzzy['max_distance']), rng)
+        if typo in vocabulary:
+            expected = [(typo, 0, vocabulary[typo])]
+        else:
+            expected = brute_force(vocabulary, typo, allowed_distance(fuzzy, typo))[:MAX_SUGGESTIONS]
+        assert lookup(fuzzy, typo) == expected, typo
+
+
+def test_short_words_accept_one_edit():
+    fuzzy = build_fuzzy({'sua': 5, 'sus': 1, 'servidor': 3})
+    assert allowed_distance(fuzzy, 'sxx') == 1
+    assert lookup(fuzzy, 'sxx') == []
+    assert correct(fuzzy, 'servdior') == 'servidor'
+
+
+def test_known_terms_filter():
+    fuzzy = build_fuzzy({'ferias': 10, 'feiras': 1})
+    assert correct(fuzzy, 'ferais') == 'ferias'
+    assert correct(fuzzy, 'ferais', known={'feiras'}) == 'feiras'
+
+
+def test_vocabulary_file_roundtrip(fuzzy, tmp_path):
+    path = str(tmp_path / 'vocabulario.json')
+    write_vocabulary(fuzzy, path)
+    loaded = load_fuzzy(path)
+    assert loaded['terms'] == fuzzy['terms']
+    assert loaded['deletes'].keys() == fuzzy['deletes'].keys()
+    for word in ('licensa', 'aposentadorea', 'ferais'):
+        assert lookup(loaded, word) == lookup(fuzzy, word)
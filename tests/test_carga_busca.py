@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Gerador de carga (carga_busca.py) contra o servidor_busca embutido"""
+
+from carga_busca import (synthetic_log, load_log, save_log, run_load, summarize, http_target,
+                         index_target, compare_baseline)
+from servidor_busca import database_source, open_service, start
+from indice_busca import DATABASE_PATH
+import asyncio
+import pytest
+
+
+@pytest.fixture(scope='module')
+def log():
+    return synthetic_log(300, seed=1)
+
+
+def test_synthetic_log_is_reproducible(log):
+    assert synthetic_log(300, seed=1) == log
+    assert len(log) == 300
+    # As buscas populares se repetem (é o que faz o cache servir)
+    assert len(set(log)) < len(log)
+
+
+def test_log_roundtrip_and_formats(log, tmp_path):
+    path = str(tmp_path / 'buscas.log')
+    save_log(log, path)
+    assert load_log(path) == log
+
+    access = tmp_path / 'acesso.log'
+    access.write_text('{"q": "férias"}\n'
+                      '127.0.0.1 - - "GET /api/search?q=licen%C3%A7a+sa%C3%BAde HTTP/1.1" 200\n',
+                      encoding='utf-8')
+    assert load_log(str(access)) == ['férias', 'licença saúde']
+
+
+def test_load_against_embedded_server(log):
+    async def scenario():
+        service = open_service(database_source(DATABASE_PATH))
+        server, _ = await start(service, port=0, reload_interval=0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        try:
+            return {
+                'http': summarize(await run_load(http_target(url), log, 4), 4),
+                'http com taxa': summarize(await run_load(http_target(url), log, 4, rate=2000), 4, 2000),
+                'índice': summarize(await run_load(index_target(service), log, 4), 4)
+            }
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    for name, summary in asyncio.run(scenario()).items():
+        assert summary['requests'] == len(log), name
+        assert summary['errors'] == 0, name
+        assert summary['p50_ms'] <= summary['p95_ms'] <= summary['p99_ms'] <= summary['max_ms'], name
+        assert summary['cache_hit_rate'] > 0, name
+
+
+def test_compare_baseline_flags_latency_regression():
+    baseline = {'p50_ms': 1.0, 'p95_ms': 1.0, 'p99_ms': 1.0, 'throughput': 100.0, 'error_rate': 0.0}
+    current = dict(baseline, p50_ms=2.0)
+    _, regressions = compare_baseline(current, baseline, 0.1)
+    assert regressions == ['p50_ms']
+    _, regressions = compare_baseline(baseline, baseline, 0.1)
+    assert regressions == []
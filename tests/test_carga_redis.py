@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Carga por gerações no Redis (carga_redis.py) contra o fakeredis"""
+
+from carga_redis import (load_documents, build_generation, flip_generation, collect_generation,
+                         update_document, remove_document, verify_load, document_from_database,
+                         live_prefix, search_words, ALL_DOCS_KEY, CURRENT_KEY, STATS_KEY)
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def client(server):
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def _document(doc_id, text, created_at='2024-01-01T00:00:00+00:00'):
+    return document_from_database({
+        'id': doc_id,
+        'title': doc_id.replace('-', ' ').title(),
+        'keywords': text.split()[0],
+        'sections': [{'type': 'paragraph', 'content': text}]
+    }, created_at)
+
+
+@pytest.fixture
+def corpus():
+    return [
+        _document('ferias', 'Marcação de férias pelo SouGov'),
+        _document('licenca-capacitacao', 'Licença capacitação para servidores'),
+        _document('abono-permanencia', 'Abono de permanência na aposentadoria')
+    ]
+
+
+def _load(client, documents, version, replace=False):
+    summary = load_documents(client, documents, version=version, replace=replace, grace=0)
+    summary['collector'].join()
+    return summary
+
+
+def _postings(client, word):
+    return client.smembers(live_prefix(client) + f'search:{word}')
+
+
+def test_build_and_flip(client, corpus):
+    _load(client, corpus, '1')
+    summary = _load(client, corpus, '2')
+
+    assert client.get(CURRENT_KEY) == '2'
+    assert summary['previous'] == 'idx:1:'
+    assert verify_load(client, corpus) == []
+    assert not list(client.scan_iter(match='idx:1:*'))
+    assert client.hget('idx:2:' + STATS_KEY, 'documents') == '3'
+
+
+def test_admin_documents_carried_over(client, corpus):
+    _load(client, corpus, '1')
+    upload = dict(_document('upload-admin', 'Formulário enviado pelo administrador'),
+                  blobUrl='https://blob/upload-admin.docx')
+    update_document(client, upload)
+
+    _load(client, corpus, '2')
+    assert client.hget('idx:2:doc:upload-admin', 'blobUrl') == upload['blobUrl']
+    assert 'upload-admin' in client.smembers('idx:2:' + ALL_DOCS_KEY)
+    assert 'upload-admin' in _postings(client, 'formulario')
+
+    _load(client, corpus, '3', replace=True)
+    assert not client.exists('idx:3:doc:upload-admin')
+    assert 'upload-admin' not in _postings(client, 'formulario')
+
+
+def test_preserved_fields_survive_reload(client, corpus):
+    _load(client, corpus, '1')
+    client.hincrby('idx:1:doc:ferias', 'views', 7)
+
+    reloaded = [_document(doc['id'], doc['content'], created_at='2026-10-17T00:00:00+00:00')
+                for doc in corpus]
+    _load(client, reloaded, '2')
+    assert client.hget('idx:2:doc:ferias', 'views') == '7'
+    assert client.hget('idx:2:doc:ferias', 'createdAt') == '2024-01-01T00:00:00+00:00'
+
+
+def test_update_and_remove_document(client, corpus):
+    _load(client, corpus, '1')
+    client.hincrby('idx:1:doc:ferias', 'views', 3)
+
+    update_document(client, _document('ferias', 'Programação de férias no SIGEPE',
+                                      created_at='2026-10-17T00:00:00+00:00'))
+    assert 'ferias' in _postings(client, 'sigepe')
+    assert 'ferias' not in _postings(client, 'sougov')
+    assert client.hget('idx:1:doc:ferias', 'views') == '3'
+    assert client.hget('idx:1:doc:ferias', 'createdAt') == '2024-01-01T00:00:00+00:00'
+
+    assert remove_document(client, 'ferias') is True
+    assert not client.exists('idx:1:doc:ferias')
+    assert 'ferias' not in client.smembers('idx:1:' + ALL_DOCS_KEY)
+    assert 'ferias' not in _postings(client, 'sigepe')
+    assert client.hget('idx:1:' + STATS_KEY, 'documents') == '2'
+    assert remove_document(client, 'ferias') is False
+
+
+def test_replay_late_writes(client, corpus):
+    _load(client, corpus, '1')
+    keys = build_generation(client, corpus, '2')
+    handoff = flip_generation(client, '2', keys)
+    assert handoff['prefix'] == 'idx:1:'
+
+    # Requisições que leram index:current antes da troca e gravaram depois
+    old = handoff['prefix']
+    client.hincrby(old + 'doc:ferias', 'views', 2)
+    late = _document('upload-tardio', 'Requerimento de remoção enviado tarde')
+    client.hset(old + 'doc:upload-tardio', mapping=late)
+    client.sadd(old + ALL_DOCS_KEY, 'upload-tardio')
+    client.delete(old + 'doc:abono-permanencia')
+    client.srem(old + ALL_DOCS_KEY, 'abono-permanencia')
+
+    collect_generation(client, old, grace=0, handoff=handoff)
+
+    assert not list(client.scan_iter(match=old + '*'))
+    assert client.hget('idx:2:doc:ferias', 'views') == '2'
+    assert client.hgetall('idx:2:doc:upload-tardio')['title'] == late['title']
+    for word in search_words(late):
+        assert 'upload-tardio' in _postings(client, word)
+    assert not client.exists('idx:2:doc:abono-permanencia')
+    assert 'abono-permanencia' not in client.smembers('idx:2:' + ALL_DOCS_KEY)
+    assert client.hget('idx:2:' + STATS_KEY, 'documents') == '3'
+
+
+def test_flip_retries_after_concurrent_write(server, client, corpus, monkeypatch):
+    import carga_redis
+
+    _load(client, corpus, '1')
+    keys = build_generation(client, corpus, '2')
+
+    # Uma visualização gravada entre a leitura dos campos e o EXEC invalida o
+    # WATCH: a troca é refeita e leva a contagem nova
+    other = fakeredis.FakeRedis(server=server, decode_responses=True)
+    kept_fields = carga_redis._kept_fields
+    writes = []
+
+    def concurrent(old, fields):
+        if not writes:
+            writes.append(other.hincrby('idx:1:doc:ferias', 'views', 1))
+        return kept_fields(old, fields)
+
+    monkeypatch.setattr(carga_redis, '_kept_fields', concurrent)
+    handoff = flip_generation(client, '2', keys)
+
+    assert writes == [1]
+    assert handoff['views']['ferias'] == 1
+    assert client.hget('idx:2:doc:ferias', 'views') == '1'
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Classificação de seções (classificador_secoes.py) contra os casos rotulados e a cadeia antiga"""
+
+from classificador_secoes import (classify, corpus_texts, _legacy_header, _legacy_hints,
+                                  HEADER_MARKERS, HINT_MARKERS)
+from corpus_docs import iter_documents
+import random
+import pytest
+
+# Casos rotulados: (texto, cabeçalho esperado, indícios esperados)
+SAMPLES = (
+    ('O QUE É?', 'o_que_e', set()),
+    ('O que é a licença capacitação?', 'o_que_e', set()),
+    ('Quem tem direito?', 'quem_tem_direito', set()),
+    ('COMO SOLICITAR', 'como_solicitar', set()),
+    ('Como solicitar pelo SouGov', 'como_solicitar', set()),
+    ('Prazos', 'prazos', set()),
+    ('PRAZO PARA SOLICITAÇÃO', 'prazos', set()),
+    ('Documentação necessária', 'documentacao', set()),
+    ('Documentos exigidos', 'documentacao', set()),
+    ('Legislação', 'legislacao', set()),
+    ('Base legal', 'legislacao', set()),
+    ('Dúvidas frequentes', 'duvidas', set()),
+    ('Perguntas e respostas', 'duvidas', set()),
+    ('Contato', 'contato', set()),
+    ('Contatos: cgrh@inpi.gov.br', 'contato', {'contato'}),
+    # Prioridade: o primeiro cabeçalho da lista vence
+    ('Prazos e documentação', 'prazos', set()),
+    ('O prazo que é contado', 'o_que_e', set()),
+    # Marcadores sobrepostos
+    ('A legislação que é aplicada ao servidor público federal está listada abaixo.',
+     None, {'o_que_e'}),
+    # Parágrafos longos nunca são cabeçalhos (erro de precedência antigo)
+    ('A documentação deve ser enviada pelo processo SEI em até trinta dias '
+     'após a publicação da portaria de concessão.', None, {'legislacao'}),
+    ('Esclarecemos as dúvidas mais comuns dos servidores sobre o programa, '
+     'com exemplos práticos de preenchimento do formulário de adesão.', None, set()),
+    ('A legislação aplicável foi consolidada na instrução normativa vigente, '
+     'disponível na intranet.', None, {'legislacao'}),
+    # Indícios
+    ('O que é o abono de permanência e quando ele passa a ser devido ao servidor?',
+     None, {'o_que_e'}),
+    ('Lei nº 8.112/1990, art. 87', None, {'legislacao'}),
+    ('Decreto nº 9.991/2019', None, {'legislacao'}),
+    ('Ramal 3456 - Seção de Pagamento', None, {'contato'}),
+    ('Telefone: (21) 3037-3000', None, {'contato'}),
+    ('Envie para serap@inpi.gov.br', None, {'contato'}),
+    ('Texto comum sem nenhum marcador.', None, set()),
+    ('', None, set()),
+)
+
+# Pedaços de marcadores para montar textos com sobreposições ("ramal" + "lei"
+# vira "ramalei", que ainda contém "ale" e "lei")
+_FRAGMENTS = sorted({literal for _, literals, _ in HEADER_MARKERS for literal in literals}
+                    | {literal for _, literals in HINT_MARKERS for literal in literals}
+                    | {'a', 'e', 'o', 'ra', 'le', 'te', 'é', ' ', 'x', '?'})
+
+
+@pytest.mark.parametrize('text, header, hints', SAMPLES)
+def test_samples(text, header, hints):
+    assert classify(text) == (header, hints)
+
+
+@pytest.mark.parametrize('text, hints', [
+    ('como solicitaramalei', {'contato', 'legislacao'}),
+    ('telefonele iportaria', {'contato', 'legislacao'}),
+    ('A legislação que é aplicada ao servidor público federal está listada abaixo.', {'o_que_e'}),
+])
+def test_overlapping_markers(text, hints):
+    assert classify(text)[1] == hints == _legacy_hints(text)
+
+
+def test_fuzz_matches_legacy_hints():
+    rng = random.Random(7)
+    for _ in range(20000):
+        text = ''.join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 6)))
+        text = text.upper() if rng.random() < 0.5 else text
+        assert classify(text)[1] == _legacy_hints(text), text
+
+
+def test_corpus_matches_legacy():
+    """Só muda o erro de precedência: parágrafos longos demais deixam de ser cabeçalho"""
+    texts = corpus_texts(iter_documents())
+    if not texts:
+        pytest.skip('corpus sem documentos')
+    limits = {key: max_length for key, _, max_length in HEADER_MARKERS}
+    for text in texts:
+        header, hints = classify(text)
+        legacy = _legacy_header(text)
+        assert hints == _legacy_hints(text), text
+        if header != legacy:
+            assert header is None and len(text) >= limits[legacy], text
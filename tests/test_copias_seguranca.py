@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Repositório de cópias por conteúdo (copias_seguranca.py) em uma pasta temporária"""
+
+from copias_seguranca import (snapshot, latest_snapshot, restore_snapshot, import_legacy, prune,
+                              verify_store, load_history, store_path, LABEL_LEGACY)
+import os
+import stat
+import pytest
+
+
+@pytest.fixture
+def doc(tmp_path):
+    path = tmp_path / 'ferias.docx'
+    path.write_bytes(b'versao 1')
+    return path
+
+
+def _versions(doc):
+    return [entry['sha256'] for entry in load_history(store_path(str(doc.parent)), doc.name)]
+
+
+def test_snapshot_stores_identical_content_once(doc, tmp_path):
+    first = snapshot(str(doc))
+    assert snapshot(str(doc))['method'] == 'existente'
+    assert len(_versions(doc)) == 1
+
+    other = tmp_path / 'licenca.docx'
+    other.write_bytes(b'versao 1')
+    assert snapshot(str(other))['path'] == first['path']
+    with open(first['path'], 'rb') as f:
+        assert f.read() == b'versao 1'
+
+
+def test_latest_snapshot_and_restore(doc):
+    snapshot(str(doc))
+    doc.write_bytes(b'versao 2')
+    snapshot(str(doc))
+    with open(latest_snapshot(str(doc)), 'rb') as f:
+        assert f.read() == b'versao 2'
+
+    os.chmod(doc, 0o644)
+    doc.write_bytes(b'editado')
+    first = _versions(doc)[0]
+    restore_snapshot(str(doc), first[:12])
+    assert doc.read_bytes() == b'versao 1'
+    assert stat.S_IMODE(os.stat(doc).st_mode) == 0o644
+    # A versão editada foi guardada antes da restauração
+    assert len(_versions(doc)) == 3
+
+    with pytest.raises(KeyError):
+        restore_snapshot(str(doc), 'ffffffff')
+
+
+def test_import_legacy(doc, tmp_path):
+    (tmp_path / 'backup_ferias.docx').write_bytes(b'original antigo')
+    assert import_legacy(str(tmp_path)) == 1
+    assert import_legacy(str(tmp_path)) == 0
+    entry = load_history(store_path(str(tmp_path)), doc.name)[-1]
+    assert entry['label'] == LABEL_LEGACY
+    with open(latest_snapshot(str(doc)), 'rb') as f:
+        assert f.read() == b'original antigo'
+
+
+def test_prune_keeps_first_and_last(doc):
+    for i in range(6):
+        doc.write_bytes(f'versao {i}'.encode())
+        snapshot(str(doc))
+    versions = _versions(doc)
+
+    removed = prune(str(doc.parent), keep_last=2)
+    assert removed['versions'] == 3
+    assert removed['objects'] == 3
+    assert _versions(doc) == [versions[0]] + versions[-2:]
+    assert verify_store(str(doc.parent)) == []
+
+
+def test_verify_store_detects_damage(doc):
+    entry = snapshot(str(doc))
+    assert verify_store(str(doc.parent)) == []
+
+    os.chmod(entry['path'], 0o644)
+    with open(entry['path'], 'wb') as f:
+        f.write(b'corrompido')
+    assert [problem.endswith('corrompido') for problem in verify_store(str(doc.parent))] == [True]
+
+    os.remove(entry['path'])
+    assert [problem.endswith('ausente') for problem in verify_store(str(doc.parent))] == [True]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Documentos gravados pelo escritor_docx.py relidos pelo python-docx"""
+
+from escritor_docx import new_document, add_paragraph, add_heading, add_run, add_hyperlink, save
+from modelo_docx import build_model
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+import os
+import stat
+import pytest
+
+SOUGOV = 'https://sougov.economia.gov.br/'
+PORTAL = 'https://www.gov.br/inpi/'
+
+
+@pytest.fixture
+def written(tmp_path):
+    """Documento de exemplo gravado e relido: (parágrafos, registros do modelo, caminho)"""
+    doc = new_document()
+    add_heading(doc, 'TÍTULO DO DOCUMENTO', level=1, alignment='center')
+    add_paragraph(doc, 'Descrição com espaço depois', space_after=12)
+    add_heading(doc, 'COMO SOLICITAR?', level=2)
+    p = add_paragraph(doc, '1. Acesse o SouGov', 'List Number')
+    add_hyperlink(doc, p, ' [SouGov]', SOUGOV)
+    add_hyperlink(doc, p, ' [Portal]', PORTAL)
+    add_hyperlink(doc, p, ' [SouGov]', SOUGOV)
+    add_paragraph(doc, 'Item com marcador', 'List Bullet')
+    add_paragraph(doc, 'Primeiro bloco\n\nSegundo bloco\tcom tab')
+    add_paragraph(doc, ' espaço nas pontas ')
+    add_run(add_paragraph(doc), 'P: pergunta em negrito', bold=True)
+    add_run(add_paragraph(doc), 'R: resposta sem negrito', bold=False)
+
+    path = str(tmp_path / 'exemplo.docx')
+    save(doc, path)
+    reread = Document(path)
+    return reread.paragraphs, build_model(reread, path)['paragraphs'], path
+
+
+def test_text_and_styles(written):
+    paragraphs, _, _ = written
+    assert [(p.text, p.style.name) for p in paragraphs] == [
+        ('TÍTULO DO DOCUMENTO', 'Heading 1'),
+        ('Descrição com espaço depois', 'Normal'),
+        ('COMO SOLICITAR?', 'Heading 2'),
+        ('1. Acesse o SouGov [SouGov] [Portal] [SouGov]', 'List Number'),
+        ('Item com marcador', 'List Bullet'),
+        ('Primeiro bloco\n\nSegundo bloco\tcom tab', 'Normal'),
+        (' espaço nas pontas ', 'Normal'),
+        ('P: pergunta em negrito', 'Normal'),
+        ('R: resposta sem negrito', 'Normal'),
+    ]
+
+
+def test_paragraph_format_and_bold(written):
+    paragraphs, _, _ = written
+    assert paragraphs[0].alignment == WD_PARAGRAPH_ALIGNMENT.CENTER
+    assert paragraphs[1].paragraph_format.space_after.pt == 12
+    assert paragraphs[7].runs[0].bold is True
+    assert paragraphs[8].runs[0].bold is False
+
+
+def test_hyperlinks(written):
+    _, records, _ = written
+    assert [[link['url'] for link in record['links']] for record in records] == [
+        [], [], [], [SOUGOV, PORTAL, SOUGOV], [], [], [], [], []
+    ]
+
+
+def test_save_keeps_existing_mode(written):
+    _, _, path = written
+    os.chmod(path, 0o644)
+    save(new_document(), path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert not any(p.text for p in Document(path).paragraphs)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Ida e volta da exportação NDJSON (exportar_ndjson.py) com o database.json real"""
+
+from exportar_ndjson import (compact_document, expand_document, export_ndjson, iter_documents,
+                             read_document, find_document, load_manifest, verify_roundtrip,
+                             DATABASE_PATH)
+import json
+import pytest
+
+
+@pytest.fixture(scope='module')
+def documents():
+    with open(DATABASE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _same(before, after):
+    # Igualdade de dicts ignora a ordem das chaves; o JSON gravado não
+    return json.dumps(before, ensure_ascii=False) == json.dumps(after, ensure_ascii=False)
+
+
+def test_compact_expand_roundtrip(documents):
+    for doc in documents:
+        assert expand_document(compact_document(doc)) == doc
+        assert _same(expand_document(compact_document(doc)), doc)
+
+
+def test_compact_removes_derived_text(documents):
+    compact = [compact_document(doc) for doc in documents]
+    assert len(json.dumps(compact, ensure_ascii=False)) < len(json.dumps(documents, ensure_ascii=False))
+
+
+@pytest.mark.parametrize('shards', [1, 3])
+def test_sharded_export_roundtrip(tmp_path, documents, shards):
+    manifest = export_ndjson(documents, str(tmp_path), shards=shards)
+
+    assert len(manifest['shards']) == shards
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        manifest['shards'] + ['database.manifest.json'])
+    restored = list(iter_documents(str(tmp_path)))
+    assert restored == documents
+    assert all(_same(before, after) for before, after in zip(documents, restored))
+    assert verify_roundtrip(documents, str(tmp_path)) == []
+
+
+def test_read_with_custom_prefix(tmp_path, documents):
+    export_ndjson(documents[:2], str(tmp_path))
+    export_ndjson(documents[2:], str(tmp_path), prefix='outro', shards=2)
+
+    entry = load_manifest(str(tmp_path), 'outro')['documents'][1]
+    assert read_document(entry, str(tmp_path), 'outro') == documents[3]
+    assert find_document(documents[2]['id'], str(tmp_path), 'outro') == documents[2]
+    assert find_document(documents[2]['id'], str(tmp_path)) is None
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Índice binário (indice_binario.py) contra o índice JSON de indice_busca.py"""
+
+from indice_binario import (write_binary_index, open_binary_index, close_binary_index, find_term,
+                            postings, prefix_terms, search)
+from indice_busca import build_index, load_records, search as json_search, DATABASE_PATH
+from benchmark_busca import DEFAULT_QUERIES, scale_records
+import pytest
+
+# Palavras maiores que o prefixo da tabela: só completam o que começa com elas
+QUERIES = DEFAULT_QUERIES + ['aposentado', 'aposentadoxyz', 'licenca capacitacaozz']
+
+
+@pytest.fixture(scope='module', params=[1, 7], ids=['corpus', 'corpus-x7'])
+def indexes(request, tmp_path_factory):
+    index = build_index(scale_records(load_records(DATABASE_PATH), request.param))
+    path = str(tmp_path_factory.mktemp('binario') / 'indice.bin')
+    write_binary_index(index, path)
+    reader = open_binary_index(path)
+    yield index, reader
+    close_binary_index(reader)
+
+
+def test_postings_match_json(indexes):
+    index, reader = indexes
+    for term, entries in index['terms'].items():
+        i = find_term(reader, term)
+        assert i is not None, term
+        assert postings(reader, i) == sorted(entries), term
+    assert find_term(reader, 'zzzinexistente') is None
+
+
+def test_prefixes_match_json(indexes):
+    index, reader = indexes
+    for prefix, expected in index['prefixes'].items():
+        assert [term for term, _ in prefix_terms(reader, prefix)] == expected, prefix
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_matches_json(indexes, query):
+    index, reader = indexes
+    assert search(reader, query) == json_search(index, query)
+
+
+def test_long_prefix_beyond_table(tmp_path):
+    """Mais de MAX_TERMS_PER_PREFIX termos com o mesmo prefixo de 8 letras"""
+    common = [f'capacitador{letter}' for letter in 'abcdefghijkl']
+    records = [{'id': f'doc-{i}', 'title': ' '.join(common), 'keywords': '', 'description': ''}
+               for i in range(3)]
+    records.append({'id': 'raro', 'title': 'capacitacaoxyz', 'keywords': '', 'description': ''})
+    index = build_index(records)
+    assert 'capacitacaoxyz' not in index['prefixes']['capacita']
+
+    path = str(tmp_path / 'indice.bin')
+    write_binary_index(index, path)
+    reader = open_binary_index(path)
+    try:
+        for query in ('capacitacao', 'capacitacaox'):
+            assert [doc for doc, _ in json_search(index, query)] == ['raro'], query
+            assert search(reader, query) == json_search(index, query), query
+        assert len(json_search(index, 'capacitador')) == 3
+        assert search(reader, 'capacitador') == json_search(index, 'capacitador')
+    finally:
+        close_binary_index(reader)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Leitura rápida (leitura_rapida.py) contra o python-docx nos documentos do corpus"""
+
+from leitura_rapida import scan_document, scan_with_python_docx, iter_content
+from reformatar_docs import extract_content_with_links
+from corpus_docs import iter_documents
+import pytest
+
+DOCUMENTS = [doc['path'] for doc in iter_documents()]
+
+
+@pytest.mark.parametrize('doc_path', DOCUMENTS)
+def test_counts_match_python_docx(doc_path):
+    assert scan_document(doc_path) == scan_with_python_docx(doc_path)
+
+
+@pytest.mark.parametrize('doc_path', DOCUMENTS)
+def test_streamed_content_matches_extraction(doc_path):
+    assert list(iter_content(doc_path)) == extract_content_with_links(doc_path)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Cronômetros, contadores e exportação (metricas.py)"""
+
+import metricas
+import json
+import os
+import stat
+import time
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    metricas.reset()
+    yield
+    metricas.reset()
+
+
+def test_nested_timers_split_own_time():
+    with metricas.timer('externo'):
+        time.sleep(0.02)
+        with metricas.timer('interno'):
+            time.sleep(0.05)
+    timers = metricas.export()['timers']
+    assert timers['externo']['seconds'] >= timers['interno']['seconds'] >= 0.05
+    assert timers['externo']['own_seconds'] == pytest.approx(
+        timers['externo']['seconds'] - timers['interno']['seconds'])
+    assert timers['interno']['own_seconds'] == timers['interno']['seconds']
+
+
+def test_timed_iter_ignores_the_consumer():
+    def produce():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    for _ in metricas.timed_iter('producao', produce()):
+        time.sleep(0.03)
+    entry = metricas.export()['timers']['producao']
+    assert entry['calls'] == 1
+    assert 0.03 <= entry['seconds'] < 0.09
+
+
+def test_merge_sums_worker_metrics():
+    metricas.count('erros')
+    with metricas.timer('leitura'):
+        pass
+    worker = {
+        'timers': {'leitura': {'calls': 2, 'seconds': 1.0, 'own_seconds': 0.5, 'max_seconds': 0.75}},
+        'counters': {'erros': 2, 'links_restaurados': 4}
+    }
+    metricas.merge(worker)
+    data = metricas.export()
+    assert data['timers']['leitura']['calls'] == 3
+    assert data['timers']['leitura']['max_seconds'] == 0.75
+    assert data['counters'] == {'erros': 3, 'links_restaurados': 4}
+
+
+def test_prometheus_format():
+    data = {
+        'timers': {'escrita': {'calls': 2, 'seconds': 1.5, 'own_seconds': 1.0, 'max_seconds': 1.0}},
+        'counters': {'links restaurados': 3, 'memoria_pico_bytes': 1024},
+        'gauges': ['memoria_pico_bytes']
+    }
+    text = metricas.to_prometheus(data)
+    assert 'concierge_etapa_segundos_total{etapa="escrita"} 1.5' in text
+    assert 'concierge_etapa_chamadas_total{etapa="escrita"} 2' in text
+    assert '# TYPE concierge_links_restaurados_total counter' in text
+    assert 'concierge_memoria_pico_bytes 1024' in text
+    assert '# TYPE concierge_memoria_pico_bytes gauge' in text
+
+
+def test_write_metrics(tmp_path):
+    metricas.count('documentos', 2)
+    json_path = str(tmp_path / 'metricas.json')
+    prom_path = str(tmp_path / 'metricas.prom')
+    metricas.write_metrics(json_path)
+    metricas.write_metrics(prom_path)
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        assert json.load(f)['counters'] == {'documentos': 2}
+    with open(prom_path, 'r', encoding='utf-8') as f:
+        assert 'concierge_documentos_total 2' in f.read()
+    # O textfile collector roda com outro usuário: o arquivo não pode ficar 0600
+    assert stat.S_IMODE(os.stat(prom_path).st_mode) & 0o044
+
+
+def test_format_for():
+    assert metricas.format_for('saida/metricas.prom') == 'prometheus'
+    assert metricas.format_for('saida/metricas.json') == 'json'
+    assert metricas.format_for('saida/metricas.txt', 'prometheus') == 'prometheus'
+
+
+def _worker_task(n):
+    metricas.count('documentos', n)
+    return n * 2
+
+
+def test_run_collected_starts_from_zero():
+    metricas.count('documentos', 10)
+    result, data = metricas.run_collected(_worker_task, 3)
+    assert result == 6
+    assert data['counters'] == {'documentos': 3}
+
+
+def test_summary_orders_by_own_time():
+    data = {
+        'timers': {'leitura': {'calls': 1, 'seconds': 2.0, 'own_seconds': 0.5, 'max_seconds': 2.0},
+                   'escrita': {'calls': 4, 'seconds': 1.0, 'own_seconds': 1.0, 'max_seconds': 0.5}},
+        'counters': {'erros': 1}
+    }
+    lines = metricas.summary(data).splitlines()
+    assert lines[0].startswith('ETAPA')
+    assert [line.split()[0] for line in lines[1:3]] == ['escrita', 'leitura']
+    assert lines[3].split() == ['erros', '1']
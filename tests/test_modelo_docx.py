@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Cache de leitura do modelo_docx.py: uma leitura por versão do arquivo, uma cópia por chamador"""
+
+from modelo_docx import load_document, body_paragraphs, table_paragraphs, clear_cache
+from escritor_docx import new_document, add_paragraph, add_hyperlink, save
+from docx import Document
+import metricas
+import pytest
+
+SOUGOV = 'https://sougov.economia.gov.br/'
+
+
+@pytest.fixture
+def doc_path(tmp_path):
+    clear_cache()
+    metricas.reset()
+    doc = new_document()
+    add_hyperlink(doc, add_paragraph(doc, 'Acesse o'), ' SouGov', SOUGOV)
+    path = str(tmp_path / 'exemplo.docx')
+    save(doc, path)
+    # O escritor não grava tabelas: a célula entra pelo python-docx
+    with_table = Document(path)
+    with_table.add_table(rows=1, cols=1).cell(0, 0).text = 'Célula'
+    with_table.save(path)
+    yield path
+    clear_cache()
+    metricas.reset()
+
+
+def test_callers_get_independent_copies(doc_path):
+    first = load_document(doc_path)
+    body_paragraphs(first)[0]['links'].append({'text': 'x', 'url': 'https://exemplo/'})
+    first['links'].clear()
+    first['paragraphs'][0]['text'] = 'alterado'
+
+    second = load_document(doc_path)
+    assert second['paragraphs'][0]['text'] == 'Acesse o SouGov'
+    assert body_paragraphs(second)[0]['links'] == [{'text': ' SouGov', 'url': SOUGOV}]
+    assert [link['url'] for link in second['links']] == [SOUGOV]
+    assert metricas.export()['timers']['leitura']['calls'] == 1
+
+
+def test_copy_keeps_shared_records(doc_path):
+    model = load_document(doc_path)
+    # A célula é o mesmo registro em 'paragraphs' e em 'tables'
+    assert model['tables'][0][0][0][0] is table_paragraphs(model)[0]
+
+
+def test_cache_follows_file_changes(doc_path):
+    load_document(doc_path)
+    doc = new_document()
+    add_paragraph(doc, 'Outro conteúdo, com outro tamanho')
+    save(doc, doc_path)
+    assert load_document(doc_path)['paragraphs'][0]['text'] == 'Outro conteúdo, com outro tamanho'
+    assert metricas.export()['timers']['leitura']['calls'] == 2
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Processos de trabalho de reformatar_docs.process_batch: queda, tempo limite e métricas"""
+
+import reformatar_docs
+import metricas
+import multiprocessing
+import os
+import time
+import pytest
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='o teste troca process_single_doc antes do fork')
+
+
+def _fake_single_doc(doc_name, docs_dir):
+    """Documentos de mentira: 'cai' derruba o processo e 'trava' passa do tempo limite"""
+    if doc_name == 'cai.docx':
+        os._exit(3)
+    if doc_name == 'trava.docx':
+        time.sleep(30)
+    metricas.count('documentos')
+    return {'file': doc_name, 'status': 'success', 'pid': os.getpid()}
+
+
+@pytest.fixture(autouse=True)
+def fake(monkeypatch):
+    monkeypatch.setattr(reformatar_docs, 'process_single_doc', _fake_single_doc)
+    metricas.reset()
+    yield
+    metricas.reset()
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_crash_and_timeout_only_mark_their_document(workers):
+    docs = ['a.docx', 'cai.docx', 'b.docx', 'trava.docx', 'c.docx']
+    started = time.monotonic()
+    results = reformatar_docs.process_batch(docs, '.', workers=workers, timeout=1)
+    assert time.monotonic() - started < 10
+
+    assert [result['file'] for result in results] == docs
+    assert [result['status'] for result in results] == ['success', 'error', 'success', 'error', 'success']
+    assert 'código 3' in results[1]['error']
+    assert results[3]['error'] == 'Tempo esgotado (1s)'
+    # Cada documento roda isolado, fora do processo principal
+    assert len({result['pid'] for result in results if 'pid' in result} | {os.getpid()}) == 4
+
+    counters = metricas.export()['counters']
+    assert counters == {'documentos': 3, 'erros': 2}
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Resumos, posições e trechos (resumos.py) sobre o src/database.json"""
+
+from resumos import (build_summaries, hit_payload, snippet, summary_record, write_summaries,
+                     load_summaries, _WORD, SNIPPET_LENGTH)
+from servidor_busca import build_search_index, query_words, search_ids, render
+from carga_redis import document_from_database
+from indice_busca import tokenize, DATABASE_PATH
+from benchmark_busca import DEFAULT_QUERIES
+import json
+import pytest
+
+
+@pytest.fixture(scope='module')
+def documents():
+    with open(DATABASE_PATH, 'r', encoding='utf-8') as f:
+        return [document_from_database(doc) for doc in json.load(f)]
+
+
+@pytest.fixture(scope='module')
+def summaries(documents):
+    return build_summaries(documents)
+
+
+def test_positions_point_at_their_terms(summaries):
+    for doc_id, record in summaries.items():
+        text = record['text']
+        for term, offsets in record['positions'].items():
+            for offset in offsets:
+                match = _WORD.match(text, offset)
+                assert match and term in tokenize(match.group()), (doc_id, term, offset)
+
+
+def test_highlights_are_query_words(documents, summaries):
+    index = build_search_index(documents, 1)
+    full_bytes = light_bytes = 0
+    for query in DEFAULT_QUERIES:
+        words = query_words(query)
+        ids = search_ids(index, words)
+        hits = [hit_payload(summaries[doc_id], words) for doc_id in ids]
+        for hit in hits:
+            marked = hit['snippet']['text']
+            for start, end in hit['snippet']['highlights']:
+                assert set(tokenize(marked[start:end])) & set(words), (query, hit['id'])
+            assert 'sections' not in hit
+        full_bytes += len(render(index, ids))
+        light_bytes += len(json.dumps(hits, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    # A resposta leve é bem menor que a dos documentos completos
+    assert light_bytes < full_bytes / 10
+
+
+def test_snippet_window():
+    text = ('Introdução sem termos. ' * 20 + 'A licença capacitação exige plano de capacitação. '
+            + 'Texto final. ' * 20)
+    record = summary_record({'id': 'x', 'content': text})
+    result = snippet(record, ['capacitacao'])
+    assert result['text'].startswith('…') and result['text'].endswith('…')
+    assert len(result['text']) <= SNIPPET_LENGTH + 2
+    assert [result['text'][start:end] for start, end in result['highlights']] == \
+        ['capacitação', 'capacitação']
+
+    assert snippet(record, ['inexistente'])['text'].startswith('Introdução')
+
+
+def test_write_and_load(summaries, tmp_path):
+    path = str(tmp_path / 'resumos.json')
+    write_summaries(summaries, path)
+    assert load_summaries(path) == summaries
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Servidor de busca (servidor_busca.py) contra uma transcrição direta de api/search.ts"""
+
+from servidor_busca import (database_source, open_service, start, query_words, _title_key,
+                            MIN_RESULTS, HOST)
+from carga_redis import search_words
+from indice_busca import DATABASE_PATH
+from benchmark_busca import DEFAULT_QUERIES
+from manifesto import atomic_write
+from urllib.parse import quote
+import asyncio
+import json
+import shutil
+import pytest
+
+QUERIES = DEFAULT_QUERIES + ['aposentadoria', 'SouGov', 'ab', 'pagamento-férias!', 'xyzxyz']
+
+
+def reference_search(documents, query):
+    """Transcrição direta de api/search.ts sobre os hashes (sem índice nem cache)"""
+    words = query_words(query)
+    if not words:
+        return []
+    by_id = {document['id']: document for document in documents}
+    matching = []
+    for word in words:
+        for document in documents:
+            if word in search_words(document) and document['id'] not in matching:
+                matching.append(document['id'])
+    if len(matching) < MIN_RESULTS:
+        for document in documents:
+            if document['id'] not in matching and any(
+                    word in _title_key(document['title']) for word in words):
+                matching.append(document['id'])
+    scored = []
+    for doc_id in matching:
+        doc = by_id[doc_id]
+        if not doc.get('title'):
+            continue
+        text = f"{doc['title']} {doc['keywords']} {doc['description']}".lower()
+        scored.append((doc_id, sum(text.count(word) for word in words)))
+    scored.sort(key=lambda item: -item[1])
+    return [doc_id for doc_id, _ in scored]
+
+
+async def _get(port, target, method='GET'):
+    """Cliente mínimo: (status, cabeçalhos, corpo)"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return int(lines[0].split()[1]), headers, body
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'database.json'
+    shutil.copyfile(DATABASE_PATH, path)
+    return str(path)
+
+
+def _serve(database, scenario):
+    """Sobe o servidor em porta livre e roda scenario(service, port, documentos)"""
+    async def main():
+        source = database_source(database)
+        service = open_service(source)
+        server, watcher = await start(service, port=0, reload_interval=0.1)
+        try:
+            await scenario(service, server.sockets[0].getsockname()[1], source['load']())
+        finally:
+            watcher.cancel()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_search_matches_reference(database):
+    async def scenario(service, port, documents):
+        for query in QUERIES:
+            expected = reference_search(documents, query)
+            status_code, _, body = await _get(port, f'/api/search?q={quote(query)}')
+            assert status_code == 200
+            assert [doc['id'] for doc in json.loads(body)] == expected, query
+
+            status_code, _, body = await _get(port, f'/api/search/hits?q={quote(query)}')
+            hits = json.loads(body)
+            assert status_code == 200
+            assert [hit['id'] for hit in hits] == expected, query
+            assert not any('sections' in hit for hit in hits)
+
+    _serve(database, scenario)
+
+
+def test_document_endpoint(database):
+    async def scenario(service, port, documents):
+        first = documents[0]['id']
+        status_code, _, body = await _get(port, f'/api/document?id={quote(first)}')
+        assert status_code == 200
+        assert json.loads(body) == json.loads(service['index']['docs'][first]['json'])
+        status_code, _, _ = await _get(port, '/api/document?id=inexistente')
+        assert status_code == 404
+
+    _serve(database, scenario)
+
+
+def test_cache_and_status_codes(database):
+    async def scenario(service, port, documents):
+        target = f'/api/search?q={quote(QUERIES[0])}'
+        _, headers, _ = await _get(port, target)
+        assert headers.get('x-cache') == 'MISS'
+        _, headers, _ = await _get(port, target)
+        assert headers.get('x-cache') == 'HIT'
+
+        for target, method, code in (('/api/search', 'GET', 400), ('/api/search?q=', 'GET', 400),
+                                     ('/api/search?q=de', 'GET', 200),
+                                     ('/api/search?q=ferias', 'POST', 405), ('/outra', 'GET', 404)):
+            status_code, _, _ = await _get(port, target, method)
+            assert status_code == code, (method, target)
+
+    _serve(database, scenario)
+
+
+def test_reload_picks_up_new_documents(database):
+    async def scenario(service, port, documents):
+        with open(database, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.append({'id': 'documento-novo', 'title': 'Documento Novo', 'keywords': 'zzquokka',
+                     'description': 'Inserido durante o teste', 'sections': []})
+        with atomic_write(database) as f:
+            json.dump(data, f, ensure_ascii=False)
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if service['index']['generation'] > 1:
+                break
+
+        _, headers, body = await _get(port, '/api/search?q=zzquokka')
+        assert [doc['id'] for doc in json.loads(body)] == ['documento-novo']
+        assert headers.get('x-index-generation') == '2'
+
+    _serve(database, scenario)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Verificador de links (verificar_links.py) contra um servidor HTTP local"""
+
+from verificar_links import check_links, MAX_PER_HOST
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+import pytest
+
+# Tempo limite das verificações; /lento responde depois disso
+TIMEOUT = 0.5
+
+
+@pytest.fixture(scope='module')
+def stub():
+    """Servidor em porta livre: {'base', 'connections', 'active', 'peak', 'starts'}"""
+    state = {'connections': [], 'active': 0, 'peak': 0, 'starts': []}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            state['connections'].append(self.client_address)
+            super().setup()
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body=b'', headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def _route(self):
+            path = self.path.split('?')[0]
+            if path == '/ok':
+                self._reply(200, b'ok')
+            elif path == '/sem-head':
+                self._reply(405 if self.command == 'HEAD' else 200, b'ok')
+            elif path == '/redireciona':
+                self._reply(302, headers=[('Location', '/ok')])
+            elif path == '/lento':
+                time.sleep(TIMEOUT * 2)
+                self._reply(200, b'ok')
+            elif path == '/contado':
+                with lock:
+                    state['active'] += 1
+                    state['peak'] = max(state['peak'], state['active'])
+                    state['starts'].append(time.monotonic())
+                time.sleep(0.05)
+                with lock:
+                    state['active'] -= 1
+                self._reply(200, b'ok')
+            else:
+                self._reply(404, b'nao encontrado')
+
+        do_HEAD = _route
+        do_GET = _route
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state['base'] = f'http://127.0.0.1:{server.server_address[1]}'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _check(urls, **kwargs):
+    kwargs.setdefault('interval', 0)
+    kwargs.setdefault('timeout', TIMEOUT)
+    return check_links(urls, **kwargs)
+
+
+def test_ok_and_head_fallback(stub):
+    results, _ = _check([f"{stub['base']}/ok", f"{stub['base']}/sem-head"])
+    assert results[f"{stub['base']}/ok"]['status'] == 200
+    assert results[f"{stub['base']}/sem-head"]['ok'] is True
+
+
+def test_redirect(stub):
+    url = f"{stub['base']}/redireciona"
+    results, _ = _check([url])
+    assert results[url]['ok'] is True
+    assert results[url]['final_url'] == f"{stub['base']}/ok"
+
+
+def test_not_found(stub):
+    url = f"{stub['base']}/nao-existe"
+    results, _ = _check([url])
+    assert results[url]['ok'] is False
+    assert results[url]['status'] == 404
+
+
+def test_timeout(stub):
+    url = f"{stub['base']}/lento"
+    results, _ = _check([url])
+    assert results[url]['ok'] is False
+    assert results[url]['error'] == 'tempo esgotado'
+
+
+def test_mailto():
+    results, stats = _check(['mailto:serap@inpi.gov.br', 'mailto:sem-arroba'])
+    assert results['mailto:serap@inpi.gov.br']['ok'] is True
+    assert results['mailto:sem-arroba']['ok'] is False
+    assert stats['connections'] == 0
+
+
+def test_per_host_limit_and_pool(stub):
+    urls = [f"{stub['base']}/contado?pagina={i}" for i in range(20)]
+    stub['peak'] = 0
+    results, stats = _check(urls, concurrency=20, per_host=2)
+    assert all(result['ok'] for result in results.values())
+    assert stub['peak'] <= 2
+    # As conexões do pool são reaproveitadas entre as URLs do mesmo host
+    assert stats['connections'] <= 2 + 2
+
+
+def test_per_host_interval(stub):
+    urls = [f"{stub['base']}/contado?intervalo={i}" for i in range(5)]
+    stub['starts'].clear()
+    _check(urls, per_host=MAX_PER_HOST, interval=0.1)
+    starts = sorted(stub['starts'])
+    assert len(starts) == 5
+    assert all(b - a >= 0.08 for a, b in zip(starts, starts[1:]))
+
+
+def test_cache_skips_fresh_results(stub):
+    urls = [f"{stub['base']}/ok", f"{stub['base']}/nao-existe"]
+    cache = {}
+    _check(urls, cache=cache)
+    _, stats = _check(urls, cache=cache)
+    assert stats['checked'] == 0
+    assert stats['cached'] == 2
@@ -4,69 +4,22 @@
 Script de Validação - Verifica preservação de links e estrutura
 """
 
-from docx import Document
-from docx.oxml.ns import qn
-import os
+from leitura_rapida import scan_document
+from manifesto import load_manifest, save_manifest, default_manifest_path, run_stage
+from corpus_docs import add_arguments, from_args, manifest_dir
+import argparse
 
 def validate_document(doc_path):
-    """Valida estrutura e links de um documento"""
+    """Valida estrutura e links de um documento
+
+    Usa a leitura rápida (direto do ZIP), que produz as mesmas contagens do
+    python-docx (conferido em tests/test_leitura_rapida.py)
+    """
     try:
-        doc = Document(doc_path)
-        
-        # Contar seções (Heading 2)
-        sections = []
-        paragraphs = 0
-        links = 0
-        
-        for para in doc.paragraphs:
-            if para.text.strip():
-                paragraphs += 1
-                
-                # Identificar seções
-                if para.style and 'Heading 2' in para.style.name:
-                    sections.append(para.text.strip())
-                
-                # Contar hyperlinks
-                for hyperlink in para._element.xpath('.//w:hyperlink'):
-                    r_id = hyperlink.get(qn('r:id'))
-                    if r_id and r_id in para.part.rels:
-                        links += 1
-        
-        return {
-            'sections': sections,
-            'section_count': len(sections),
-            'paragraphs': paragraphs,
-            'links': links
-        }
+        return scan_document(doc_path)
     except Exception as e:
         return {'error': str(e)}
 
-# Documentos
-docs_list = [
-    "Aposentadoria e Abono.docx",
-    "Capacitação.docx",
-    "Carta de Serviços.docx",
-    "Dados Cadastrais.docx",
-    "Estágio Probatório.docx",
-    "Frequência.docx",
-    "Férias.docx",
-    "Licenças.docx",
-    "Pagamento.docx",
-    "Programa de Gestão e Desempenho.docx",
-    "Remoção.docx",
-    "Retribuição por Titulação.docx",
-    "Saúde Ocupacional.docx",
-    "Seleção Interna e Externa.docx",
-    "Utilização do SouGov.docx"
-]
-
-docs_dir = r"C:\Users\Davison.DESKTOP-7GLJO2G\Documents\concierge-cgrh\docs"
-
-print("="*80)
-print("VALIDAÇÃO DE DOCUMENTOS REFORMATADOS")
-print("="*80)
-print()
-
 # Seções esperadas
 expected_sections = [
     'O QUE É?',
@@ -79,27 +32,44 @@ expected_sections = [
     'CONTATO'
 ]
 
-for doc_name in docs_list:
-    print(f"📄 {doc_name}")
-    print("-" * 80)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Valida os documentos reformatados')
+    parser.add_argument('--force', action='store_true',
+                        help='Revalida mesmo os documentos que não mudaram')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    manifest = load_manifest(default_manifest_path(manifest_dir(args)))
+
+    print("="*80)
+    print("VALIDAÇÃO DE DOCUMENTOS REFORMATADOS")
+    print("="*80)
+    print()
+
+    for doc in from_args(args):
+        print(f"📄 {doc['name']}")
+        print("-" * 80)
     
-    # Validar documento reformatado
-    doc_path = os.path.join(docs_dir, doc_name)
-    result = validate_document(doc_path)
+        # Validar documento reformatado
+        doc_path = doc['path']
+        result, _ = run_stage(manifest, 'validacao', doc_path,
+                              lambda: validate_document(doc_path), force=args.force)
     
-    if 'error' in result:
-        print(f"   ❌ ERRO: {result['error']}")
-    else:
-        print(f"   ✅ Seções encontradas: {result['section_count']}")
-        print(f"   📝 Parágrafos: {result['paragraphs']}")
-        print(f"   🔗 Links preservados: {result['links']}")
-        print(f"   📋 Seções:")
-        for sec in result['sections']:
-            indicator = "✅" if sec in expected_sections else "ℹ️"
-            print(f"      {indicator} {sec}")
+        if 'error' in result:
+            print(f"   ❌ ERRO: {result['error']}")
+        else:
+            print(f"   ✅ Seções encontradas: {result['section_count']}")
+            print(f"   📝 Parágrafos: {result['paragraphs']}")
+            print(f"   🔗 Links preservados: {result['links']}")
+            print(f"   📋 Seções:")
+            for sec in result['sections']:
+                indicator = "✅" if sec in expected_sections else "ℹ️"
+                print(f"      {indicator} {sec}")
     
-    print()
+        print()
+
+    save_manifest(manifest)
 
-print("="*80)
-print("✅ VALIDAÇÃO CONCLUÍDA")
-print("="*80)
+    print("="*80)
+    print("✅ VALIDAÇÃO CONCLUÍDA")
+    print("="*80)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Verificação de Links - Concierge RH Digital INPI
+Confere se os hyperlinks dos documentos (extract_all_hyperlinks) e do
+src/database.json ainda respondem. As URLs são deduplicadas no corpus todo e
+verificadas com asyncio (só biblioteca padrão): HEAD com recurso a GET,
+redirecionamentos, concorrência limitada, pool de conexões keep-alive e
+intervalo mínimo entre requisições por host. Os resultados ficam em um
+cache com validade (TTL), então execuções seguidas não repetem requisições.
+"""
+
+from restaurar_links import extract_all_hyperlinks
+from modelo_docx import load_document
+from corpus_docs import add_arguments, from_args, manifest_dir
+from manifesto import atomic_write
+from urllib.parse import urlsplit, urljoin, quote, unquote
+import argparse
+import asyncio
+import json
+import os
+import re
+import ssl
+import time
+
+MAX_CONCURRENCY = 20
+MAX_PER_HOST = 4
+# Segundos entre o início de duas requisições ao mesmo host
+MIN_HOST_INTERVAL = 0.2
+TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+
+# Corpos de resposta maiores que isto não são lidos: a conexão é fechada
+MAX_BODY_DRAIN = 64 * 1024
+
+# Validade do cache: links bons por um dia, falhas por uma hora
+CACHE_TTL = 24 * 3600
+ERROR_TTL = 3600
+CACHE_NAME = '.links_verificados.json'
+
+USER_AGENT = 'ConciergeRH-VerificadorLinks/1.0'
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+# Servidores que recusam HEAD mas atendem GET
+_RETRY_WITH_GET = (400, 403, 405, 501)
+_MAILTO = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# ---------------------------------------------------------------------------
+# Coleta dos links
+# ---------------------------------------------------------------------------
+
+def collect_docx_links(documents, links=None):
+    """{url: [{'document', 'text'}]} a partir dos .docx do corpus"""
+    links = {} if links is None else links
+    for doc in documents:
+        for link in extract_all_hyperlinks(load_document(doc['path'])):
+            links.setdefault(link['url'], []).append({'document': doc['name'], 'text': link['text']})
+    return links
+
+def _walk_links(value):
+    if isinstance(value, dict):
+        for link in value.get('links', []) or []:
+            yield link
+        for child in value.values():
+            if isinstance(child, (dict, list)):
+                yield from _walk_links(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk_links(child)
+
+def collect_database_links(database_path, links=None):
+    """{url: [{'document', 'text'}]} a partir das seções do database.json"""
+    links = {} if links is None else links
+    with open(database_path, 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    for doc in database:
+        for link in _walk_links(doc.get('sections', [])):
+            links.setdefault(link['url'], []).append({'document': doc['id'], 'text': link.get('text', '')})
+        if doc.get('externalLink'):
+            links.setdefault(doc['externalLink'], []).append({'document': doc['id'], 'text': '(link externo)'})
+    return links
+
+# ---------------------------------------------------------------------------
+# Cache com validade
+# ---------------------------------------------------------------------------
+
+def load_cache(cache_path):
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_cache(cache, cache_path):
+    """Grava o cache de forma atômica (arquivo temporário + rename)"""
+    with atomic_write(cache_path, prefix='.links-') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+def is_fresh(entry, now, ttl=CACHE_TTL, error_ttl=ERROR_TTL):
+    limit = ttl if entry.get('ok') else error_ttl
+    return now - entry.get('checked_at', 0) < limit
+
+# ---------------------------------------------------------------------------
+# Cliente HTTP assíncrono com pool por host
+# ---------------------------------------------------------------------------
+
+def _new_pool(limit):
+    return {
+        'idle': [],
+        'slots': asyncio.Semaphore(limit),
+        'lock': asyncio.Lock(),
+        'next_start': 0.0,
+        'opened': 0
+    }
+
+async def _throttle(pool, interval):
+    """Espera a vez do host (intervalo mínimo entre inícios de requisição)"""
+    loop = asyncio.get_running_loop()
+    async with pool['lock']:
+        now = loop.time()
+        wait = pool['next_start'] - now
+        pool['next_start'] = max(now, pool['next_start']) + interval
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+async def _exchange(reader, writer, method, host, path):
+    """Envia a requisição e lê a resposta; devolve (status, headers, reutilizável)"""
+    writer.write((f"{method} {path} HTTP/1.1\r\n"
+                  f"Host: {host}\r\n"
+                  f"User-Agent: {USER_AGENT}\r\n"
+                  f"Accept: */*\r\n"
+                  f"Connection: keep-alive\r\n\r\n").encode('ascii'))
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('conexão fechada pelo servidor')
+    version, status = status_line.decode('latin-1').split(None, 2)[:2]
+    status = int(status)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    keep = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if method == 'HEAD' or status in (204, 304) or status < 200:
+        return status, headers, keep
+    length = headers.get('content-length')
+    if length is not None and length.isdigit() and int(length) <= MAX_BODY_DRAIN:
+        await reader.readexactly(int(length))
+        return status, headers, keep
+    # Corpo grande ou chunked: mais barato fechar do que ler
+    return status, headers, False
+
+async def _request(checker, method, url):
+    """Uma requisição HTTP(S) usando o pool de conexões do host"""
+    parts = urlsplit(url)
+    tls = parts.scheme == 'https'
+    host = parts.hostname.encode('idna').decode('ascii')
+    port = parts.port or (443 if tls else 80)
+    host_header = host if parts.port is None else f'{host}:{port}'
+    path = quote(parts.path or '/', safe="/%:@!$&'()*+,;=~-._")
+    if parts.query:
+        path += '?' + quote(parts.query, safe="/%:@!$&'()*+,;=~-._?")
+
+    pool = checker['pools'].get((parts.scheme, host, port))
+    if pool is None:
+        pool = checker['pools'][(parts.scheme, host, port)] = _new_pool(checker['per_host'])
+
+    async with pool['slots']:
+        await _throttle(pool, checker['interval'])
+        for attempt in (0, 1):
+            reused = bool(pool['idle'])
+            if reused:
+                reader, writer = pool['idle'].pop()
+            else:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=checker['ssl'] if tls else None,
+                                            server_hostname=host if tls else None),
+                    checker['timeout'])
+                pool['opened'] += 1
+            try:
+                status, headers, keep = await asyncio.wait_for(
+                    _exchange(reader, writer, method, host_header, path), checker['timeout'])
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                # Conexão keep-alive encerrada pelo servidor enquanto ociosa
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep:
+                pool['idle'].append((reader, writer))
+            else:
+                writer.close()
+            return status, headers
+
+def _result(url, ok, status=None, error=None, final_url=None):
+    return {'url': url, 'ok': ok, 'status': status, 'error': error,
+            'final_url': final_url, 'checked_at': time.time()}
+
+async def check_url(checker, url):
+    """Verifica uma URL: mailto pela sintaxe, http(s) por HEAD/GET"""
+    scheme = urlsplit(url).scheme.lower()
+    if scheme == 'mailto':
+        address = unquote(url[len('mailto:'):].split('?')[0]).strip()
+        if _MAILTO.match(address):
+            return _result(url, True)
+        return _result(url, False, error='endereço de e-mail inválido')
+    if scheme not in ('http', 'https') or not urlsplit(url).hostname:
+        return _result(url, None, error='esquema não verificado')
+
+    current = url
+    method = 'HEAD'
+    for _ in range(MAX_REDIRECTS + 2):
+        try:
+            status, headers = await _request(checker, method, current)
+        except asyncio.TimeoutError:
+            return _result(url, False, error='tempo esgotado')
+        except (OSError, ssl.SSLError, ValueError, UnicodeError) as e:
+            return _result(url, False, error=str(e) or type(e).__name__)
+
+        if status in _REDIRECTS and headers.get('location'):
+            current = urljoin(current, headers['location'])
+            continue
+        if method == 'HEAD' and status in _RETRY_WITH_GET:
+            method = 'GET'
+            continue
+        return _result(url, status < 400, status=status,
+                       final_url=current if current != url else None)
+    return _result(url, False, error='redirecionamentos demais')
+
+async def _check_all(urls, concurrency, per_host, interval, timeout):
+    checker = {
+        'pools': {},
+        'ssl': ssl.create_default_context(),
+        'per_host': per_host,
+        'interval': interval,
+        'timeout': timeout
+    }
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with gate:
+            return await check_url(checker, url)
+
+    try:
+        results = await asyncio.gather(*(one(url) for url in urls))
+    finally:
+        for pool in checker['pools'].values():
+            for _, writer in pool['idle']:
+                writer.close()
+    connections = sum(pool['opened'] for pool in checker['pools'].values())
+    return results, connections
+
+def check_links(urls, cache=None, concurrency=MAX_CONCURRENCY, per_host=MAX_PER_HOST,
+                interval=MIN_HOST_INTERVAL, timeout=TIMEOUT, ttl=CACHE_TTL, error_ttl=ERROR_TTL):
+    """Verifica as URLs (deduplicadas), reaproveitando o cache ainda válido
+
+    Devolve ({url: resultado}, estatísticas). O cache recebido é atualizado.
+    """
+    cache = {} if cache is None else cache
+    now = time.time()
+    unique = list(dict.fromkeys(urls))
+    pending = [url for url in unique
+               if url not in cache or not is_fresh(cache[url], now, ttl, error_ttl)]
+
+    start = time.perf_counter()
+    results, connections = asyncio.run(
+        _check_all(pending, concurrency, per_host, interval, timeout)) if pending else ([], 0)
+    for result in results:
+        cache[result['url']] = result
+
+    stats = {
+        'urls': len(unique),
+        'checked': len(pending),
+        'cached': len(unique) - len(pending),
+        'connections': connections,
+        'seconds': time.perf_counter() - start
+    }
+    return {url: cache[url] for url in unique}, stats
+
+def broken_by_document(links, results):
+    """{documento: [{'text', 'url', 'status', 'error'}]} dos links com falha"""
+    report = {}
+    for url, occurrences in links.items():
+        result = results.get(url)
+        if not result or result['ok'] is not False:
+            continue
+        for occurrence in occurrences:
+            report.setdefault(occurrence['document'], []).append({
+                'text': occurrence['text'],
+                'url': url,
+                'status': result['status'],
+                'error': result['error']
+            })
+    return dict(sorted(report.items()))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Verifica se os links dos documentos respondem')
+    parser.add_argument('--database', nargs='?', const=os.path.join(os.path.dirname(
+                            os.path.abspath(__file__)), 'src', 'database.json'),
+                        help='Inclui os links do database.json (padrão: src/database.json)')
+    parser.add_argument('--sem-docx', action='store_true',
+                        help='Não lê os .docx do corpus (só o database.json)')
+    parser.add_argument('--concorrencia', type=int, default=MAX_CONCURRENCY,
+                        help='Requisições simultâneas no total')
+    parser.add_argument('--por-host', type=int, default=MAX_PER_HOST,
+                        help='Conexões simultâneas por host')
+    parser.add_argument('--intervalo', type=float, default=MIN_HOST_INTERVAL,
+                        help='Segundos entre requisições ao mesmo host')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='Tempo limite por requisição')
+    parser.add_argument('--ttl', type=float, default=CACHE_TTL / 3600,
+                        help='Validade (horas) do cache para links bons')
+    parser.add_argument('--cache', help=f'Arquivo de cache (padrão: {CACHE_NAME} na pasta do corpus)')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    links = {}
+    if not args.sem_docx:
+        collect_docx_links(from_args(args), links)
+    if args.database:
+        collect_database_links(args.database, links)
+
+    cache_path = args.cache or os.path.join(manifest_dir(args), CACHE_NAME)
+    cache = load_cache(cache_path)
+    results, stats = check_links(list(links), cache, args.concorrencia, args.por_host,
+                                 args.intervalo, args.timeout, ttl=args.ttl * 3600)
+    save_cache(cache, cache_path)
+
+    report = broken_by_document(links, results)
+    skipped = sum(1 for result in results.values() if result['ok'] is None)
+
+    print("=" * 80)
+    print("VERIFICAÇÃO DE LINKS")
+    print("=" * 80)
+    for document, broken in report.items():
+        print(f"📄 {document}")
+        for link in broken:
+            reason = link['status'] or link['error']
+            print(f"   ❌ [{reason}] {link['text'][:40]} -> {link['url'][:70]}")
+        print()
+    print("-" * 80)
+    print(f"🔗 URLs distintas: {stats['urls']} ({stats['cached']} do cache, "
+          f"{stats['checked']} verificadas em {stats['seconds']:.1f}s, "
+          f"{stats['connections']} conexões)")
+    print(f"❌ Documentos com links quebrados: {len(report)}")
+    if skipped:
+        print(f"⏭️  URLs com esquema não verificado: {skipped}")
+    print("=" * 80)